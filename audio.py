@@ -0,0 +1,129 @@
+"""
+오디오 추출 유틸리티
+ffmpeg 출력을 Whisper 입력 형식(16kHz 모노 float32)으로 바로 읽어옵니다.
+"""
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# whisper.audio.SAMPLE_RATE와 동일
+SAMPLE_RATE = 16000
+
+# 이보다 큰 PCM 데이터는 메모리 대신 파일에 기록한 뒤 memmap으로 엽니다 (기본 128MB ≈ 35분)
+PCM_MEMORY_LIMIT = int(os.environ.get("PCM_MEMORY_LIMIT", 128 * 1024 * 1024))
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 음성 인식 구간 길이 (Whisper 입력 창은 30초)
+CHUNK_SECONDS = float(os.environ.get("TRANSCRIBE_CHUNK_SECONDS", 30))
+# 구간 끝에서 이만큼 앞까지 중 가장 조용한 지점에서 자름
+SILENCE_SEARCH_SECONDS = 10.0
+FRAME_SECONDS = 0.02
+
+
+class AudioExtractionError(Exception):
+    """ffmpeg 오디오 추출 실패"""
+
+
+def ffmpeg_command(src: Union[str, Path]) -> list:
+    """16kHz 모노 float32 PCM을 stdout으로 내보내는 ffmpeg 명령"""
+    return [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-threads", "0",
+        "-i", str(src),
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", "-acodec", "pcm_f32le", "-"
+    ]
+
+
+def load_pcm(src: Union[str, Path], spill_path: Optional[Union[str, Path]] = None) -> np.ndarray:
+    """
+    영상/음성 파일을 Whisper가 바로 사용할 수 있는 float32 배열로 디코딩합니다.
+
+    출력이 PCM_MEMORY_LIMIT를 넘으면 spill_path(없으면 임시 파일)에 이어서 기록하고
+    memmap 배열을 반환합니다. spill_path 정리는 호출한 쪽에서 합니다.
+    """
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(ffmpeg_command(src), stdout=subprocess.PIPE, stderr=stderr)
+        buffer = bytearray()
+        spill = None
+        try:
+            while True:
+                chunk = proc.stdout.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if spill is not None:
+                    spill.write(chunk)
+                    continue
+                buffer.extend(chunk)
+                if len(buffer) > PCM_MEMORY_LIMIT:
+                    # 긴 입력: 지금까지 받은 데이터를 파일로 옮기고 이후는 파일에 기록
+                    if spill_path is None:
+                        fd, spill_path = tempfile.mkstemp(suffix=".pcm")
+                        spill = os.fdopen(fd, "wb")
+                    else:
+                        spill = open(spill_path, "wb")
+                    spill.write(buffer)
+                    buffer = bytearray()
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+            if spill is not None:
+                spill.close()
+
+        if returncode != 0:
+            stderr.seek(0)
+            message = stderr.read().decode("utf-8", errors="replace").strip()
+            raise AudioExtractionError(message or f"ffmpeg 종료 코드 {returncode}")
+
+    if spill is not None:
+        # mode="c": 파일은 그대로 두고 쓰기 가능한 배열로 매핑 (torch.from_numpy 경고 방지)
+        return np.memmap(spill_path, dtype=np.float32, mode="c")
+
+    if not buffer:
+        raise AudioExtractionError("오디오 스트림을 찾을 수 없습니다.")
+    return np.frombuffer(buffer, dtype=np.float32)
+
+
+def duration_seconds(audio: np.ndarray) -> float:
+    """PCM 배열의 길이(초)"""
+    return len(audio) / SAMPLE_RATE
+
+
+def frame_energy(audio: np.ndarray, frame_size: int, block_frames: int = 30000) -> np.ndarray:
+    """프레임별 평균 에너지 (긴 memmap도 블록 단위로 계산해 메모리 사용을 제한)"""
+    n_frames = len(audio) // frame_size
+    energy = np.empty(n_frames, dtype=np.float32)
+    for first in range(0, n_frames, block_frames):
+        last = min(first + block_frames, n_frames)
+        block = np.asarray(audio[first * frame_size:last * frame_size]).reshape(-1, frame_size)
+        energy[first:last] = np.square(block).mean(axis=1)
+    return energy
+
+
+def split_on_silence(audio: np.ndarray, max_chunk_seconds: float = CHUNK_SECONDS,
+                     search_seconds: float = SILENCE_SEARCH_SECONDS) -> List[Tuple[int, int]]:
+    """
+    PCM 배열을 max_chunk_seconds 이하 구간 (시작, 끝 샘플)으로 나눕니다.
+    각 구간은 끝 search_seconds 안에서 에너지가 가장 낮은 프레임(무음)에서 끊습니다.
+    """
+    if len(audio) == 0:
+        return []
+
+    frame_size = int(SAMPLE_RATE * FRAME_SECONDS)
+    energy = frame_energy(audio, frame_size)
+    max_frames = max(int(max_chunk_seconds / FRAME_SECONDS), 1)
+    search_frames = min(max(int(search_seconds / FRAME_SECONDS), 1), max_frames)
+
+    chunks = []
+    start = 0
+    while len(energy) - start > max_frames:
+        low = start + max_frames - search_frames
+        cut = max(low + int(np.argmin(energy[low:start + max_frames])), start + 1)
+        chunks.append((start * frame_size, cut * frame_size))
+        start = cut
+    chunks.append((start * frame_size, len(audio)))
+    return chunks
@@ -0,0 +1,93 @@
+"""
+Whisper 추론 백엔드
+openai-whisper(기본), 선형 계층을 int8로 동적 양자화한 openai-whisper, faster-whisper(CTranslate2) 중에서
+WHISPER_BACKEND 환경 변수로 선택합니다. 모든 백엔드는 openai-whisper의 model.transcribe와 같은 형식의 결과를 반환합니다.
+"""
+import os
+from typing import Dict, Optional
+
+# "openai", "int8", "faster-whisper"
+WHISPER_BACKEND = os.environ.get("WHISPER_BACKEND", "openai").lower()
+# faster-whisper 연산 정밀도 ("int8", "int8_float32", "float32" 등)
+FASTER_WHISPER_COMPUTE_TYPE = os.environ.get("FASTER_WHISPER_COMPUTE_TYPE", "int8")
+
+BACKENDS = ("openai", "int8", "faster-whisper")
+
+
+def validate_backend(backend: str) -> str:
+    backend = backend.lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 백엔드입니다: {backend} (지원: {', '.join(BACKENDS)})")
+    return backend
+
+
+def supports_batch_decode(backend: str) -> bool:
+    """멜 스펙트로그램 배치를 model.decode로 한 번에 디코딩할 수 있는지 (openai-whisper 계열만)"""
+    return backend in ("openai", "int8")
+
+
+class FasterWhisperModel:
+    """faster-whisper 모델을 openai-whisper transcribe 결과 형식으로 감싼 어댑터"""
+
+    def __init__(self, model_name: str, num_threads: int = 0):
+        from faster_whisper import WhisperModel
+
+        self.model_name = model_name
+        self.model = WhisperModel(
+            model_name, device="cpu", compute_type=FASTER_WHISPER_COMPUTE_TYPE, cpu_threads=num_threads
+        )
+
+    def transcribe(self, audio, language: Optional[str] = None, initial_prompt: Optional[str] = None,
+                   **kwargs) -> Dict:
+        segments, info = self.model.transcribe(audio, language=language, initial_prompt=initial_prompt)
+        # segments는 제너레이터이므로 순회해야 실제로 디코딩됨
+        segments = [
+            {"start": seg.start, "end": seg.end, "text": seg.text, "avg_logprob": seg.avg_logprob}
+            for seg in segments
+        ]
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "segments": segments,
+            "language": info.language
+        }
+
+
+def _quantize_int8(model):
+    """인코더/디코더의 선형 계층 가중치를 int8로 동적 양자화 (활성값은 실행 시 양자화)"""
+    import torch
+    import whisper
+
+    # whisper.model.Linear는 dtype 변환만 추가한 nn.Linear 하위 클래스인데,
+    # quantize_dynamic은 정확히 nn.Linear인 모듈만 바꾸므로 클래스를 되돌림 (fp32에서는 동작이 같음)
+    for module in model.modules():
+        if type(module) is whisper.model.Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def load_model(model_name: str, backend: str = WHISPER_BACKEND, num_threads: int = 0):
+    """백엔드에 맞게 모델 로드 (반환 객체는 모두 transcribe(audio, language=..., initial_prompt=...) 지원)"""
+    if backend == "faster-whisper":
+        return FasterWhisperModel(model_name, num_threads)
+
+    import whisper
+
+    if backend == "int8":
+        # 동적 양자화 연산은 CPU 전용
+        return _quantize_int8(whisper.load_model(model_name, device="cpu"))
+    return whisper.load_model(model_name)
+
+
+def model_bytes(model) -> Optional[int]:
+    """모델 가중치 크기 (양자화된 가중치 포함, faster-whisper는 알 수 없으므로 None)"""
+    if not hasattr(model, "state_dict"):
+        return None
+
+    def tensor_bytes(value) -> int:
+        if isinstance(value, (tuple, list)):
+            return sum(tensor_bytes(v) for v in value)
+        if hasattr(value, "numel") and hasattr(value, "element_size"):
+            return value.numel() * value.element_size()
+        return 0
+
+    return sum(tensor_bytes(value) for value in model.state_dict().values())
@@ -0,0 +1,473 @@
+"""
+성능 측정 스크립트
+
+사용법:
+    python benchmark.py backends 음성파일.mp3 --backends openai,int8 --model base --language ko
+    python benchmark.py pipeline --output results/pipeline.json
+    python benchmark.py db --sizes 100,10000,100000 --output results/db.json
+
+backends: 같은 오디오를 여러 추론 백엔드로 변환해 실시간 배율(RTF = 처리 시간 / 오디오 길이)과
+          첫 번째 백엔드(기준) 대비 단어 단위 차이를 JSON으로 출력합니다.
+pipeline: ffmpeg로 만든 합성 영상/음성 파일로 업로드 읽기, 디스크 저장, 오디오 추출, 음성 인식,
+          DB 저장 단계별 소요 시간을 측정합니다.
+db:       합성 레코드로 채운 저장소(크기별)에서 database.py의 각 연산 소요 시간을 측정합니다.
+
+모든 결과에는 실행 환경(커밋, Python, CPU 수)이 함께 기록되어 시간에 따른 변화를 비교할 수 있습니다.
+"""
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import hashlib
+import difflib
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+import audio as audio_utils
+import backends
+import transcriber
+
+
+def transcribe_chunks(model, pcm: np.ndarray, language: str) -> str:
+    """서버와 같은 방식으로 무음 구간 단위로 나눠 앞 구간 텍스트를 prompt로 넘기며 인식"""
+    texts = []
+    prompt = None
+    for start, end in audio_utils.split_on_silence(pcm):
+        result = model.transcribe(
+            np.ascontiguousarray(pcm[start:end]), language=None if language == "auto" else language,
+            fp16=False, verbose=False, initial_prompt=prompt
+        )
+        texts.append(result["text"])
+        prompt = result["text"][-200:] or prompt
+    return "".join(texts)
+
+
+def word_diff(reference: str, hypothesis: str, max_changes: int = 20) -> Dict:
+    """단어 단위 차이 (대체/삭제/삽입 수와 WER, 앞부분 변경 내용 일부)"""
+    ref_words = reference.split()
+    hyp_words = hypothesis.split()
+    matcher = difflib.SequenceMatcher(a=ref_words, b=hyp_words, autojunk=False)
+    substitutions = deletions = insertions = 0
+    changes = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        if tag == "replace":
+            common = min(i2 - i1, j2 - j1)
+            substitutions += common
+            deletions += (i2 - i1) - common
+            insertions += (j2 - j1) - common
+        elif tag == "delete":
+            deletions += i2 - i1
+        elif tag == "insert":
+            insertions += j2 - j1
+        if len(changes) < max_changes:
+            changes.append({"reference": " ".join(ref_words[i1:i2]), "hypothesis": " ".join(hyp_words[j1:j2])})
+    errors = substitutions + deletions + insertions
+    return {
+        "reference_words": len(ref_words),
+        "substitutions": substitutions,
+        "deletions": deletions,
+        "insertions": insertions,
+        "wer": round(errors / len(ref_words), 4) if ref_words else 0.0,
+        "changes": changes
+    }
+
+
+def benchmark_backends(path: str, backend_names: List[str], model_name: str, language: str,
+                       threads: int) -> Dict:
+    """백엔드별 로드 시간, 처리 시간, RTF와 기준 백엔드 대비 단어 차이"""
+    pcm = audio_utils.load_pcm(path)
+    duration = audio_utils.duration_seconds(pcm)
+    if any(name != "faster-whisper" for name in backend_names):
+        import torch
+        torch.set_num_threads(threads)
+
+    results = []
+    reference: Optional[str] = None
+    for name in backend_names:
+        print(f"[{name}] 모델 로드 중... ({model_name})", file=sys.stderr)
+        started = time.perf_counter()
+        model = backends.load_model(model_name, name, threads)
+        load_seconds = time.perf_counter() - started
+
+        print(f"[{name}] 인식 중... ({duration:.1f}초 분량)", file=sys.stderr)
+        started = time.perf_counter()
+        text = transcribe_chunks(model, pcm, language)
+        elapsed = time.perf_counter() - started
+
+        entry = {
+            "backend": name,
+            "load_seconds": round(load_seconds, 3),
+            "transcribe_seconds": round(elapsed, 3),
+            "rtf": round(elapsed / duration, 4) if duration else None,
+            "model_bytes": backends.model_bytes(model),
+            "text": text
+        }
+        if reference is None:
+            reference = text
+        else:
+            entry["diff"] = word_diff(reference, text)
+        results.append(entry)
+        del model
+
+    return {
+        "suite": "backends",
+        "environment": environment(),
+        "audio": os.path.basename(path),
+        "audio_seconds": round(duration, 2),
+        "model": model_name,
+        "language": language,
+        "threads": threads,
+        "baseline": backend_names[0],
+        "results": results
+    }
+
+
+# ============ 공통 ============
+
+def environment() -> Dict:
+    """측정 환경 (결과 비교용)"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count()
+    }
+
+
+def summarize(times: List[float]) -> Dict:
+    """측정값(초) 목록을 밀리초 통계로 요약"""
+    ordered = sorted(times)
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[len(ordered) // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 3),
+        "min_ms": round(ordered[0] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3)
+    }
+
+
+def measure(fn: Callable, repeat: int) -> Dict:
+    times = []
+    for i in range(repeat):
+        started = time.perf_counter()
+        fn(i)
+        times.append(time.perf_counter() - started)
+    return summarize(times)
+
+
+# ============ 파이프라인 단계 ============
+
+# (파일명, 길이(초), 종류)
+FIXTURES = [
+    ("tone_10s.wav", 10, "audio"),
+    ("tone_60s.mp3", 60, "audio"),
+    ("clip_30s.mp4", 30, "video"),
+]
+
+
+def make_fixture(path: Path, seconds: int, kind: str):
+    """ffmpeg lavfi로 합성 파일 생성 (사인파 + 약한 잡음, 영상은 테스트 패턴)"""
+    command = [
+        "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+        "-f", "lavfi", "-i", f"anoisesrc=duration={seconds}:amplitude=0.02:seed=1",
+    ]
+    if kind == "video":
+        command += ["-f", "lavfi", "-i", f"testsrc=size=640x360:rate=25:duration={seconds}"]
+    command += ["-filter_complex", "[0:a][1:a]amix=inputs=2[a]", "-map", "[a]"]
+    if kind == "video":
+        command += ["-map", "2:v", "-c:v", "mpeg4", "-c:a", "aac"]
+    command.append(str(path))
+    subprocess.run(command, check=True)
+
+
+def make_fixtures(directory: Path) -> List[Dict]:
+    directory.mkdir(parents=True, exist_ok=True)
+    fixtures = []
+    for name, seconds, kind in FIXTURES:
+        path = directory / name
+        if not path.exists():
+            print(f"합성 파일 생성: {path}", file=sys.stderr)
+            make_fixture(path, seconds, kind)
+        fixtures.append({"name": name, "path": path, "seconds": seconds, "kind": kind})
+    return fixtures
+
+
+def benchmark_pipeline(fixture_dir: Path, repeat: int, transcribe: bool, model_name: str,
+                       language: str, backend: str, threads: int) -> Dict:
+    """파일별 단계 소요 시간 (서버의 process_single_file과 같은 청크 크기/함수 사용)"""
+    import database as db
+
+    chunk_size = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+    fixtures = make_fixtures(fixture_dir)
+    model = None
+    if transcribe:
+        if backend != "faster-whisper":
+            import torch
+            torch.set_num_threads(threads)
+        started = time.perf_counter()
+        model = backends.load_model(model_name, backend, threads)
+        model_load_seconds = round(time.perf_counter() - started, 3)
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench-pipeline-"))
+    storage = db.SQLiteBackend(work_dir / "files.db")
+    results = []
+    try:
+        for fixture in fixtures:
+            path = fixture["path"]
+            dest = work_dir / ("upload" + path.suffix)
+
+            def read_upload(_):
+                # 업로드 읽기 + 콘텐츠 해시
+                hasher = hashlib.sha256()
+                with open(path, "rb") as src:
+                    while chunk := src.read(chunk_size):
+                        hasher.update(chunk)
+
+            def write_upload(_):
+                with open(path, "rb") as src, open(dest, "wb") as out:
+                    while chunk := src.read(chunk_size):
+                        out.write(chunk)
+
+            pcm = audio_utils.load_pcm(path)
+            stages = {
+                "upload_read": measure(read_upload, repeat),
+                "disk_write": measure(write_upload, repeat),
+                "extraction": measure(lambda _: audio_utils.load_pcm(dest), repeat),
+                "chunking": measure(lambda _: audio_utils.split_on_silence(pcm), repeat),
+            }
+            text = "합성 음성 " * 200
+            if model is not None:
+                started = time.perf_counter()
+                text = transcribe_chunks(model, pcm, language)
+                elapsed = time.perf_counter() - started
+                stages["transcription"] = summarize([elapsed])
+                stages["transcription"]["rtf"] = round(elapsed / fixture["seconds"], 4)
+            stages["db_write"] = measure(
+                lambda i: storage.insert_file(make_record(f"{path.stem}-{i}", text, datetime.now(), "audio")),
+                repeat
+            )
+            results.append({
+                "fixture": fixture["name"],
+                "kind": fixture["kind"],
+                "audio_seconds": fixture["seconds"],
+                "bytes": path.stat().st_size,
+                "stages": stages
+            })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {"suite": "pipeline", "environment": environment(), "repeat": repeat, "results": results}
+    if model is not None:
+        report["transcription"] = {
+            "model": model_name, "backend": backend, "language": language,
+            "threads": threads, "model_load_seconds": model_load_seconds
+        }
+    return report
+
+
+# ============ 데이터베이스 연산 ============
+
+_SYLLABLES = "가나다라마바사아자차카타파하회의록강의요약영상대화정리내용발표질문답변"
+RARE_WORD = "희귀검색어"
+
+
+def make_vocabulary(rng: random.Random, size: int = 2000) -> List[str]:
+    return ["".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+def make_text(rng: random.Random, vocabulary: List[str], length: int, rare: bool) -> str:
+    words = []
+    total = 0
+    while total < length:
+        word = rng.choice(vocabulary)
+        words.append(word)
+        total += len(word) + 1
+    if rare:
+        words.insert(rng.randrange(len(words)), RARE_WORD)
+    return " ".join(words)
+
+
+def make_record(file_id: str, text: str, uploaded_at: datetime, file_type: str) -> Dict:
+    import database as db
+    return {
+        "id": file_id,
+        "filename": f"{file_id}.mp3",
+        "type": file_type,
+        "uploaded_at": uploaded_at.isoformat(),
+        "original_text": text,
+        "preview": db.make_preview(text),
+        "summaries": {}
+    }
+
+
+def build_corpus(backend_name: str, path: Path, size: int, text_length: int, seed: int):
+    """size개의 합성 레코드로 저장소를 한 번에 채움 (색인 포함)"""
+    import database as db
+
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    started = datetime(2024, 1, 1)
+    types = ("audio", "video", "recording", "text")
+    records = (
+        make_record(
+            f"rec-{i:06d}", make_text(rng, vocabulary, text_length, rare=(i % 100 == 0)),
+            started + timedelta(seconds=i * 37), types[i % len(types)]
+        )
+        for i in range(size)
+    )
+
+    if backend_name == "sqlite":
+        storage = db.SQLiteBackend(path)
+        storage.insert_files(records)
+        return storage, vocabulary
+
+    db.save_db({"files": list(records)}, path)
+    return db.JsonBackend(path), vocabulary
+
+
+def benchmark_database(sizes: List[int], backend_names: List[str], repeat: int, text_length: int,
+                       seed: int) -> Dict:
+    """저장소 크기별 database.py 연산 소요 시간"""
+    results = []
+    for backend_name in backend_names:
+        for size in sizes:
+            work_dir = Path(tempfile.mkdtemp(prefix="bench-db-"))
+            path = work_dir / ("files.db" if backend_name == "sqlite" else "files_db.json")
+            try:
+                print(f"[{backend_name}] 레코드 {size}개 생성 중...", file=sys.stderr)
+                started = time.perf_counter()
+                storage, vocabulary = build_corpus(backend_name, path, size, text_length, seed)
+                build_seconds = time.perf_counter() - started
+
+                rng = random.Random(seed + 1)
+                ids = [f"rec-{rng.randrange(size):06d}" for _ in range(repeat)]
+                common_words = [rng.choice(vocabulary) for _ in range(repeat)]
+                middle = storage.list_files(size // 2 + 1, None, None)[-1]
+                middle_cursor = (middle["uploaded_at"], middle["id"])
+                now = datetime.now().isoformat()
+                text = make_text(rng, vocabulary, text_length, rare=False)
+
+                operations = {
+                    "insert": lambda i: storage.insert_file(
+                        make_record(f"new-{i:06d}", text, datetime(2030, 1, 1) + timedelta(seconds=i), "audio")
+                    ),
+                    "get_by_id": lambda i: storage.get_file_by_id(ids[i]),
+                    "list_first_page": lambda i: storage.list_files(50, None, None),
+                    "list_middle_page": lambda i: storage.list_files(50, middle_cursor, None),
+                    "list_by_type": lambda i: storage.list_files(50, None, "video"),
+                    "search_common": lambda i: storage.search_files(common_words[i], 20, 0),
+                    "search_rare": lambda i: storage.search_files(RARE_WORD, 20, 0),
+                    "update_summary": lambda i: storage.update_summary(ids[i], "general", "요약 " * 50, now),
+                    "delete": lambda i: storage.delete_file(f"new-{i:06d}"),
+                }
+                results.append({
+                    "backend": backend_name,
+                    "records": size,
+                    "build_seconds": round(build_seconds, 3),
+                    "storage_bytes": sum(p.stat().st_size for p in work_dir.iterdir()),
+                    "operations": {name: measure(fn, repeat) for name, fn in operations.items()}
+                })
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "suite": "database",
+        "environment": environment(),
+        "repeat": repeat,
+        "text_length": text_length,
+        "seed": seed,
+        "results": results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="movie-to-txt 성능 측정")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backends_parser = commands.add_parser("backends", help="추론 백엔드별 RTF와 기준 대비 단어 차이")
+    backends_parser.add_argument("audio", help="영상/음성 파일 경로")
+    backends_parser.add_argument("--backends", default="openai,int8",
+                                 help=f"비교할 백엔드 (쉼표 구분, 첫 번째가 기준). 지원: {', '.join(backends.BACKENDS)}")
+    backends_parser.add_argument("--model", default=transcriber.WHISPER_MODEL)
+    backends_parser.add_argument("--language", default=transcriber.WHISPER_LANGUAGE)
+    backends_parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    backends_parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+
+    pipeline_parser = commands.add_parser("pipeline", help="합성 파일로 업로드~DB 저장 단계별 소요 시간")
+    pipeline_parser.add_argument("--fixtures", default="bench_fixtures", help="합성 파일 폴더 (없으면 생성)")
+    pipeline_parser.add_argument("--repeat", type=int, default=3)
+    pipeline_parser.add_argument("--skip-transcribe", action="store_true", help="음성 인식 단계 제외 (Whisper 없이 실행)")
+    pipeline_parser.add_argument("--model", default=transcriber.WHISPER_MODEL)
+    pipeline_parser.add_argument("--language", default=transcriber.WHISPER_LANGUAGE)
+    pipeline_parser.add_argument("--backend", default=backends.WHISPER_BACKEND)
+    pipeline_parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    pipeline_parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+
+    db_parser = commands.add_parser("db", help="저장소 크기별 database.py 연산 소요 시간")
+    db_parser.add_argument("--sizes", default="100,10000,100000", help="레코드 수 (쉼표 구분)")
+    db_parser.add_argument("--db-backends", default="sqlite", help="측정할 저장소 (sqlite, json)")
+    db_parser.add_argument("--repeat", type=int, default=20)
+    db_parser.add_argument("--text-length", type=int, default=500, help="레코드당 본문 글자 수")
+    db_parser.add_argument("--seed", type=int, default=42)
+    db_parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 표준 출력)")
+
+    args = parser.parse_args()
+    if args.command == "backends":
+        try:
+            names = [backends.validate_backend(name.strip()) for name in args.backends.split(",") if name.strip()]
+            model_name = transcriber.validate_model(args.model)
+            language = transcriber.validate_language(args.language)
+        except ValueError as e:
+            parser.error(str(e))
+        report = benchmark_backends(args.audio, names, model_name, language, args.threads)
+    elif args.command == "pipeline":
+        try:
+            backend = backends.validate_backend(args.backend)
+            model_name = transcriber.validate_model(args.model)
+            language = transcriber.validate_language(args.language)
+        except ValueError as e:
+            parser.error(str(e))
+        report = benchmark_pipeline(
+            Path(args.fixtures), args.repeat, not args.skip_transcribe, model_name, language,
+            backend, args.threads
+        )
+    else:
+        sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+        names = [name.strip() for name in args.db_backends.split(",") if name.strip()]
+        if any(name not in ("sqlite", "json") for name in names):
+            parser.error("--db-backends는 sqlite, json 중에서 선택하세요.")
+        report = benchmark_database(sizes, names, args.repeat, args.text_length, args.seed)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
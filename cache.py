@@ -0,0 +1,175 @@
+"""
+디스크 기반 LRU 캐시
+키마다 JSON 파일 하나로 저장하고, 용량을 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+목록/검색 API 응답용 메모리 캐시(ResponseCache)도 함께 둡니다.
+"""
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict
+
+TRANSCRIPT_CACHE_DIR = Path(os.environ.get("TRANSCRIPT_CACHE_DIR", "transcript_cache"))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+SUMMARY_CACHE_DIR = Path(os.environ.get("SUMMARY_CACHE_DIR", "summary_cache"))
+SUMMARY_CACHE_MAX_BYTES = int(os.environ.get("SUMMARY_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+
+class DiskLRUCache:
+    """크기 제한이 있는 디스크 캐시 (파일 수정 시각을 마지막 사용 시각으로 사용)"""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size = sum(p.stat().st_size for p in self.directory.glob("*.json"))
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """캐시 조회 (적중 시 사용 시각 갱신)"""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Dict) -> None:
+        """캐시 저장 (임시 파일에 쓴 뒤 이름을 바꿔 읽는 쪽이 깨진 파일을 보지 않도록 함)"""
+        path = self._path(key)
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            try:
+                self._size -= path.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+            self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """오래 사용하지 않은 항목부터 삭제 (락을 잡은 상태에서 호출)"""
+        entries = []
+        for p in self.directory.glob("*.json"):
+            try:
+                stat = p.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, p))
+        entries.sort()
+
+        self._size = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        """적중/실패 횟수 및 사용량"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "bytes": self._size,
+                "max_bytes": self.max_bytes
+            }
+
+
+class ResponseCache:
+    """
+    API 응답 본문 메모리 LRU 캐시
+    항목마다 만들 때의 리비전(ETag)을 함께 저장하고, 조회할 때 현재 리비전과 다르면 무효로 처리합니다.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._size = 0
+
+    def get(self, key: str, revision: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != revision:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, revision: str, body: bytes) -> None:
+        # 캐시 전체보다 큰 응답은 저장하지 않음
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old[1])
+            self._entries[key] = (revision, body)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        """적중/실패 횟수 및 사용량"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes
+            }
+
+
+def transcript_cache_key(content_hash: str, model_name: str, language: str) -> str:
+    """변환 결과 캐시 키 (같은 파일이라도 모델/언어가 다르면 다른 결과)"""
+    return f"{content_hash}:{model_name}:{language}"
+
+
+def summary_chunk_key(chunk_text: str, model_name: str, prompt_version: int) -> str:
+    """구간 요약 캐시 키 (구간 내용 해시 기준이라 요약 유형이 달라도 같은 구간이면 재사용)"""
+    chunk_hash = hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+    return f"{chunk_hash}:{model_name}:{prompt_version}"
+
+
+transcript_cache = DiskLRUCache(TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_BYTES)
+summary_cache = DiskLRUCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_BYTES)
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
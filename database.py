@@ -1,118 +1,1699 @@
 """
 파일 메타데이터 저장 및 관리 시스템
-JSON 파일 기반 데이터베이스
+저장소 백엔드: SQLite(기본, WAL 모드) / JSON 파일(레거시)
 """
+import os
+import re
+import sys
 import json
+import math
 import uuid
+import bisect
+import time
+import sqlite3
+import tempfile
+import threading
+from array import array
+from collections import deque
+from itertools import islice
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Callable, Optional, List, Dict
 
 DB_FILE = Path("files_db.json")
+SQLITE_FILE = Path(os.environ.get("SQLITE_FILE", "files.db"))
 
-def init_db():
-    """데이터베이스 초기화"""
-    if not DB_FILE.exists():
-        save_db({"files": []})
-
-def load_db() -> Dict:
-    """데이터베이스 로드"""
-    if not DB_FILE.exists():
-        init_db()
-    
-    try:
-        with open(DB_FILE, 'r', encoding='utf-8') as f:
+# 사용할 저장소 백엔드 ("sqlite" 또는 "json")
+DB_BACKEND = os.environ.get("DB_BACKEND", "sqlite").lower()
+
+# JSON 백엔드: 쓰기 로그가 이 크기를 넘으면 스냅샷으로 합침 (바이트)
+JSON_COMPACT_BYTES = int(os.environ.get("JSON_COMPACT_BYTES", 16 * 1024 * 1024))
+# JSON 백엔드: 쓰기마다 로그를 fsync (0이면 OS에 맡겨 더 빠르지만 전원이 나가면 마지막 쓰기가 사라질 수 있음)
+JSON_FSYNC = os.environ.get("JSON_FSYNC", "1") == "1"
+
+
+# ============ JSON 파일 헬퍼 (레거시) ============
+
+def load_db(path: Optional[Path] = None) -> Dict:
+    """JSON 데이터베이스 로드 (손상된 파일을 빈 DB로 취급해 덮어쓰지 않도록 예외 발생)"""
+    path = Path(path or DB_FILE)
+    if not path.exists():
+        save_db({"files": [], "epoch": new_epoch(), "revision": 0}, path)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
             return json.load(f)
-    except:
-        return {"files": []}
+        except ValueError as e:
+            raise RuntimeError(f"{path} 파일이 손상되어 읽을 수 없습니다: {e}") from e
+
+def save_db(data: Dict, path: Optional[Path] = None):
+    """JSON 데이터베이스 저장 (임시 파일에 쓰고 fsync한 뒤 이름을 바꾸므로 도중에 종료되어도 이전 파일이 남음)"""
+    path = Path(path or DB_FILE)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp는 0600으로 만들므로 기존 파일(없으면 umask 기본값)의 권한으로 맞춤
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+def _file_mode(path: Path) -> int:
+    """덮어쓸 파일의 권한 (파일이 없으면 일반 파일 생성과 같은 0o666 & ~umask)"""
+    try:
+        return path.stat().st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def _fsync_dir(directory: Path) -> None:
+    """이름 변경이 디스크에 기록되도록 폴더 fsync (지원하지 않는 OS는 건너뜀)"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def new_epoch() -> str:
+    """저장소를 새로 만들 때 정하는 식별자 (DB를 새로 만들어 리비전이 0부터 다시 시작해도 ETag가 겹치지 않도록)"""
+    return uuid.uuid4().hex[:8]
+
+
+# ============ 검색 헬퍼 ============
+
+# 한국어는 띄어쓰기 단위가 아닌 부분 문자열로 검색하는 경우가 많으므로
+# 단어를 겹치는 2-gram으로 쪼개 색인합니다. ("회의록을" → "회의 의록 록을 을")
+_WORD_RE = re.compile(r"[^\W_]+")
+
+SNIPPET_CONTEXT = 60
+SNIPPET_LENGTH = 200
+
+# 목록에 표시할 미리보기 길이 (레코드 생성 시 미리 계산해 저장)
+PREVIEW_LENGTH = 200
+
+def _ngram_words(text: str) -> List[str]:
+    return _WORD_RE.findall(text.lower())
+
+def ngram_tokenize(text: str) -> str:
+    """색인용 2-gram 토큰 문자열 생성"""
+    tokens = []
+    for word in _ngram_words(text):
+        if len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        tokens.append(word[-1])
+    return " ".join(tokens)
+
+def ngram_query(query: str) -> Optional[str]:
+    """검색어를 FTS5 MATCH 식으로 변환 (단어별 2-gram 구문을 AND로 결합)"""
+    terms = []
+    for word in _ngram_words(query):
+        if len(word) == 1:
+            terms.append(f'"{word}"*')
+        else:
+            terms.append('"' + " ".join(word[i:i + 2] for i in range(len(word) - 1)) + '"')
+    return " AND ".join(terms) or None
+
+def make_snippet(text: str, query: str, start: Optional[int] = None) -> str:
+    """검색어 주변 텍스트를 잘라 <mark>로 강조한 스니펫 생성"""
+    words = [w for w in query.split() if w]
+    if start is None:
+        match = re.search("|".join(re.escape(w) for w in words), text, re.IGNORECASE) if words else None
+        start = max(match.start() - SNIPPET_CONTEXT, 0) if match else 0
+        excerpt = text[start:start + SNIPPET_LENGTH]
+        truncated_tail = start + SNIPPET_LENGTH < len(text)
+    else:
+        excerpt = text
+        truncated_tail = len(text) >= SNIPPET_LENGTH
+
+    if words:
+        excerpt = re.sub(
+            "(" + "|".join(re.escape(w) for w in words) + ")",
+            r"<mark>\1</mark>",
+            excerpt,
+            flags=re.IGNORECASE
+        )
+    return ("..." if start > 0 else "") + excerpt + ("..." if truncated_tail else "")
+
+def make_preview(text: str) -> str:
+    """목록용 텍스트 미리보기"""
+    if len(text) > PREVIEW_LENGTH:
+        return text[:PREVIEW_LENGTH] + "..."
+    return text
+
+def encode_cursor(uploaded_at: str, file_id: str) -> str:
+    """목록 페이지 커서 (uploaded_at|id)"""
+    return f"{uploaded_at}|{file_id}"
+
+def decode_cursor(cursor: str) -> tuple:
+    uploaded_at, _, file_id = cursor.partition("|")
+    if not uploaded_at or not file_id:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+    return uploaded_at, file_id
+
+def _list_item(record: Dict) -> Dict:
+    item = {
+        "id": record["id"],
+        "filename": record["filename"],
+        "type": record["type"],
+        "uploaded_at": record["uploaded_at"],
+        "text_preview": record["preview"] if record.get("preview") is not None
+                        else make_preview(record.get("original_text", ""))
+    }
+    if record.get("last_updated"):
+        item["last_updated"] = record["last_updated"]
+    return item
+
+def _file_meta(record: Dict, text_bytes: int, summaries: Dict[str, Dict], segment_count: int) -> Dict:
+    """본문 없이 메타데이터와 크기만 담은 상세 정보"""
+    meta = {
+        "id": record["id"],
+        "filename": record["filename"],
+        "type": record["type"],
+        "uploaded_at": record["uploaded_at"],
+        "preview": record.get("preview") if record.get("preview") is not None
+                   else make_preview(record.get("original_text", "")),
+        "text_bytes": text_bytes,
+        "segment_count": segment_count,
+        "summaries": summaries
+    }
+    if record.get("last_updated"):
+        meta["last_updated"] = record["last_updated"]
+    if record.get("content_hash"):
+        meta["content_hash"] = record["content_hash"]
+    meta["revision"] = record.get("revision") or 0
+    return meta
+
+def _search_result(record: Dict, score: float, snippet: str) -> Dict:
+    result = {
+        "id": record["id"],
+        "filename": record["filename"],
+        "type": record["type"],
+        "uploaded_at": record["uploaded_at"],
+        "score": score,
+        "snippet": snippet
+    }
+    if record.get("last_updated"):
+        result["last_updated"] = record["last_updated"]
+    return result
+
+
+# ============ 변경 피드 ============
+
+# 쓰기 경로에서 파일 변경과 같은 트랜잭션으로 기록하는 변경 종류 (/api/events)
+CHANGE_TYPES = ("file_created", "summary_updated", "summary_deleted", "file_deleted")
+# 재연결한 클라이언트가 이어 받을 수 있도록 보관하는 최근 변경 수 (더 오래된 커서는 목록을 다시 불러와야 함)
+CHANGE_LOG_RETENTION = max(int(os.environ.get("CHANGE_LOG_RETENTION", 10000)), 1)
+
+def _change_event(change_id: int, change_type: str, file_id: str, revision: int,
+                  created_at: str, payload: Optional[Dict]) -> Dict:
+    return {
+        "id": change_id,
+        "type": change_type,
+        "file_id": file_id,
+        "revision": revision,
+        "created_at": created_at,
+        **(payload or {})
+    }
+
+def _summary_change(summary_type: str, summary_text: str, updated_at: str) -> Dict:
+    return {"summary_type": summary_type, "bytes": len(summary_text.encode("utf-8")), "updated_at": updated_at}
+
+
+# ============ 저장소 백엔드 ============
+
+# 작업 상태: queued → processing → completed / error
+JOB_FINISHED = ("completed", "error")
+
+# ============ Whisper 세그먼트 (열 단위 저장) ============
+
+def segment_columns(segments: List[Dict]) -> Dict[str, list]:
+    """세그먼트 목록을 열 단위 배열로 변환 (시작 시각순)"""
+    ordered = sorted(segments, key=lambda seg: seg["start"])
+    return {
+        "start": [float(seg["start"]) for seg in ordered],
+        "end": [float(seg["end"]) for seg in ordered],
+        "text": [seg.get("text") or "" for seg in ordered],
+        "avg_logprob": [seg.get("avg_logprob") for seg in ordered]
+    }
+
+def _pack_array(typecode: str, values) -> bytes:
+    """리틀 엔디언 바이트 배열로 변환 (플랫폼과 무관하게 같은 형식으로 저장)"""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+def _unpack_array(typecode: str, data: bytes) -> array:
+    unpacked = array(typecode)
+    unpacked.frombytes(data)
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked
+
+def _segment_range(starts, ends, start: Optional[float], end: Optional[float],
+                   offset: int, limit: Optional[int]) -> tuple:
+    """[start, end) 시간 범위와 겹치는 세그먼트의 인덱스 범위 (first, last, 범위 안 전체 개수)
+
+    세그먼트는 시작 시각순이고 끝 시각도 앞 세그먼트보다 작아지지 않는다고 가정 (이진 탐색)
+    """
+    first = bisect.bisect_right(ends, start) if start is not None else 0
+    last = bisect.bisect_left(starts, end) if end is not None else len(starts)
+    total = max(last - first, 0)
+    first += max(offset, 0)
+    if limit is not None:
+        last = min(last, first + limit)
+    return first, max(last, first), total
+
+def _segment_item(index: int, start: float, end: float, text: str, avg_logprob: Optional[float]) -> Dict:
+    if avg_logprob is not None and math.isnan(avg_logprob):
+        avg_logprob = None
+    return {
+        "index": index,
+        "start": round(start, 2),
+        "end": round(end, 2),
+        "text": text,
+        "avg_logprob": round(avg_logprob, 4) if avg_logprob is not None else None
+    }
+
+def _job_state(event: Dict) -> Dict:
+    """진행 이벤트에서 작업 테이블에 반영할 상태 값 추출"""
+    state = {"message": event.get("message")}
+    if event.get("status") in ("queued", "processing", "completed", "error"):
+        state["status"] = event["status"]
+    if event.get("progress") is not None:
+        state["progress"] = event["progress"]
+    if event.get("file_id"):
+        state["file_id"] = event["file_id"]
+    return state
+
+
+class StorageBackend:
+    """저장소 백엔드 인터페이스 (모듈 함수들이 이 메서드로 위임)"""
+
+    name = "base"
+
+    def close(self) -> None:
+        """종료 시 정리 (기본: 할 일 없음)"""
+
+    def insert_file(self, record: Dict) -> None:
+        raise NotImplementedError
+
+    def insert_files(self, records: List[Dict]) -> int:
+        raise NotImplementedError
+
+    def get_all_files(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def list_files(self, limit: int, cursor: Optional[tuple], file_type: Optional[str]) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_file_by_id(self, file_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def update_summary(self, file_id: str, summary_type: str, summary_text: str, updated_at: str) -> bool:
+        raise NotImplementedError
+
+    def delete_summary(self, file_id: str, summary_type: str, updated_at: str) -> bool:
+        raise NotImplementedError
+
+    def delete_file(self, file_id: str) -> bool:
+        raise NotImplementedError
+
+    def search_files(self, query: str, limit: int, offset: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_segments(self, file_id: str, start: Optional[float], end: Optional[float],
+                     offset: int, limit: Optional[int]) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_file_meta(self, file_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def read_text(self, file_id: str, start: int, end: int) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def get_summary(self, file_id: str, summary_type: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_corpus_revision(self) -> Dict:
+        raise NotImplementedError
+
+    def get_file_revision(self, file_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_changes(self, after: int, limit: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def get_change_cursor(self) -> Dict:
+        raise NotImplementedError
+
+    def insert_job(self, job: Dict) -> None:
+        raise NotImplementedError
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def claim_next_job(self, updated_at: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def add_job_event(self, job_id: str, event: Dict, updated_at: str) -> int:
+        raise NotImplementedError
+
+    def get_job_events(self, job_id: str, after: int) -> List[Dict]:
+        raise NotImplementedError
+
+    def requeue_interrupted_jobs(self, updated_at: str) -> List[Dict]:
+        raise NotImplementedError
+
+    def list_active_jobs(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def count_jobs_by_status(self) -> Dict[str, int]:
+        raise NotImplementedError
+
+
+class JsonBackend(StorageBackend):
+    """
+    JSON 백엔드 - 메모리의 데이터가 기준이고, 디스크에는 스냅샷(files_db.json)과 쓰기 로그(files_db.json.wal)를 둡니다.
+    쓰기는 락으로 한 번에 하나씩 처리하며, 변경 내용 한 줄만 로그에 추가(fsync)한 뒤 메모리에 반영합니다.
+    로그가 JSON_COMPACT_BYTES를 넘으면 전체를 임시 파일에 써서 이름을 바꾸는 방식으로 스냅샷을 교체하고 로그를 비웁니다.
+    시작할 때 스냅샷에 남은 로그를 다시 적용해 복구합니다. (쓰는 도중 종료되어 잘린 마지막 줄은 버림)
+    한 프로세스에서만 열어야 합니다.
+    """
+
+    name = "json"
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DB_FILE)
+        self.wal_path = self.path.with_name(self.path.name + ".wal")
+        self._lock = threading.RLock()
+        self._lsn = 0
+        started = time.perf_counter()
+        needs_snapshot = self._recover()
+        # 이전 버전이 남긴 끝난 작업의 중간 이벤트도 정리해 다음 스냅샷부터 빠지도록 함
+        for job in self._data["jobs"].values():
+            if job["status"] in JOB_FINISHED and len(job["events"]) > 1:
+                job["events"] = job["events"][-1:]
+                needs_snapshot = True
+        self._wal = open(self.wal_path, "ab")
+        if needs_snapshot:
+            self._compact()
+        print(f"JSON 저장소 로드: 파일 {len(self._data['files'])}개, {time.perf_counter() - started:.3f}초")
+
+    # ---- 복구 / 스냅샷 ----
+
+    def _recover(self) -> bool:
+        """스냅샷을 읽고 로그를 다시 적용 (스냅샷을 새로 써야 하면 True)"""
+        snapshot = load_db(self.path) if self.path.exists() else {}
+        files = snapshot.get("files", [])
+        for file in files:
+            file.setdefault("summaries", {})
+        self._data = {
+            "files": {file["id"]: file for file in files},
+            "jobs": snapshot.get("jobs", {}),
+            "epoch": snapshot.get("epoch") or new_epoch(),
+            "revision": snapshot.get("revision", 0),
+            "revision_updated_at": snapshot.get("revision_updated_at"),
+            "change_seq": snapshot.get("change_seq", 0),
+            "changes": deque(snapshot.get("changes", []), maxlen=CHANGE_LOG_RETENTION)
+        }
+        self._lsn = snapshot.get("wal_lsn", 0)
+        replayed = self._replay()
+        if replayed:
+            print(f"{self.wal_path}: 쓰기 로그 {replayed}건을 다시 적용했습니다.")
+        return bool(replayed) or not snapshot.get("epoch")
+
+    def _replay(self) -> int:
+        """스냅샷 이후의 로그 항목을 순서대로 적용하고 적용한 수를 반환"""
+        if not self.wal_path.exists():
+            return 0
+        applied = 0
+        valid_bytes = 0
+        with open(self.wal_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("줄이 끝나지 않음")
+                    op = json.loads(line)
+                except ValueError as e:
+                    print(f"⚠️ {self.wal_path}: {valid_bytes}바이트 이후의 손상된 로그를 버립니다. ({e})")
+                    break
+                valid_bytes += len(line)
+                # 스냅샷 교체 직후 로그를 비우기 전에 종료된 경우 이미 반영된 항목은 건너뜀
+                if op["lsn"] > self._lsn:
+                    self._apply(op)
+                    self._lsn = op["lsn"]
+                    applied += 1
+        if valid_bytes < self.wal_path.stat().st_size:
+            os.truncate(self.wal_path, valid_bytes)
+        return applied
+
+    def _snapshot(self) -> Dict:
+        data = self._data
+        return {
+            "files": list(data["files"].values()),
+            "jobs": data["jobs"],
+            "epoch": data["epoch"],
+            "revision": data["revision"],
+            "revision_updated_at": data["revision_updated_at"],
+            "change_seq": data["change_seq"],
+            "changes": list(data["changes"]),
+            "wal_lsn": self._lsn
+        }
+
+    def _compact(self) -> None:
+        """(락을 잡은 상태에서) 현재 데이터를 스냅샷으로 저장하고 로그를 비움"""
+        save_db(self._snapshot(), self.path)
+        self._wal.truncate(0)
+        self._wal.seek(0)
+        os.fsync(self._wal.fileno())
+
+    def close(self) -> None:
+        """로그를 스냅샷으로 합치고 닫음 (정상 종료 후에는 다음 시작 때 다시 적용할 로그가 없음)"""
+        with self._lock:
+            if not self._wal.closed:
+                self._compact()
+                self._wal.close()
+
+    # ---- 쓰기 ----
+
+    def _commit(self, op: Dict) -> None:
+        """(락을 잡은 상태에서) 변경 한 건을 로그 끝에 추가한 뒤 메모리에 반영"""
+        if self._wal.closed:
+            # 종료 처리 후 늦게 도착한 쓰기도 로그에 남김
+            self._wal = open(self.wal_path, "ab")
+        op["lsn"] = self._lsn + 1
+        line = json.dumps(op, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        size = self._wal.tell()
+        try:
+            self._wal.write(line)
+            self._wal.flush()
+            if JSON_FSYNC:
+                os.fsync(self._wal.fileno())
+        except OSError:
+            # 일부만 기록된 줄이 뒤따르는 항목을 가리지 않도록 되돌림
+            self._wal.truncate(size)
+            self._wal.seek(size)
+            raise
+        self._lsn = op["lsn"]
+        self._apply(op)
+        if self._wal.tell() >= JSON_COMPACT_BYTES:
+            self._compact()
+
+    def _revision_op(self, op: Dict, *changes: tuple) -> Dict:
+        """
+        파일 데이터 변경 로그 항목에 새 리비전과 변경 피드 항목을 추가
+        다시 적용해도 같은 결과가 되도록 시각과 번호는 여기서 미리 정합니다.
+        """
+        revision = self._data["revision"] + 1
+        now = datetime.now().isoformat()
+        seq = self._data["change_seq"]
+        op["revision"] = revision
+        op["at"] = now
+        op["changes"] = [
+            _change_event(seq + i, change_type, file_id, revision, now, payload)
+            for i, (change_type, file_id, payload) in enumerate(changes, 1)
+        ]
+        return op
+
+    def _apply(self, op: Dict) -> None:
+        """로그 항목 하나를 메모리 데이터에 반영 (실행 중과 복구 시 같은 코드 사용)"""
+        data = self._data
+        files = data["files"]
+        jobs = data["jobs"]
+        kind = op["op"]
+        if kind == "insert_files":
+            for record in op["records"]:
+                files[record["id"]] = {
+                    **record, "summaries": dict(record.get("summaries") or {}), "revision": op["revision"]
+                }
+        elif kind == "update_summary":
+            file = files[op["file_id"]]
+            file.setdefault("summaries", {})[op["summary_type"]] = op["summary_text"]
+            file["last_updated"] = op["updated_at"]
+            file["revision"] = op["revision"]
+        elif kind == "delete_summary":
+            file = files[op["file_id"]]
+            file.setdefault("summaries", {}).pop(op["summary_type"], None)
+            file["last_updated"] = op["updated_at"]
+            file["revision"] = op["revision"]
+        elif kind == "delete_file":
+            files.pop(op["file_id"], None)
+        elif kind == "insert_job":
+            jobs[op["job"]["id"]] = {**op["job"], "events": []}
+        elif kind == "claim_job":
+            job = jobs[op["job_id"]]
+            job["status"] = "processing"
+            job["attempts"] += 1
+            job["updated_at"] = op["updated_at"]
+        elif kind == "job_event":
+            job = jobs[op["job_id"]]
+            job["last_event_id"] = op["seq"]
+            event = {"seq": op["seq"], "data": op["event"]}
+            # 끝난 작업은 마지막(완료/오류) 이벤트만 남김 (완료 이벤트에 전체 결과가 있으므로 부분 결과는 중복)
+            if op["event"].get("status") in JOB_FINISHED:
+                job["events"] = [event]
+            else:
+                job["events"].append(event)
+            job.update(_job_state(op["event"]), updated_at=op["updated_at"])
+        elif kind == "requeue_jobs":
+            for job_id in op["job_ids"]:
+                jobs[job_id]["status"] = "queued"
+                jobs[job_id]["updated_at"] = op["updated_at"]
+        else:
+            raise ValueError(f"알 수 없는 로그 항목입니다: {kind}")
+
+        if "revision" in op:
+            data["revision"] = op["revision"]
+            data["revision_updated_at"] = op["at"]
+        for change in op.get("changes", ()):
+            data["changes"].append(change)
+            data["change_seq"] = change["id"]
+
+    def insert_file(self, record: Dict) -> None:
+        self.insert_files([record])
+
+    def insert_files(self, records: List[Dict]) -> int:
+        # 배치 전체를 로그 한 줄로 저장 (이미 있는 id는 건너뜀)
+        with self._lock:
+            new_records = [r for r in records if r["id"] not in self._data["files"]]
+            if not new_records:
+                return 0
+            op = self._revision_op(
+                {"op": "insert_files", "records": new_records},
+                *(("file_created", r["id"], {"file": _list_item(r)}) for r in new_records)
+            )
+            for record in new_records:
+                record["revision"] = op["revision"]
+            self._commit(op)
+            return len(new_records)
+
+    def update_summary(self, file_id: str, summary_type: str, summary_text: str, updated_at: str) -> bool:
+        with self._lock:
+            if file_id not in self._data["files"]:
+                return False
+            self._commit(self._revision_op(
+                {"op": "update_summary", "file_id": file_id, "summary_type": summary_type,
+                 "summary_text": summary_text, "updated_at": updated_at},
+                ("summary_updated", file_id, _summary_change(summary_type, summary_text, updated_at))
+            ))
+            return True
+
+    def delete_summary(self, file_id: str, summary_type: str, updated_at: str) -> bool:
+        with self._lock:
+            file = self._data["files"].get(file_id)
+            if file is None:
+                return False
+            if summary_type in file.get("summaries", {}):
+                self._commit(self._revision_op(
+                    {"op": "delete_summary", "file_id": file_id, "summary_type": summary_type,
+                     "updated_at": updated_at},
+                    ("summary_deleted", file_id, {"summary_type": summary_type})
+                ))
+            return True  # 파일이 존재하면 요약이 없어도 성공으로 처리
+
+    def delete_file(self, file_id: str) -> bool:
+        with self._lock:
+            if file_id not in self._data["files"]:
+                return False
+            self._commit(self._revision_op(
+                {"op": "delete_file", "file_id": file_id}, ("file_deleted", file_id, None)
+            ))
+            return True
+
+    # ---- 읽기 ----
+
+    def _find(self, file_id: str) -> Optional[Dict]:
+        return self._data["files"].get(file_id)
+
+    def get_all_files(self) -> List[Dict]:
+        with self._lock:
+            files = [{**f, "summaries": dict(f.get("summaries") or {})} for f in self._data["files"].values()]
+        # 최신순 정렬
+        return sorted(files, key=lambda x: x["uploaded_at"], reverse=True)
+
+    def list_files(self, limit: int, cursor: Optional[tuple], file_type: Optional[str]) -> List[Dict]:
+        with self._lock:
+            files = [
+                f for f in self._data["files"].values()
+                if (file_type is None or f["type"] == file_type)
+                and (cursor is None or (f["uploaded_at"], f["id"]) < cursor)
+            ]
+        files.sort(key=lambda x: (x["uploaded_at"], x["id"]), reverse=True)
+        return [_list_item(f) for f in files[:limit]]
+
+    def get_file_by_id(self, file_id: str) -> Optional[Dict]:
+        with self._lock:
+            file = self._find(file_id)
+            if file is None:
+                return None
+            # 세그먼트 배열은 get_segments로 따로 조회
+            record = {k: v for k, v in file.items() if k != "segments"}
+            record["summaries"] = dict(file.get("summaries") or {})
+            record["segment_count"] = len((file.get("segments") or {}).get("start", []))
+            return record
+
+    def search_files(self, query: str, limit: int, offset: int) -> List[Dict]:
+        words = [w for w in query.split() if w]
+        if not words:
+            return []
+        patterns = [re.compile(re.escape(w), re.IGNORECASE) for w in words]
+        with self._lock:
+            files = list(self._data["files"].values())
+
+        results = []
+        for file in files:
+            text = file.get("original_text", "")
+            name_hits = sum(1 for p in patterns if p.search(file["filename"]))
+            text_hits = [len(p.findall(text)) for p in patterns]
+            # 모든 검색어가 파일명 또는 본문에 있어야 일치
+            if all(p.search(file["filename"]) or hits for p, hits in zip(patterns, text_hits)):
+                score = name_hits * 10 + sum(text_hits)
+                results.append((score, file))
+
+        results.sort(key=lambda x: (x[0], x[1]["uploaded_at"]), reverse=True)
+        return [
+            _search_result(file, float(score), make_snippet(file.get("original_text", ""), query))
+            for score, file in results[offset:offset + limit]
+        ]
+
+    def get_file_meta(self, file_id: str) -> Optional[Dict]:
+        with self._lock:
+            file = self._find(file_id)
+            if file is None:
+                return None
+            # JSON 백엔드는 요약별 갱신 시각이 없으므로 파일의 마지막 수정 시각 사용
+            summaries = {
+                summary_type: {"bytes": len(text.encode("utf-8")), "updated_at": file.get("last_updated")}
+                for summary_type, text in (file.get("summaries") or {}).items()
+            }
+            return _file_meta(file, len((file.get("original_text") or "").encode("utf-8")), summaries,
+                              len((file.get("segments") or {}).get("start", [])))
+
+    def read_text(self, file_id: str, start: int, end: int) -> Optional[bytes]:
+        with self._lock:
+            file = self._find(file_id)
+        if file is None:
+            return None
+        return (file.get("original_text") or "").encode("utf-8")[start:end]
+
+    def get_summary(self, file_id: str, summary_type: str) -> Optional[Dict]:
+        with self._lock:
+            file = self._find(file_id)
+            if file is None or summary_type not in (file.get("summaries") or {}):
+                return None
+            return {"summary_text": file["summaries"][summary_type], "updated_at": file.get("last_updated")}
 
-def save_db(data: Dict):
-    """데이터베이스 저장"""
-    with open(DB_FILE, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    def get_corpus_revision(self) -> Dict:
+        with self._lock:
+            return {
+                "epoch": self._data["epoch"],
+                "revision": self._data["revision"],
+                "updated_at": self._data["revision_updated_at"]
+            }
 
-def create_file_record(filename: str, file_type: str, original_text: str) -> Dict:
-    """새 파일 레코드 생성"""
-    file_id = str(uuid.uuid4())
+    def get_file_revision(self, file_id: str) -> Optional[Dict]:
+        with self._lock:
+            file = self._find(file_id)
+            if file is None:
+                return None
+            return {
+                "epoch": self._data["epoch"],
+                "revision": file.get("revision", 0),
+                "updated_at": file.get("last_updated") or file["uploaded_at"]
+            }
+
+    def get_changes(self, after: int, limit: int) -> List[Dict]:
+        with self._lock:
+            changes = self._data["changes"]
+            # id는 1씩 증가하므로 위치를 바로 계산
+            start = max(after - changes[0]["id"] + 1, 0) if changes else 0
+            return list(islice(changes, start, start + limit))
+
+    def get_change_cursor(self) -> Dict:
+        with self._lock:
+            changes = self._data["changes"]
+            return {
+                "epoch": self._data["epoch"],
+                "first": changes[0]["id"] if changes else None,
+                "last": self._data["change_seq"]
+            }
+
+    def get_segments(self, file_id: str, start: Optional[float], end: Optional[float],
+                     offset: int, limit: Optional[int]) -> Optional[Dict]:
+        with self._lock:
+            file = self._find(file_id)
+        if file is None:
+            return None
+        columns = file.get("segments")
+        if not columns:
+            return None
+        first, last, total = _segment_range(columns["start"], columns["end"], start, end, offset, limit)
+        return {
+            "total": total,
+            "segments": [
+                _segment_item(i, columns["start"][i], columns["end"][i],
+                              columns["text"][i], columns["avg_logprob"][i])
+                for i in range(first, last)
+            ]
+        }
+
+    # 작업 대기열: {"jobs": {job_id: {..., "events": [...]}}}
+    @staticmethod
+    def _job_view(job: Dict) -> Dict:
+        return {k: v for k, v in job.items() if k != "events"}
+
+    def insert_job(self, job: Dict) -> None:
+        with self._lock:
+            self._commit({"op": "insert_job", "job": job})
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._data["jobs"].get(job_id)
+            return self._job_view(job) if job is not None else None
+
+    def claim_next_job(self, updated_at: str) -> Optional[Dict]:
+        with self._lock:
+            queued = [j for j in self._data["jobs"].values() if j["status"] == "queued"]
+            if not queued:
+                return None
+            job = min(queued, key=lambda j: j["created_at"])
+            self._commit({"op": "claim_job", "job_id": job["id"], "updated_at": updated_at})
+            return self._job_view(job)
+
+    def add_job_event(self, job_id: str, event: Dict, updated_at: str) -> int:
+        with self._lock:
+            job = self._data["jobs"].get(job_id)
+            if job is None:
+                return 0
+            seq = job["last_event_id"] + 1
+            self._commit({"op": "job_event", "job_id": job_id, "seq": seq, "event": event, "updated_at": updated_at})
+            return seq
+
+    def get_job_events(self, job_id: str, after: int) -> List[Dict]:
+        with self._lock:
+            job = self._data["jobs"].get(job_id)
+            if job is None:
+                return []
+            return [e for e in job["events"] if e["seq"] > after]
+
+    def requeue_interrupted_jobs(self, updated_at: str) -> List[Dict]:
+        with self._lock:
+            jobs = [j for j in self._data["jobs"].values() if j["status"] == "processing"]
+            if jobs:
+                self._commit({"op": "requeue_jobs", "job_ids": [j["id"] for j in jobs], "updated_at": updated_at})
+            return [self._job_view(j) for j in jobs]
+
+    def list_active_jobs(self) -> List[Dict]:
+        with self._lock:
+            return [self._job_view(j) for j in self._data["jobs"].values() if j["status"] not in JOB_FINISHED]
+
+    def count_jobs_by_status(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for job in self._data["jobs"].values():
+                counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return counts
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite(WAL 모드) 백엔드 - id 기본키 조회, uploaded_at 인덱스, 요약은 별도 테이블"""
+
+    name = "sqlite"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS files (
+        id TEXT PRIMARY KEY,
+        filename TEXT NOT NULL,
+        type TEXT NOT NULL,
+        uploaded_at TEXT NOT NULL,
+        last_updated TEXT,
+        original_text TEXT NOT NULL DEFAULT '',
+        preview TEXT,
+        content_hash TEXT,
+        text_bytes INTEGER,
+        revision INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_files_uploaded_at ON files(uploaded_at);
+    CREATE TABLE IF NOT EXISTS summaries (
+        file_id TEXT NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+        summary_type TEXT NOT NULL,
+        summary_text TEXT NOT NULL,
+        updated_at TEXT,
+        PRIMARY KEY (file_id, summary_type)
+    );
+    -- 파일당 한 행, 세그먼트 값을 열별 배열로 저장 (float32 / uint32 리틀 엔디언)
+    -- texts는 세그먼트 텍스트를 이어 붙인 UTF-8, text_offsets[i]..text_offsets[i+1]이 i번째 텍스트
+    CREATE TABLE IF NOT EXISTS segments (
+        file_id TEXT PRIMARY KEY REFERENCES files(id) ON DELETE CASCADE,
+        count INTEGER NOT NULL,
+        starts BLOB NOT NULL,
+        ends BLOB NOT NULL,
+        avg_logprobs BLOB NOT NULL,
+        text_offsets BLOB NOT NULL,
+        texts BLOB NOT NULL
+    );
+    -- 파일/요약이 바뀔 때마다 1씩 오르는 전체 리비전 (한 행)
+    -- files.revision에는 그 행이 마지막으로 바뀐 시점의 전체 리비전을 기록
+    CREATE TABLE IF NOT EXISTS corpus_revision (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        epoch TEXT NOT NULL,
+        revision INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT
+    );
+    -- 대시보드 변경 피드 (id가 재연결 커서, 최근 CHANGE_LOG_RETENTION개만 유지)
+    CREATE TABLE IF NOT EXISTS changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        revision INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        file_id TEXT NOT NULL,
+        data TEXT,
+        created_at TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS jobs (
+        id TEXT PRIMARY KEY,
+        filename TEXT NOT NULL,
+        upload_path TEXT NOT NULL,
+        content_hash TEXT,
+        model TEXT,
+        language TEXT,
+        throughput INTEGER NOT NULL DEFAULT 0,
+        status TEXT NOT NULL,
+        progress INTEGER NOT NULL DEFAULT 0,
+        message TEXT,
+        file_id TEXT,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_event_id INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+    CREATE TABLE IF NOT EXISTS job_events (
+        job_id TEXT NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+        seq INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (job_id, seq)
+    );
+    """
+
+    # 2-gram 토큰을 저장하는 contentless FTS5 색인 (rowid = files.rowid)
+    FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+        filename, body, content='', tokenize='unicode61'
+    );
+    """
+
+    def __init__(self, path: Path = SQLITE_FILE):
+        self.path = Path(path)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(self.SCHEMA)
+        self._migrate_schema(conn)
+        self.has_fts = self._init_fts(conn)
+
+    def _migrate_schema(self, conn: sqlite3.Connection) -> None:
+        """이전 버전 DB에 없는 컬럼/인덱스 추가"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(files)")}
+        if "preview" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN preview TEXT")
+            conn.execute(
+                "UPDATE files SET preview = CASE WHEN length(original_text) > ? "
+                "THEN substr(original_text, 1, ?) || '...' ELSE original_text END",
+                (PREVIEW_LENGTH, PREVIEW_LENGTH)
+            )
+        if "content_hash" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN content_hash TEXT")
+        if "text_bytes" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN text_bytes INTEGER")
+            conn.execute("UPDATE files SET text_bytes = length(CAST(original_text AS BLOB))")
+        if "revision" not in columns:
+            conn.execute("ALTER TABLE files ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        conn.execute(
+            "INSERT OR IGNORE INTO corpus_revision (id, epoch, revision) VALUES (1, ?, 0)", (new_epoch(),)
+        )
+        job_columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column in ("model", "language"):
+            if column not in job_columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+        if "throughput" not in job_columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN throughput INTEGER NOT NULL DEFAULT 0")
+        # 이전 버전이 남긴 끝난 작업의 중간 이벤트 정리
+        conn.execute(
+            "DELETE FROM job_events WHERE job_id IN (SELECT id FROM jobs WHERE status IN ('completed', 'error')) "
+            "AND seq < (SELECT last_event_id FROM jobs WHERE jobs.id = job_events.job_id)"
+        )
+        # 목록 페이지네이션용 (uploaded_at, id) 커서 인덱스
+        conn.executescript("""
+        CREATE INDEX IF NOT EXISTS idx_files_cursor ON files(uploaded_at, id);
+        CREATE INDEX IF NOT EXISTS idx_files_type_cursor ON files(type, uploaded_at, id);
+        CREATE INDEX IF NOT EXISTS idx_files_content_hash ON files(content_hash);
+        """)
+
+    def _init_fts(self, conn: sqlite3.Connection) -> bool:
+        """FTS5 색인 생성 (기존 DB라면 한 번 전체 색인)"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'files_fts'"
+        ).fetchone()
+        try:
+            conn.executescript(self.FTS_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"FTS5를 사용할 수 없어 LIKE 검색으로 대체합니다: {e}")
+            return False
+
+        if not exists:
+            with self._write() as conn:
+                rows = conn.execute("SELECT rowid, filename, original_text FROM files")
+                for row in rows.fetchall():
+                    self._index(conn, row["rowid"], row["filename"], row["original_text"])
+        return True
+
+    def _index(self, conn: sqlite3.Connection, rowid: int, filename: str, text: str) -> None:
+        conn.execute(
+            "INSERT INTO files_fts (rowid, filename, body) VALUES (?, ?, ?)",
+            (rowid, ngram_tokenize(filename), ngram_tokenize(text))
+        )
+
+    def _unindex(self, conn: sqlite3.Connection, rowid: int, filename: str, text: str) -> None:
+        # contentless 테이블은 색인했던 값과 동일한 토큰을 넘겨야 삭제됨
+        conn.execute(
+            "INSERT INTO files_fts (files_fts, rowid, filename, body) VALUES ('delete', ?, ?, ?)",
+            (rowid, ngram_tokenize(filename), ngram_tokenize(text))
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 커넥션 (WAL 모드에서는 읽기와 쓰기가 서로 막지 않음)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _write(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE로 동시 업로드 간 경합 시 대기 후 순차 처리)"""
+        return _Transaction(self._conn())
+
+    def _bump_revision(self, conn: sqlite3.Connection) -> int:
+        """쓰기 트랜잭션 안에서 전체 리비전을 1 올리고 새 값을 반환"""
+        row = conn.execute(
+            "UPDATE corpus_revision SET revision = revision + 1, updated_at = ? WHERE id = 1 RETURNING revision",
+            (datetime.now().isoformat(),)
+        ).fetchone()
+        return row["revision"]
+
+    def _log_change(self, conn: sqlite3.Connection, revision: int, change_type: str, file_id: str,
+                    payload: Optional[Dict] = None) -> None:
+        """쓰기 트랜잭션 안에서 변경 기록 (커밋되어야 피드에 보임)"""
+        cur = conn.execute(
+            "INSERT INTO changes (revision, type, file_id, data, created_at) VALUES (?, ?, ?, ?, ?)",
+            (revision, change_type, file_id,
+             json.dumps(payload, ensure_ascii=False) if payload else None, datetime.now().isoformat())
+        )
+        # 오래된 변경은 가끔 한 번에 정리
+        if cur.lastrowid % 256 == 0:
+            conn.execute("DELETE FROM changes WHERE id <= ?", (cur.lastrowid - CHANGE_LOG_RETENTION,))
+
+    def _summaries(self, conn: sqlite3.Connection, file_id: str) -> Dict[str, str]:
+        rows = conn.execute(
+            "SELECT summary_type, summary_text FROM summaries WHERE file_id = ?",
+            (file_id,)
+        )
+        return {row["summary_type"]: row["summary_text"] for row in rows}
+
+    def _to_record(self, conn: sqlite3.Connection, row: sqlite3.Row) -> Dict:
+        record = {
+            "id": row["id"],
+            "filename": row["filename"],
+            "type": row["type"],
+            "uploaded_at": row["uploaded_at"],
+            "original_text": row["original_text"],
+            "preview": row["preview"],
+            "summaries": self._summaries(conn, row["id"])
+        }
+        if row["last_updated"]:
+            record["last_updated"] = row["last_updated"]
+        if row["content_hash"]:
+            record["content_hash"] = row["content_hash"]
+        record["revision"] = row["revision"]
+        return record
+
+    def insert_file(self, record: Dict) -> None:
+        self.insert_files([record])
+
+    def insert_files(self, records: List[Dict]) -> int:
+        # 배치 전체를 한 트랜잭션으로 저장 (커밋/fsync와 리비전 증가는 배치당 한 번)
+        with self._write() as conn:
+            # 리비전은 새 행이 있을 때만 올림 (BEGIN IMMEDIATE 안이라 다음 번호를 미리 써도 다른 쓰기와 겹치지 않음)
+            revision = conn.execute("SELECT revision FROM corpus_revision WHERE id = 1").fetchone()["revision"] + 1
+            inserted = sum(self._insert(conn, record, revision) for record in records)
+            if inserted:
+                self._bump_revision(conn)
+            return inserted
+
+    def _insert(self, conn: sqlite3.Connection, record: Dict, revision: int) -> int:
+        cur = conn.execute(
+            "INSERT OR IGNORE INTO files "
+            "(id, filename, type, uploaded_at, last_updated, original_text, preview, content_hash, text_bytes, "
+            "revision) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record["id"], record["filename"], record["type"], record["uploaded_at"],
+             record.get("last_updated"), record.get("original_text") or "",
+             make_preview(record.get("original_text") or ""), record.get("content_hash"),
+             len((record.get("original_text") or "").encode("utf-8")), revision)
+        )
+        # 이미 있는 id면 건너뜀 (다시 가져오기/마이그레이션이 기존 요약을 예전 값으로 덮어쓰지 않도록)
+        if not cur.rowcount:
+            return 0
+        if getattr(self, "has_fts", False):
+            self._index(conn, cur.lastrowid, record["filename"], record.get("original_text") or "")
+        self._log_change(conn, revision, "file_created", record["id"], {"file": _list_item(record)})
+        for summary_type, summary_text in (record.get("summaries") or {}).items():
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (file_id, summary_type, summary_text, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (record["id"], summary_type, summary_text, record.get("last_updated"))
+            )
+        if record.get("segments"):
+            self._insert_segments(conn, record["id"], record["segments"])
+        return cur.rowcount
+
+    def _insert_segments(self, conn: sqlite3.Connection, file_id: str, columns: Dict[str, list]) -> None:
+        encoded = [text.encode("utf-8") for text in columns["text"]]
+        offsets = [0]
+        for text in encoded:
+            offsets.append(offsets[-1] + len(text))
+        conn.execute(
+            "INSERT OR REPLACE INTO segments (file_id, count, starts, ends, avg_logprobs, text_offsets, texts) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (file_id, len(encoded), _pack_array("f", columns["start"]), _pack_array("f", columns["end"]),
+             _pack_array("f", [math.nan if v is None else v for v in columns["avg_logprob"]]),
+             _pack_array("I", offsets), b"".join(encoded))
+        )
+
+    def get_all_files(self) -> List[Dict]:
+        conn = self._conn()
+        rows = conn.execute("SELECT * FROM files ORDER BY uploaded_at DESC").fetchall()
+        return [self._to_record(conn, row) for row in rows]
+
+    def list_files(self, limit: int, cursor: Optional[tuple], file_type: Optional[str]) -> List[Dict]:
+        # 본문은 읽지 않고 메타데이터와 저장된 미리보기만 조회
+        conditions, params = [], []
+        if file_type is not None:
+            conditions.append("type = ?")
+            params.append(file_type)
+        if cursor is not None:
+            conditions.append("(uploaded_at, id) < (?, ?)")
+            params.extend(cursor)
+        where = ("WHERE " + " AND ".join(conditions)) if conditions else ""
+        rows = self._conn().execute(
+            f"SELECT id, filename, type, uploaded_at, last_updated, preview FROM files {where} "
+            "ORDER BY uploaded_at DESC, id DESC LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [_list_item(dict(row)) for row in rows]
+
+    def get_file_by_id(self, file_id: str) -> Optional[Dict]:
+        conn = self._conn()
+        row = conn.execute("SELECT * FROM files WHERE id = ?", (file_id,)).fetchone()
+        if not row:
+            return None
+        record = self._to_record(conn, row)
+        count = conn.execute("SELECT count FROM segments WHERE file_id = ?", (file_id,)).fetchone()
+        record["segment_count"] = count["count"] if count else 0
+        return record
+
+    def update_summary(self, file_id: str, summary_type: str, summary_text: str, updated_at: str) -> bool:
+        with self._write() as conn:
+            if not conn.execute("SELECT 1 FROM files WHERE id = ?", (file_id,)).fetchone():
+                return False
+            revision = self._bump_revision(conn)
+            conn.execute(
+                "UPDATE files SET last_updated = ?, revision = ? WHERE id = ?", (updated_at, revision, file_id)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (file_id, summary_type, summary_text, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (file_id, summary_type, summary_text, updated_at)
+            )
+            self._log_change(conn, revision, "summary_updated", file_id,
+                             _summary_change(summary_type, summary_text, updated_at))
+            return True
+
+    def delete_summary(self, file_id: str, summary_type: str, updated_at: str) -> bool:
+        with self._write() as conn:
+            if not conn.execute("SELECT 1 FROM files WHERE id = ?", (file_id,)).fetchone():
+                return False
+            cur = conn.execute(
+                "DELETE FROM summaries WHERE file_id = ? AND summary_type = ?",
+                (file_id, summary_type)
+            )
+            if cur.rowcount:
+                revision = self._bump_revision(conn)
+                conn.execute(
+                    "UPDATE files SET last_updated = ?, revision = ? WHERE id = ?", (updated_at, revision, file_id)
+                )
+                self._log_change(conn, revision, "summary_deleted", file_id, {"summary_type": summary_type})
+            return True  # 파일이 존재하면 요약이 없어도 성공으로 처리
+
+    def delete_file(self, file_id: str) -> bool:
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT rowid, filename, original_text FROM files WHERE id = ?", (file_id,)
+            ).fetchone()
+            if not row:
+                return False
+            if self.has_fts:
+                self._unindex(conn, row["rowid"], row["filename"], row["original_text"])
+            conn.execute("DELETE FROM files WHERE rowid = ?", (row["rowid"],))
+            self._log_change(conn, self._bump_revision(conn), "file_deleted", file_id)
+            return True
+
+    def search_files(self, query: str, limit: int, offset: int) -> List[Dict]:
+        match = ngram_query(query) if self.has_fts else None
+        if match is None:
+            return self._search_like(query, limit, offset)
+
+        conn = self._conn()
+        first_word = query.split()[0].lower()
+        # 스니펫은 본문 전체가 아닌 첫 검색어 주변만 SQL에서 잘라옵니다
+        rows = conn.execute(
+            """
+            SELECT f.id, f.filename, f.type, f.uploaded_at, f.last_updated,
+                   bm25(files_fts, 10.0, 1.0) AS rank,
+                   max(instr(lower(f.original_text), ?) - ?, 1) AS snippet_start,
+                   substr(f.original_text, max(instr(lower(f.original_text), ?) - ?, 1), ?) AS excerpt
+            FROM files_fts JOIN files f ON f.rowid = files_fts.rowid
+            WHERE files_fts MATCH ?
+            ORDER BY rank, f.uploaded_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            (first_word, SNIPPET_CONTEXT, first_word, SNIPPET_CONTEXT, SNIPPET_LENGTH,
+             match, limit, offset)
+        ).fetchall()
+        return [
+            _search_result(dict(row), -row["rank"], make_snippet(row["excerpt"], query, row["snippet_start"] - 1))
+            for row in rows
+        ]
+
+    def _search_like(self, query: str, limit: int, offset: int) -> List[Dict]:
+        """FTS5가 없거나 검색어에 색인 가능한 글자가 없을 때의 대체 경로"""
+        conn = self._conn()
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        rows = conn.execute(
+            "SELECT id, filename, type, uploaded_at, last_updated, "
+            "substr(original_text, max(instr(lower(original_text), lower(?)) - ?, 1), ?) AS excerpt, "
+            "max(instr(lower(original_text), lower(?)) - ?, 1) AS snippet_start "
+            "FROM files WHERE filename LIKE ? ESCAPE '\\' OR original_text LIKE ? ESCAPE '\\' "
+            "ORDER BY uploaded_at DESC LIMIT ? OFFSET ?",
+            (query, SNIPPET_CONTEXT, SNIPPET_LENGTH, query, SNIPPET_CONTEXT,
+             pattern, pattern, limit, offset)
+        ).fetchall()
+        return [
+            _search_result(dict(row), 0.0, make_snippet(row["excerpt"], query, row["snippet_start"] - 1))
+            for row in rows
+        ]
+
+    def get_file_meta(self, file_id: str) -> Optional[Dict]:
+        # original_text 열은 읽지 않음 (크기는 저장할 때 기록한 text_bytes)
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT id, filename, type, uploaded_at, last_updated, preview, content_hash, text_bytes, revision, "
+            "(SELECT count FROM segments WHERE file_id = files.id) AS segment_count "
+            "FROM files WHERE id = ?",
+            (file_id,)
+        ).fetchone()
+        if not row:
+            return None
+        summaries = {
+            r["summary_type"]: {"bytes": r["bytes"], "updated_at": r["updated_at"]}
+            for r in conn.execute(
+                "SELECT summary_type, length(CAST(summary_text AS BLOB)) AS bytes, updated_at "
+                "FROM summaries WHERE file_id = ?",
+                (file_id,)
+            )
+        }
+        return _file_meta(dict(row), row["text_bytes"] or 0, summaries, row["segment_count"] or 0)
+
+    def read_text(self, file_id: str, start: int, end: int) -> Optional[bytes]:
+        conn = self._conn()
+        row = conn.execute("SELECT rowid FROM files WHERE id = ?", (file_id,)).fetchone()
+        if not row:
+            return None
+        if hasattr(conn, "blobopen"):
+            # TEXT 열도 증분 읽기 가능 (UTF-8 바이트 단위)
+            with conn.blobopen("files", "original_text", row["rowid"], readonly=True) as blob:
+                blob.seek(min(start, len(blob)))
+                return blob.read(max(min(end, len(blob)) - start, 0))
+        part = conn.execute(
+            "SELECT substr(CAST(original_text AS BLOB), ?, ?) AS part FROM files WHERE rowid = ?",
+            (start + 1, max(end - start, 0), row["rowid"])
+        ).fetchone()
+        return bytes(part["part"])
+
+    def get_summary(self, file_id: str, summary_type: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT summary_text, updated_at FROM summaries WHERE file_id = ? AND summary_type = ?",
+            (file_id, summary_type)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_corpus_revision(self) -> Dict:
+        row = self._conn().execute(
+            "SELECT epoch, revision, updated_at FROM corpus_revision WHERE id = 1"
+        ).fetchone()
+        return dict(row)
+
+    def get_file_revision(self, file_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT c.epoch, f.revision, COALESCE(f.last_updated, f.uploaded_at) AS updated_at "
+            "FROM files f, corpus_revision c WHERE f.id = ? AND c.id = 1",
+            (file_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_changes(self, after: int, limit: int) -> List[Dict]:
+        rows = self._conn().execute(
+            "SELECT id, revision, type, file_id, data, created_at FROM changes WHERE id > ? ORDER BY id LIMIT ?",
+            (after, limit)
+        )
+        return [
+            _change_event(row["id"], row["type"], row["file_id"], row["revision"], row["created_at"],
+                          json.loads(row["data"]) if row["data"] else None)
+            for row in rows
+        ]
+
+    def get_change_cursor(self) -> Dict:
+        row = self._conn().execute(
+            "SELECT c.epoch, (SELECT MIN(id) FROM changes) AS first, (SELECT MAX(id) FROM changes) AS last "
+            "FROM corpus_revision c WHERE c.id = 1"
+        ).fetchone()
+        return {"epoch": row["epoch"], "first": row["first"], "last": row["last"] or 0}
+
+    def get_segments(self, file_id: str, start: Optional[float], end: Optional[float],
+                     offset: int, limit: Optional[int]) -> Optional[Dict]:
+        # 시각/오프셋 배열만 읽어 범위를 찾은 뒤 텍스트는 필요한 바이트 구간만 읽음
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT rowid, starts, ends, avg_logprobs, text_offsets FROM segments WHERE file_id = ?",
+            (file_id,)
+        ).fetchone()
+        if not row:
+            return None
+        starts = _unpack_array("f", row["starts"])
+        ends = _unpack_array("f", row["ends"])
+        first, last, total = _segment_range(starts, ends, start, end, offset, limit)
+        if first >= last:
+            return {"total": total, "segments": []}
+        
+        avg_logprobs = _unpack_array("f", row["avg_logprobs"])
+        offsets = _unpack_array("I", row["text_offsets"])
+        texts = self._read_texts(conn, row["rowid"], offsets[first], offsets[last])
+        base = offsets[first]
+        return {
+            "total": total,
+            "segments": [
+                _segment_item(i, starts[i], ends[i],
+                              texts[offsets[i] - base:offsets[i + 1] - base].decode("utf-8"), avg_logprobs[i])
+                for i in range(first, last)
+            ]
+        }
+
+    def _read_texts(self, conn: sqlite3.Connection, rowid: int, begin: int, end: int) -> bytes:
+        """texts 열에서 [begin, end) 바이트만 읽기 (증분 BLOB 읽기를 지원하면 전체를 메모리에 올리지 않음)"""
+        if hasattr(conn, "blobopen"):
+            with conn.blobopen("segments", "texts", rowid, readonly=True) as blob:
+                blob.seek(begin)
+                return blob.read(end - begin)
+        row = conn.execute(
+            "SELECT substr(texts, ?, ?) AS part FROM segments WHERE rowid = ?", (begin + 1, end - begin, rowid)
+        ).fetchone()
+        return bytes(row["part"])
+
+    def count_files(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    def insert_job(self, job: Dict) -> None:
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, filename, upload_path, content_hash, model, language, throughput, status, "
+                "progress, message, file_id, attempts, last_event_id, created_at, updated_at) "
+                "VALUES (:id, :filename, :upload_path, :content_hash, :model, :language, :throughput, :status, "
+                ":progress, :message, :file_id, :attempts, :last_event_id, :created_at, :updated_at)",
+                job
+            )
+
+    def get_job(self, job_id: str) -> Optional[Dict]:
+        row = self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def claim_next_job(self, updated_at: str) -> Optional[Dict]:
+        # 여러 워커가 동시에 꺼내도 BEGIN IMMEDIATE로 한 작업은 한 워커만 가져감
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+            ).fetchone()
+            if not row:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'processing', attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (updated_at, row["id"])
+            )
+            return dict(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+    def add_job_event(self, job_id: str, event: Dict, updated_at: str) -> int:
+        state = _job_state(event)
+        with self._write() as conn:
+            row = conn.execute("SELECT last_event_id FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if not row:
+                return 0
+            seq = row["last_event_id"] + 1
+            conn.execute(
+                "INSERT INTO job_events (job_id, seq, data) VALUES (?, ?, ?)",
+                (job_id, seq, json.dumps(event, ensure_ascii=False))
+            )
+            assignments = ", ".join(f"{column} = ?" for column in state)
+            conn.execute(
+                f"UPDATE jobs SET {assignments}, last_event_id = ?, updated_at = ? WHERE id = ?",
+                (*state.values(), seq, updated_at, job_id)
+            )
+            # 재연결한 클라이언트에는 완료/오류 이벤트만 다시 보내면 되므로 중간 이벤트(부분 결과 포함)는 삭제
+            if state.get("status") in JOB_FINISHED:
+                conn.execute("DELETE FROM job_events WHERE job_id = ? AND seq < ?", (job_id, seq))
+            return seq
+
+    def get_job_events(self, job_id: str, after: int) -> List[Dict]:
+        rows = self._conn().execute(
+            "SELECT seq, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after)
+        )
+        return [{"seq": row["seq"], "data": json.loads(row["data"])} for row in rows]
+
+    def requeue_interrupted_jobs(self, updated_at: str) -> List[Dict]:
+        with self._write() as conn:
+            rows = conn.execute("SELECT * FROM jobs WHERE status = 'processing'").fetchall()
+            conn.execute(
+                "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'processing'",
+                (updated_at,)
+            )
+            return [dict(row) for row in rows]
+
+    def list_active_jobs(self) -> List[Dict]:
+        rows = self._conn().execute(
+            "SELECT * FROM jobs WHERE status NOT IN ('completed', 'error') ORDER BY created_at"
+        )
+        return [dict(row) for row in rows]
+
+    def count_jobs_by_status(self) -> Dict[str, int]:
+        rows = self._conn().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        return {row["status"]: row["n"] for row in rows}
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK 컨텍스트 매니저"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
+
+
+# ============ 마이그레이션 ============
+
+def migrate_json_to_sqlite(json_path: Path = DB_FILE, backend: Optional[SQLiteBackend] = None) -> int:
+    """기존 files_db.json을 SQLite로 한 번에 옮기고 원본은 .migrated로 이름을 바꿉니다."""
+    json_path = Path(json_path)
+    if not json_path.exists():
+        return 0
+
+    # JSON 백엔드의 쓰기 로그가 남아 있으면 먼저 스냅샷에 합침
+    wal_path = json_path.with_name(json_path.name + ".wal")
+    if wal_path.exists():
+        JsonBackend(json_path).close()
+
+    backend = backend or SQLiteBackend()
+    data = load_db(json_path)
+
+    files = data.get("files", [])
+    backend.insert_files(files)
+
+    json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+    if wal_path.exists():
+        wal_path.unlink()
+    print(f"✓ {json_path} → {backend.path} 마이그레이션 완료 ({len(files)}개 파일)")
+    return len(files)
+
+
+# ============ 공개 API ============
+
+_backend: Optional[StorageBackend] = None
+# 파일/요약이 바뀐 뒤(커밋 후) 호출할 콜백 (쓰기를 한 스레드에서 호출됨)
+_change_listeners: List[Callable[[], None]] = []
+
+_backend_lock = threading.Lock()
+
+def get_backend() -> StorageBackend:
+    """현재 저장소 백엔드 반환 (처음 호출할 때 초기화하므로 import만으로는 파일을 만들거나 마이그레이션하지 않음)"""
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                init_db()
+    return _backend
+
+def init_db():
+    """데이터베이스 초기화 (SQLite 사용 시 기존 JSON 데이터 자동 마이그레이션)"""
+    global _backend
+    if DB_BACKEND == "json":
+        _backend = JsonBackend(DB_FILE)
+    else:
+        _backend = SQLiteBackend(SQLITE_FILE)
+        if DB_FILE.exists():
+            migrate_json_to_sqlite(DB_FILE, _backend)
+
+def close_db():
+    """서버 종료 시 호출 (JSON 백엔드는 쓰기 로그를 스냅샷으로 합침)"""
+    if _backend is not None:
+        _backend.close()
+
+def new_file_record(filename: str, file_type: str, original_text: str,
+                    content_hash: Optional[str] = None, uploaded_at: Optional[str] = None,
+                    segments: Optional[List[Dict]] = None) -> Dict:
+    """저장하기 전의 새 파일 레코드 (uploaded_at이 없으면 현재 시각, segments는 Whisper 세그먼트 목록)"""
     record = {
-        "id": file_id,
+        "id": str(uuid.uuid4()),
         "filename": filename,
         "type": file_type,  # recording, video, audio, text
-        "uploaded_at": datetime.now().isoformat(),
+        "uploaded_at": uploaded_at or datetime.now().isoformat(),
         "original_text": original_text,
+        "preview": make_preview(original_text),
         "summaries": {}
     }
-    
-    db = load_db()
-    db["files"].append(record)
-    save_db(db)
-    
+    if content_hash:
+        record["content_hash"] = content_hash
+    if segments:
+        record["segments"] = segment_columns(segments)
     return record
 
+def create_file_record(filename: str, file_type: str, original_text: str,
+                       content_hash: Optional[str] = None, segments: Optional[List[Dict]] = None) -> Dict:
+    """
+    새 파일 레코드 생성 (content_hash: 업로드 원본의 SHA-256, 같은 원본끼리 연결)
+    segments(start, end, text, avg_logprob)가 있으면 같은 트랜잭션에서 열 단위로 함께 저장
+    """
+    record = new_file_record(filename, file_type, original_text, content_hash, segments=segments)
+    get_backend().insert_file(record)
+    _notify_change_listeners()
+    return record
+
+def insert_file_records(records: List[Dict]) -> int:
+    """new_file_record로 만든 레코드 여러 개를 한 번에 저장 (SQLite는 한 트랜잭션). 저장된 행 수 반환"""
+    if not records:
+        return 0
+    inserted = get_backend().insert_files(records)
+    if inserted:
+        _notify_change_listeners()
+    return inserted
+
 def get_all_files() -> List[Dict]:
-    """모든 파일 목록 조회"""
-    db = load_db()
-    # 최신순 정렬
-    files = sorted(db["files"], key=lambda x: x["uploaded_at"], reverse=True)
-    return files
+    """모든 파일 목록 조회 (최신순)"""
+    return get_backend().get_all_files()
+
+def list_files(limit: int = 50, cursor: Optional[str] = None,
+               file_type: Optional[str] = None) -> tuple:
+    """파일 목록 한 페이지 조회 (본문 제외). (files, next_cursor) 반환"""
+    decoded = decode_cursor(cursor) if cursor else None
+    # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+    files = get_backend().list_files(limit + 1, decoded, file_type)
+    next_cursor = None
+    if len(files) > limit:
+        files = files[:limit]
+        next_cursor = encode_cursor(files[-1]["uploaded_at"], files[-1]["id"])
+    return files, next_cursor
 
 def get_file_by_id(file_id: str) -> Optional[Dict]:
     """ID로 파일 조회"""
-    db = load_db()
-    for file in db["files"]:
-        if file["id"] == file_id:
-            return file
-    return None
+    return get_backend().get_file_by_id(file_id)
 
 def update_summary(file_id: str, summary_type: str, summary_text: str) -> bool:
     """파일에 요약 추가/업데이트"""
-    db = load_db()
-    for file in db["files"]:
-        if file["id"] == file_id:
-            file["summaries"][summary_type] = summary_text
-            file["last_updated"] = datetime.now().isoformat()
-            save_db(db)
-            return True
-    return False
+    updated = get_backend().update_summary(file_id, summary_type, summary_text, datetime.now().isoformat())
+    if updated:
+        _notify_change_listeners()
+    return updated
 
 def delete_summary(file_id: str, summary_type: str) -> bool:
     """파일의 특정 요약 삭제"""
-    db = load_db()
-    for file in db["files"]:
-        if file["id"] == file_id:
-            if "summaries" not in file:
-                file["summaries"] = {}
-            if summary_type in file["summaries"]:
-                del file["summaries"][summary_type]
-                file["last_updated"] = datetime.now().isoformat()
-                save_db(db)
-            return True  # 파일이 존재하면 요약이 없어도 성공으로 처리
-    return False
+    deleted = get_backend().delete_summary(file_id, summary_type, datetime.now().isoformat())
+    if deleted:
+        _notify_change_listeners()
+    return deleted
 
 def delete_file(file_id: str) -> bool:
     """파일 삭제"""
-    db = load_db()
-    original_length = len(db["files"])
-    db["files"] = [f for f in db["files"] if f["id"] != file_id]
-    
-    if len(db["files"]) < original_length:
-        save_db(db)
-        return True
-    return False
-
-def search_files(query: str) -> List[Dict]:
-    """파일 검색"""
-    db = load_db()
-    query_lower = query.lower()
-    
-    results = []
-    for file in db["files"]:
-        if (query_lower in file["filename"].lower() or
-            query_lower in file["original_text"].lower()):
-            results.append(file)
-    
-    return sorted(results, key=lambda x: x["uploaded_at"], reverse=True)
-
-# 초기화
-init_db()
+    deleted = get_backend().delete_file(file_id)
+    if deleted:
+        _notify_change_listeners()
+    return deleted
+
+def add_change_listener(callback: Callable[[], None]) -> None:
+    """파일/요약 변경이 커밋될 때마다 호출할 콜백 등록 (다른 프로세스의 변경은 알리지 않음)"""
+    _change_listeners.append(callback)
+
+def remove_change_listener(callback: Callable[[], None]) -> None:
+    if callback in _change_listeners:
+        _change_listeners.remove(callback)
+
+def _notify_change_listeners() -> None:
+    for callback in list(_change_listeners):
+        try:
+            callback()
+        except Exception as e:
+            print(f"변경 알림 오류: {e}")
+
+def get_changes(after: int = 0, limit: int = 500) -> List[Dict]:
+    """변경 피드에서 id가 after보다 큰 변경을 순서대로 조회"""
+    return get_backend().get_changes(after, limit)
+
+def get_change_cursor() -> Dict:
+    """변경 피드 범위 {"epoch", "first": 보관 중인 가장 오래된 id, "last": 마지막 id}"""
+    return get_backend().get_change_cursor()
+
+def get_file_meta(file_id: str) -> Optional[Dict]:
+    """본문 없이 메타데이터와 크기(text_bytes, 요약별 bytes, segment_count)만 조회"""
+    return get_backend().get_file_meta(file_id)
+
+def read_text(file_id: str, start: int = 0, end: Optional[int] = None) -> Optional[bytes]:
+    """원본 텍스트(UTF-8)의 [start, end) 바이트 구간 (파일이 없으면 None)"""
+    if end is None:
+        meta = get_file_meta(file_id)
+        if meta is None:
+            return None
+        end = meta["text_bytes"]
+    return get_backend().read_text(file_id, start, end)
+
+def get_summary(file_id: str, summary_type: str) -> Optional[Dict]:
+    """요약 하나 조회 ({"summary_text", "updated_at"}, 없으면 None)"""
+    return get_backend().get_summary(file_id, summary_type)
+
+def get_corpus_revision() -> Dict:
+    """
+    전체 리비전 {"epoch", "revision", "updated_at"}
+    파일 추가/삭제, 요약 저장/삭제 때마다 revision이 올라가므로 목록/검색 응답의 ETag로 사용합니다.
+    """
+    return get_backend().get_corpus_revision()
+
+def get_file_revision(file_id: str) -> Optional[Dict]:
+    """파일 하나의 리비전 {"epoch", "revision", "updated_at"} (본문은 읽지 않음, 없는 파일이면 None)"""
+    return get_backend().get_file_revision(file_id)
+
+def get_segments(file_id: str, start: Optional[float] = None, end: Optional[float] = None,
+                 offset: int = 0, limit: Optional[int] = None) -> Optional[Dict]:
+    """
+    [start, end) 초 범위와 겹치는 세그먼트 조회 (원본 텍스트는 읽지 않음)
+    {"total": 범위 안 세그먼트 수, "segments": [{"index", "start", "end", "text", "avg_logprob"}]}, 세그먼트가 없으면 None
+    """
+    return get_backend().get_segments(file_id, start, end, offset, limit)
+
+def search_files(query: str, limit: int = 20, offset: int = 0) -> List[Dict]:
+    """파일 검색 (관련도순, 결과에는 본문 대신 강조된 스니펫 포함)"""
+    return get_backend().search_files(query, limit, offset)
+
+# ============ 작업 대기열 ============
+
+def create_job(filename: str, upload_path: str, content_hash: Optional[str] = None,
+               model: Optional[str] = None, language: Optional[str] = None, throughput: bool = False) -> Dict:
+    """
+    변환 작업 등록 (업로드 파일은 작업이 끝날 때까지 upload_path에 보관, model/language가 없으면 기본값)
+    throughput이면 단계 안내 이벤트를 기록하지 않음
+    """
+    now = datetime.now().isoformat()
+    job = {
+        "id": str(uuid.uuid4()),
+        "filename": filename,
+        "upload_path": str(upload_path),
+        "content_hash": content_hash,
+        "model": model,
+        "language": language,
+        "throughput": bool(throughput),
+        "status": "queued",
+        "progress": 0,
+        "message": "대기 중...",
+        "file_id": None,
+        "attempts": 0,
+        "last_event_id": 0,
+        "created_at": now,
+        "updated_at": now
+    }
+    get_backend().insert_job(job)
+    return job
+
+def get_job(job_id: str) -> Optional[Dict]:
+    """ID로 작업 조회"""
+    return get_backend().get_job(job_id)
+
+def claim_next_job() -> Optional[Dict]:
+    """가장 오래된 대기 작업을 처리 중으로 바꾸고 반환 (없으면 None)"""
+    return get_backend().claim_next_job(datetime.now().isoformat())
+
+def add_job_event(job_id: str, event: Dict) -> int:
+    """작업 진행 이벤트 기록 및 작업 상태 갱신. 이벤트 번호(1부터 증가) 반환"""
+    return get_backend().add_job_event(job_id, event, datetime.now().isoformat())
+
+def get_job_events(job_id: str, after: int = 0) -> List[Dict]:
+    """after 이후의 진행 이벤트 목록 ([{"seq", "data"}])"""
+    return get_backend().get_job_events(job_id, after)
+
+def requeue_interrupted_jobs() -> List[Dict]:
+    """서버 종료로 중단된 처리 중 작업을 다시 대기 상태로 되돌림"""
+    return get_backend().requeue_interrupted_jobs(datetime.now().isoformat())
+
+def list_active_jobs() -> List[Dict]:
+    """끝나지 않은 작업 목록 (대기/처리 중)"""
+    return get_backend().list_active_jobs()
 
+def count_jobs_by_status() -> Dict[str, int]:
+    """상태별 작업 수 (대기열 길이 지표용)"""
+    return get_backend().count_jobs_by_status()
@@ -0,0 +1,179 @@
+"""
+텍스트 변환 결과 일괄 가져오기
+zip(안의 .txt 파일) 또는 NDJSON(한 줄에 {"filename": ..., "text": ...} 하나)을 스트리밍으로 읽어
+배치 단위 트랜잭션으로 저장합니다.
+
+사용법:
+    python ingest.py transcripts.zip legacy.ndjson --batch-size 1000
+
+NDJSON 한 줄의 필드: text(필수), filename, type(기본 text), uploaded_at(ISO 형식)
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import zipfile
+import argparse
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import database as db
+
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", 1000))
+# 보고서에 담을 오류 예시 최대 개수
+MAX_ERROR_SAMPLES = 20
+
+NDJSON_EXTENSIONS = (".ndjson", ".jsonl")
+FILE_TYPES = ("recording", "video", "audio", "text")
+
+
+def decode_text(content: bytes) -> str:
+    """텍스트 디코딩 (UTF-8 실패 시 cp949, 그것도 실패하면 latin-1)"""
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        try:
+            return content.decode("cp949")
+        except UnicodeDecodeError:
+            return content.decode("latin-1")
+
+
+def detect_format(path: Path) -> Optional[str]:
+    """파일 형식 ("zip", "ndjson", 알 수 없으면 None)"""
+    suffix = path.suffix.lower()
+    if suffix == ".zip":
+        return "zip"
+    if suffix in NDJSON_EXTENSIONS:
+        return "ndjson"
+    if zipfile.is_zipfile(path):
+        return "zip"
+    return None
+
+
+def iter_zip(path: Path) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    """zip 안의 .txt 파일을 하나씩 읽어 (레코드, 오류)를 yield (한 번에 멤버 하나만 메모리에 올림)"""
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            name = PurePosixPath(info.filename)
+            # 폴더와 macOS 메타데이터 파일은 건너뜀
+            if info.is_dir() or "__MACOSX" in name.parts or name.name.startswith("._"):
+                continue
+            if name.suffix.lower() != ".txt":
+                continue
+            try:
+                content = archive.read(info)
+            except (zipfile.BadZipFile, OSError, RuntimeError) as e:
+                yield None, f"{info.filename}: {e}"
+                continue
+            yield db.new_file_record(
+                filename=name.name,
+                file_type="text",
+                original_text=decode_text(content),
+                content_hash=hashlib.sha256(content).hexdigest()
+            ), None
+
+
+def iter_ndjson(path: Path) -> Iterator[Tuple[Optional[Dict], Optional[str]]]:
+    """NDJSON을 한 줄씩 읽어 (레코드, 오류)를 yield"""
+    with open(path, "rb") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(decode_text(line))
+                text = item["text"]
+                if not isinstance(text, str):
+                    raise ValueError("text는 문자열이어야 합니다")
+                file_type = item.get("type") or "text"
+                if file_type not in FILE_TYPES:
+                    raise ValueError(f"알 수 없는 type: {file_type}")
+                uploaded_at = item.get("uploaded_at")
+                if uploaded_at is not None:
+                    datetime.fromisoformat(uploaded_at)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                yield None, f"{line_no}번째 줄: {e}"
+                continue
+            yield db.new_file_record(
+                filename=item.get("filename") or f"import_{line_no}.txt",
+                file_type=file_type,
+                original_text=text,
+                content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                uploaded_at=uploaded_at
+            ), None
+
+
+def ingest_file(path: Path, batch_size: int = IMPORT_BATCH_SIZE, fmt: Optional[str] = None) -> Dict:
+    """zip/NDJSON 파일을 batch_size개씩 한 트랜잭션으로 저장하고 처리 결과(초당 행 수 포함)를 반환"""
+    path = Path(path)
+    fmt = fmt or detect_format(path)
+    if fmt == "zip":
+        items = iter_zip(path)
+    elif fmt == "ndjson":
+        items = iter_ndjson(path)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {path.name} (지원: .zip, .ndjson, .jsonl)")
+
+    batch_size = max(batch_size, 1)
+    started = time.perf_counter()
+    imported = 0
+    batches = 0
+    errors = 0
+    error_samples: List[str] = []
+    batch: List[Dict] = []
+
+    def flush():
+        nonlocal imported, batches
+        imported += db.insert_file_records(batch)
+        batches += 1
+        batch.clear()
+
+    for record, error in items:
+        if error is not None:
+            errors += 1
+            if len(error_samples) < MAX_ERROR_SAMPLES:
+                error_samples.append(error)
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    seconds = time.perf_counter() - started
+    return {
+        "source": path.name,
+        "format": fmt,
+        "imported": imported,
+        "errors": errors,
+        "error_samples": error_samples,
+        "batches": batches,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(imported / seconds, 1) if seconds > 0 else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트 변환 결과 일괄 가져오기 (zip / NDJSON)")
+    parser.add_argument("paths", nargs="+", help="가져올 .zip / .ndjson / .jsonl 파일")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="트랜잭션 하나에 저장할 행 수")
+    args = parser.parse_args()
+
+    failed = False
+    for path in args.paths:
+        try:
+            report = ingest_file(Path(path), args.batch_size)
+        except (ValueError, OSError, zipfile.BadZipFile) as e:
+            print(f"✗ {path}: {e}")
+            failed = True
+            continue
+        print(f"✓ {report['source']}: {report['imported']}개 저장, 오류 {report['errors']}개, "
+              f"{report['seconds']}초 ({report['rows_per_second']}행/초)")
+        for error in report["error_samples"]:
+            print(f"  - {error}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
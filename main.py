@@ -1,21 +1,45 @@
+import time
+
+# 서버 시작 시간 측정 (모듈 import부터)
+_process_started = time.perf_counter()
+
 import os
 import tempfile
 import uuid
 import json
 import asyncio
+import zlib
+import hashlib
+import functools
 from pathlib import Path
-from typing import Optional, List
+from urllib.parse import quote, urlencode
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional, List, Dict, Set
 from dotenv import load_dotenv
 from pydantic import BaseModel
 
-import whisper
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+import numpy as np
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydub import AudioSegment
-import google.generativeai as genai
 
+try:
+    # 선택 사항: 설치되어 있으면 Accept-Encoding: br 응답 지원 (없으면 gzip만)
+    import brotli
+except ImportError:
+    brotli = None
+
+import audio as audio_utils
 import database as db
+import ingest
+import metrics
+import summarizer
+import transcriber
+from cache import response_cache, summary_cache, transcript_cache, transcript_cache_key
+
+# torch/whisper/google.generativeai는 실제로 필요할 때 import (대시보드만 쓰는 서버는 빠르게 시작)
+startup_timings = {"imports": round(time.perf_counter() - _process_started, 3)}
 
 # Pydantic 모델
 class ApiKeyRequest(BaseModel):
@@ -26,176 +50,236 @@ load_dotenv()
 
 app = FastAPI(title="MP4 to Text Converter")
 
-# Gemini API 설정 (사용자가 직접 입력)
-gemini_api_key = None
-gemini_model = None
-
-def set_gemini_api_key(api_key: str) -> bool:
-    """Gemini API 키 설정"""
-    global gemini_api_key, gemini_model
-    try:
-        genai.configure(api_key=api_key)
-        # gemini-2.0-flash: 최신 모델, 저렴하고 빠름 (무료 티어 10 RPM, 100만 토큰/분)
-        model = genai.GenerativeModel('gemini-2.0-flash-exp')
-        
-        # 간단한 테스트로 API 키 검증
-        test_response = model.generate_content("Hi")
-        
-        # 테스트 성공하면 전역 변수에 저장
-        gemini_model = model
-        gemini_api_key = api_key
-        print("✓ Gemini API 연결 완료! (모델: gemini-2.0-flash-exp)")
-        return True
-    except Exception as e:
-        print(f"Gemini API 연결 실패: {e}")
-        gemini_model = None
-        gemini_api_key = None
-        return False
-
 # 디렉토리 생성
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-# 정적 파일 서빙
-app.mount("/static", StaticFiles(directory="static"), name="static")
+# 업로드 스트리밍 설정 (MAX_UPLOAD_SIZE가 0이면 제한 없음)
+UPLOAD_CHUNK_SIZE = int(os.environ.get("UPLOAD_CHUNK_SIZE", 1024 * 1024))
+MAX_UPLOAD_SIZE = int(os.environ.get("MAX_UPLOAD_SIZE", 4 * 1024 ** 3))
 
-# Whisper 모델 로드 (base 모델 사용, 더 큰 모델이 필요하면 'medium' 또는 'large'로 변경)
-print("Whisper 모델을 로드하는 중...")
-model = whisper.load_model("base")
-print("Whisper 모델 로드 완료!")
+# 동시 처리 제한 (서버 전체에서 공유)
+# 음성 인식은 기본적으로 Whisper 워커 수만큼 (배치를 사용하면 배치 크기만큼 더) 동시에 처리
+MAX_CONCURRENT_EXTRACTIONS = int(os.environ.get("MAX_CONCURRENT_EXTRACTIONS", max(1, (os.cpu_count() or 2) // 2)))
+MAX_CONCURRENT_TRANSCRIPTIONS = int(os.environ.get(
+    "MAX_CONCURRENT_TRANSCRIPTIONS",
+    transcriber.WHISPER_WORKERS * max(transcriber.WHISPER_BATCH_SIZE, 1)
+))
+extraction_semaphore = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
 
+# 작업 대기열을 처리하는 백그라운드 워커 수 (각 단계의 동시 실행 수는 위 세마포어가 제한)
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", MAX_CONCURRENT_EXTRACTIONS + MAX_CONCURRENT_TRANSCRIPTIONS))
+# 새 작업 알림을 놓쳤을 때를 대비한 대기열 확인 주기(초)
+JOB_POLL_INTERVAL = 5.0
 
-async def send_progress(message: str, progress: int, status: str = "processing"):
-    """진행 상황 메시지를 생성합니다."""
-    data = {
-        "message": message,
-        "progress": progress,
-        "status": status
-    }
-    return f"data: {json.dumps(data)}\n\n"
+# SSE 진행 이벤트 사이 최소 간격(밀리초, 0이면 처리되는 대로 전송)
+# 처리 자체는 늦추지 않고 클라이언트로 보내는 스트림에서만 간격을 둠
+PROGRESS_MIN_INTERVAL_MS = int(os.environ.get("PROGRESS_MIN_INTERVAL_MS", 0))
 
+# 1이면 서버 시작 후 백그라운드에서 Whisper 모델을 미리 로드 (기본: 첫 음성 인식 때 로드)
+WHISPER_WARMUP = os.environ.get("WHISPER_WARMUP", "0").lower() in ("1", "true", "yes")
 
-def extract_audio_from_video(video_path: str, audio_path: str) -> bool:
-    """MP4 비디오에서 오디오를 추출합니다."""
-    try:
-        # pydub을 사용하여 오디오 추출
-        video = AudioSegment.from_file(video_path, format="mp4")
-        video.export(audio_path, format="wav")
-        return True
-    except Exception as e:
-        print(f"오디오 추출 오류: {e}")
-        return False
+# 정적 파일 서빙
+app.mount("/static", StaticFiles(directory="static"), name="static")
 
+# Whisper 모델은 워커 프로세스에서 로드 (WHISPER_MODEL 환경 변수로 'medium', 'large' 등 변경 가능)
+@app.on_event("startup")
+async def start_transcription_pool():
+    """Whisper 워커 풀 준비 (WHISPER_WARMUP이면 서버 시작을 막지 않고 백그라운드에서 모델 로드)"""
+    if WHISPER_WARMUP:
+        warmup_tasks.append(asyncio.create_task(warm_up_transcription_pool()))
+    else:
+        print("Whisper 모델은 첫 음성 인식 요청 때 로드합니다.")
 
-def transcribe_audio(audio_path: str, language: str = "ko") -> Optional[str]:
-    """Whisper를 사용하여 오디오를 텍스트로 변환합니다."""
+
+async def warm_up_transcription_pool():
+    print(f"Whisper 워커 {transcriber.pool.workers}개를 백그라운드에서 시작하는 중...")
     try:
-        result = model.transcribe(audio_path, language=language, fp16=False, verbose=False)
-        return result["text"]
+        await transcriber.pool.ensure_started()
+        print(f"Whisper 모델 로드 완료! ({transcriber.pool.load_seconds}초)")
     except Exception as e:
-        print(f"음성 인식 오류: {e}")
-        return None
+        # 첫 음성 인식 요청 때 다시 시도
+        print(f"Whisper 모델 미리 로드 실패: {e}")
+
+
+@app.on_event("startup")
+async def open_database():
+    """저장소 열기 (SQLite 사용 시 기존 JSON 데이터 마이그레이션, JSON 백엔드는 쓰기 로그 복구)"""
+    await asyncio.to_thread(db.get_backend)
+
+
+@app.on_event("startup")
+async def start_job_workers():
+    """중단된 작업을 대기열로 되돌리고 작업 워커를 시작합니다."""
+    global job_wakeup
+    job_wakeup = asyncio.Event()
+    interrupted = await asyncio.to_thread(db.requeue_interrupted_jobs)
+    for job in interrupted:
+        await asyncio.to_thread(
+            db.add_job_event, job["id"],
+            {"message": f"{job['filename']}: 서버 재시작으로 처음부터 다시 처리합니다.", "progress": 0, "status": "queued"}
+        )
+    if interrupted:
+        print(f"중단된 작업 {len(interrupted)}개를 다시 대기열에 넣었습니다.")
+    await asyncio.to_thread(remove_orphan_uploads)
+    for worker_id in range(JOB_WORKERS):
+        job_worker_tasks.append(asyncio.create_task(job_worker(worker_id)))
 
 
-async def summarize_with_gemini(text: str, summary_type: str = "general") -> Optional[str]:
-    """Gemini API로 텍스트를 요약합니다."""
-    if not gemini_model or not gemini_api_key:
-        return "⚠ Gemini API 키가 설정되지 않았습니다. 설정에서 API 키를 입력해주세요."
-    
-    try:
-        prompts = {
-            "general": f"""다음 텍스트를 명확하고 간결하게 요약해주세요. 
-핵심 내용을 3-5개의 주요 포인트로 정리하세요.
+@app.on_event("startup")
+async def watch_storage_changes():
+    """저장소 쓰기(작업 워커, 가져오기 등 다른 스레드 포함)를 변경 피드 구독자에게 알림"""
+    global change_callback
+    loop = asyncio.get_running_loop()
+    change_callback = lambda: loop.call_soon_threadsafe(notify_change_listeners)
+    db.add_change_listener(change_callback)
 
-텍스트:
-{text}
 
-요약:""",
-            
-            "meeting": f"""다음 회의 내용을 회의록 형식으로 정리해주세요:
+@app.on_event("startup")
+async def report_startup_timing():
+    """시작 단계별 소요 시간 기록 (/api/startup)"""
+    startup_timings["ready"] = round(time.perf_counter() - _process_started, 3)
+    startup_timings["startup_handlers"] = round(startup_timings["ready"] - startup_timings["imports"], 3)
+    print(f"서버 준비 완료: {startup_timings['ready']}초 (import {startup_timings['imports']}초)")
 
-[원본]
-{text}
 
-[회의록 형식]
-## 📋 회의 개요
+@app.on_event("shutdown")
+async def stop_transcription_pool():
+    """작업 워커와 Whisper 워커 풀을 종료합니다. (처리 중이던 작업은 다음 시작 때 이어서 처리)"""
+    tasks = job_worker_tasks + warmup_tasks
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    job_worker_tasks.clear()
+    warmup_tasks.clear()
+    transcriber.pool.shutdown()
 
-## 💬 주요 논의 사항
-- 
 
-## ✅ 결정 사항
-- 
+@app.on_event("shutdown")
+async def stop_watching_storage_changes():
+    if change_callback is not None:
+        db.remove_change_listener(change_callback)
 
-## 📌 향후 계획
-- 
 
-## 🔔 기타 사항
-- """,
-            
-            "lecture": f"""다음 강의 내용을 학습 노트 형식으로 요약해주세요:
+@app.on_event("shutdown")
+async def close_database():
+    """저장소 정리 (JSON 백엔드는 쓰기 로그를 스냅샷으로 합침)"""
+    await asyncio.to_thread(db.close_db)
+
 
-[강의 내용]
-{text}
+async def send_progress(message: str, progress: int, status: str = "processing", **extra):
+    """진행 상황 메시지를 생성합니다."""
+    data = {
+        "message": message,
+        "progress": progress,
+        "status": status,
+        **extra
+    }
+    return f"data: {json.dumps(data)}\n\n"
 
-[학습 노트]
-## 📚 핵심 개념
-- 
 
-## 💡 주요 내용
-1. 
+def is_cosmetic_event(event: dict) -> bool:
+    """단계 안내만 담긴 진행 이벤트인지 (부분 결과/최종 결과/오류가 아닌 이벤트)"""
+    return event.get("status") == "processing" and "partial_text" not in event
 
-## 📝 예시/사례
-- 
 
-## 🎯 핵심 요점
-- """,
-            
-            "youtube": f"""다음 영상 내용을 유튜브 요약 형식으로 정리해주세요:
+class ProgressPacer:
+    """클라이언트로 보내는 SSE 이벤트 사이에 최소 표시 간격을 둡니다. (이벤트를 만드는 처리 쪽은 기다리지 않음)"""
+    
+    def __init__(self, min_interval_ms: int):
+        self.min_interval = max(min_interval_ms, 0) / 1000
+        self._last_sent: Optional[float] = None
+    
+    async def wait(self):
+        if self.min_interval and self._last_sent is not None:
+            delay = self._last_sent + self.min_interval - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        self._last_sent = time.perf_counter()
 
-[영상 내용]
-{text}
 
-[요약]
-## 🎬 영상 개요
-- 
+def resolve_transcription_options(model: Optional[str], language: Optional[str]) -> tuple:
+    """요청한 Whisper 모델/언어 확인 (비어 있으면 기본값). 잘못된 값이면 400"""
+    try:
+        return transcriber.validate_model(model), transcriber.validate_language(language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-## ⏱ 주요 내용
-- 
 
-## 💎 핵심 메시지
-- 
+def format_duration(seconds: float) -> str:
+    """초를 분:초 문자열로 변환합니다."""
+    minutes, secs = divmod(int(seconds), 60)
+    return f"{minutes}:{secs:02d}"
 
-## 📌 타임라인 요약
-- """,
-            
-            "conversation": f"""다음 대화 내용을 정리해주세요:
 
-[대화 내용]
-{text}
+class UploadTooLargeError(Exception):
+    """업로드 크기 제한 초과"""
 
-[정리]
-## 💬 대화 주제
-- 
 
-## 📝 주요 토픽
-1. 
+def format_size(num_bytes: int) -> str:
+    """바이트 수를 MB 단위 문자열로 변환합니다."""
+    return f"{num_bytes / (1024 * 1024):.1f}MB"
 
-## 🗣 핵심 의견
-- 
 
-## 📌 결론
-- """
-        }
-        
-        prompt = prompts.get(summary_type, prompts["general"])
-        
-        # Gemini API 호출
-        response = await asyncio.to_thread(gemini_model.generate_content, prompt)
-        return response.text
-        
-    except Exception as e:
-        print(f"Gemini 요약 오류: {e}")
-        return f"요약 생성 중 오류가 발생했습니다: {str(e)}"
+async def save_upload_stream(file: UploadFile, dest: Path, hasher=None):
+    """업로드 파일을 청크 단위로 디스크에 기록하며 (받은 바이트, 전체 바이트)를 yield합니다.
+    
+    hasher가 주어지면 기록하는 동안 같은 청크로 콘텐츠 해시를 함께 계산합니다.
+    """
+    total = file.size
+    if MAX_UPLOAD_SIZE and total and total > MAX_UPLOAD_SIZE:
+        raise UploadTooLargeError(f"파일이 너무 큽니다 (최대 {format_size(MAX_UPLOAD_SIZE)})")
+    
+    received = 0
+    # 업로드 본문 읽기와 디스크 기록 시간을 나눠서 기록
+    read_seconds = 0.0
+    write_seconds = 0.0
+    try:
+        with open(dest, "wb") as buffer:
+            while True:
+                started = time.perf_counter()
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                read_seconds += time.perf_counter() - started
+                if not chunk:
+                    break
+                received += len(chunk)
+                # 크기 정보가 없는 경우에도 기록하면서 제한 확인
+                if MAX_UPLOAD_SIZE and received > MAX_UPLOAD_SIZE:
+                    raise UploadTooLargeError(f"파일이 너무 큽니다 (최대 {format_size(MAX_UPLOAD_SIZE)})")
+                if hasher is not None:
+                    hasher.update(chunk)
+                started = time.perf_counter()
+                await asyncio.to_thread(buffer.write, chunk)
+                write_seconds += time.perf_counter() - started
+                yield received, total
+    finally:
+        metrics.stage_seconds.observe(read_seconds, stage="upload")
+        metrics.stage_seconds.observe(write_seconds, stage="save")
+
+
+def extract_audio(media_path: str, spill_path: str) -> np.ndarray:
+    """영상/음성 파일을 ffmpeg로 바로 16kHz 모노 float32 배열로 디코딩합니다.
+    
+    긴 입력은 spill_path에 기록한 뒤 memmap 배열로 반환합니다.
+    """
+    return audio_utils.load_pcm(media_path, spill_path)
+
+
+async def transcribe_audio(audio: np.ndarray, language: str = transcriber.WHISPER_LANGUAGE,
+                           model_name: Optional[str] = None):
+    """Whisper 워커에서 16kHz PCM 배열을 무음 구간 단위로 나눠 차례로 인식합니다.
+    
+    구간마다 (인식 결과, 처리한 오디오 초, 전체 오디오 초)를 yield합니다.
+    """
+    total_seconds = audio_utils.duration_seconds(audio)
+    chunks = await asyncio.to_thread(audio_utils.split_on_silence, audio)
+    prompt = None
+    for start, end in chunks:
+        result = await transcriber.pool.transcribe_chunk(audio, start, end, language, prompt, model_name)
+        # 다음 구간에 앞 문맥 전달 (Whisper의 condition_on_previous_text와 같은 역할)
+        prompt = result["text"][-200:] or prompt
+        yield result, end / audio_utils.SAMPLE_RATE, total_seconds
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -205,141 +289,241 @@ async def read_root():
         return f.read()
 
 
-async def process_single_file(file: UploadFile, file_index: int, total_files: int):
-    """단일 파일을 처리하고 진행 상황을 생성합니다."""
+# 지원하는 확장자
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
+AUDIO_EXTENSIONS = ('.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.wma', '.opus', '.webm')
+TEXT_EXTENSIONS = ('.txt',)
+
+
+def detect_file_kind(filename: str) -> Optional[str]:
+    """확장자로 파일 종류를 판별합니다. ("video", "audio", "text" 또는 지원하지 않으면 None)"""
+    filename_lower = filename.lower()
+    if filename_lower.endswith(VIDEO_EXTENSIONS):
+        return "video"
+    if filename_lower.endswith(AUDIO_EXTENSIONS):
+        return "audio"
+    if filename_lower.endswith(TEXT_EXTENSIONS):
+        return "text"
+    return None
+
+
+def new_upload_path(filename: str) -> Path:
+    """고유한 업로드 저장 경로 (원본 확장자 유지)"""
+    return UPLOAD_DIR / f"{uuid.uuid4()}{Path(filename.lower()).suffix}"
+
+
+async def process_single_file(file: UploadFile, file_index: int, total_files: int,
+                              model_name: Optional[str] = None, language: Optional[str] = None):
+    """업로드된 파일을 저장한 뒤 처리하고 진행 상황을 생성합니다."""
     file_prefix = f"[{file_index}/{total_files}] {file.filename}"
+    # 여러 파일의 이벤트가 한 스트림에 섞이므로 파일 번호를 함께 전송
+    send_file_progress = functools.partial(send_progress, file_index=file_index)
     
     # 파일 확장자 검증 및 타입 확인
-    filename_lower = file.filename.lower()
-    
-    # 지원하는 확장자
-    video_extensions = ('.mp4', '.mov', '.avi', '.mkv', '.webm')
-    audio_extensions = ('.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.wma', '.opus', '.webm')
-    text_extensions = ('.txt',)
-    
-    is_video = filename_lower.endswith(video_extensions)
-    is_audio = filename_lower.endswith(audio_extensions)
-    is_text = filename_lower.endswith(text_extensions)
-    
-    if not (is_video or is_audio or is_text):
-        yield await send_progress(
+    if detect_file_kind(file.filename) is None:
+        yield await send_file_progress(
             f"{file_prefix}: 지원하지 않는 파일 형식입니다. (지원: 영상/음성/텍스트)", 
             0, 
             "error"
         )
         return
     
-    # 고유한 파일명 생성
-    unique_id = str(uuid.uuid4())
-    video_path = UPLOAD_DIR / f"{unique_id}.mp4"
-    audio_path = UPLOAD_DIR / f"{unique_id}.wav"
+    video_path = new_upload_path(file.filename)
+    
+    try:
+        # 1~2. 파일 업로드 및 저장 (청크 단위로 디스크에 기록하면서 해시 계산)
+        yield await send_file_progress(f"{file_prefix}: 업로드 중...", 5, "processing")
+        hasher = hashlib.sha256()
+        last_percent = 0
+        try:
+            async for received, total in save_upload_stream(file, video_path, hasher):
+                if not total:
+                    continue
+                percent = received * 100 // total
+                if percent >= last_percent + 5 or received == total:
+                    last_percent = percent
+                    yield await send_file_progress(
+                        f"{file_prefix}: 업로드 중... ({format_size(received)}/{format_size(total)})",
+                        5 + percent // 10,
+                        "processing",
+                        bytes_received=received,
+                        bytes_total=total
+                    )
+        except UploadTooLargeError as e:
+            yield await send_file_progress(f"{file_prefix}: {e}", 0, "error")
+            return
+        
+        async for progress_msg in process_saved_file(
+            video_path, file.filename, hasher.hexdigest(), file_index, total_files, model_name, language
+        ):
+            yield progress_msg
+    
+    finally:
+        # 업로드 파일 정리
+        try:
+            if video_path.exists():
+                video_path.unlink()
+        except Exception as e:
+            print(f"임시 파일 삭제 오류: {e}")
+
+
+async def process_saved_file(video_path: Path, filename: str, content_hash: str,
+                             file_index: int = 1, total_files: int = 1,
+                             model_name: Optional[str] = None, language: Optional[str] = None):
+    """디스크에 저장된 업로드 파일을 텍스트로 변환해 DB에 저장하고 진행 상황을 생성합니다.
+    
+    업로드 파일 자체는 호출한 쪽에서 정리합니다. (작업 대기열은 재시작 후 이어서 처리하기 위해 보관)
+    """
+    file_prefix = f"[{file_index}/{total_files}] {filename}"
+    send_file_progress = functools.partial(send_progress, file_index=file_index)
+    
+    kind = detect_file_kind(filename)
+    is_video = kind == "video"
+    is_audio = kind == "audio"
+    is_text = kind == "text"
+    
+    # 긴 입력의 PCM 데이터를 기록할 경로 (짧은 입력은 메모리에서 처리)
+    audio_path = video_path.with_suffix(".pcm")
+    pcm = None
+    # Whisper 세그먼트 (텍스트 파일은 없음)
+    segments = None
+    # 지정하지 않으면 기본 모델/언어 (WHISPER_MODEL, WHISPER_LANGUAGE)
+    model_name = model_name or transcriber.pool.model_name
+    language = language or transcriber.WHISPER_LANGUAGE
+    # 완료 이벤트까지 가지 못하면 오류로 집계
+    outcome = "error"
+    started = time.perf_counter()
+    metrics.files_in_progress.inc()
     
     try:
-        # 1. 파일 업로드 중
-        yield await send_progress(f"{file_prefix}: 업로드 중...", 5, "processing")
-        content = await file.read()
-        
-        # 2. 파일 저장 중
-        yield await send_progress(f"{file_prefix}: 파일 저장 중...", 15, "processing")
-        with open(video_path, "wb") as buffer:
-            buffer.write(content)
+        # 1~2. 업로드 완료
+        yield await send_file_progress(f"{file_prefix}: 파일 저장 완료", 15, "processing")
         print(f"비디오 파일 저장 완료: {video_path}")
         
         # 3. 파일 검증 중
-        yield await send_progress(f"{file_prefix}: 파일 검증 중...", 25, "processing")
-        await asyncio.sleep(0.3)  # 사용자가 진행 상황을 볼 수 있도록
+        yield await send_file_progress(f"{file_prefix}: 파일 검증 중...", 25, "processing")
+        
+        # 같은 파일을 같은 모델/언어로 변환한 적이 있으면 추출과 음성 인식을 건너뜀
+        cached = None
+        if not is_text:
+            cache_key = transcript_cache_key(content_hash, transcriber.model_cache_name(model_name), language)
+            cached = await asyncio.to_thread(transcript_cache.get, cache_key)
+            metrics.cache_requests.inc(result="miss" if cached is None else "hit")
         
         # TXT 파일인 경우 텍스트 직접 읽기
         if is_text:
-            yield await send_progress(f"{file_prefix}: 텍스트 파일 읽는 중...", 30, "processing")
-            try:
-                text = content.decode('utf-8')
-            except UnicodeDecodeError:
-                # UTF-8 실패 시 다른 인코딩 시도
-                try:
-                    text = content.decode('cp949')
-                except:
-                    text = content.decode('latin-1')
+            yield await send_file_progress(f"{file_prefix}: 텍스트 파일 읽는 중...", 30, "processing")
+            # UTF-8 실패 시 cp949, latin-1 순으로 시도
+            text = ingest.decode_text(video_path.read_bytes())
             
-            yield await send_progress(f"{file_prefix}: 텍스트 읽기 완료", 90, "processing")
+            yield await send_file_progress(f"{file_prefix}: 텍스트 읽기 완료", 90, "processing")
             print(f"텍스트 파일 읽기 완료! 텍스트 길이: {len(text)}")
+        
+        # 캐시된 변환 결과 사용
+        elif cached is not None:
+            text = cached["text"]
+            segments = cached.get("segments", [])
+            yield await send_file_progress(
+                f"{file_prefix}: 이전에 변환한 파일입니다. 저장된 결과를 사용합니다",
+                90,
+                "processing",
+                cache_hit=True
+            )
+            print(f"변환 결과 캐시 적중: {content_hash[:12]}")
             
-        # 음성 파일인 경우 오디오 추출 건너뛰기
+        # 음성 파일인 경우 Whisper 입력 형식으로 바로 디코딩
         elif is_audio:
-            # 음성 파일은 그대로 사용
-            yield await send_progress(f"{file_prefix}: 음성 파일 확인 완료", 30, "processing")
+            yield await send_file_progress(f"{file_prefix}: 음성 파일 확인 완료", 30, "processing")
             
-            # WAV 형식이 아니면 변환
-            if not filename_lower.endswith('.wav'):
-                yield await send_progress(f"{file_prefix}: 음성 형식 변환 중...", 40, "processing")
+            if extraction_semaphore.locked():
+                yield await send_file_progress(f"{file_prefix}: 디코딩 대기 중...", 35, "processing")
+            async with extraction_semaphore:
+                yield await send_file_progress(f"{file_prefix}: 음성 디코딩 중...", 40, "processing")
                 try:
-                    audio = AudioSegment.from_file(video_path)
-                    audio.export(audio_path, format="wav")
+                    with metrics.timer("extraction"):
+                        pcm = await asyncio.to_thread(extract_audio, str(video_path), str(audio_path))
                 except Exception as e:
-                    print(f"음성 형식 변환 오류: {e}")
-                    yield await send_progress(f"{file_prefix}: 음성 형식 변환 실패", 0, "error")
+                    print(f"음성 디코딩 오류: {e}")
+                    yield await send_file_progress(f"{file_prefix}: 음성 디코딩 실패 - {str(e)}", 0, "error")
                     return
-            else:
-                # 이미 WAV 파일이면 그대로 사용
-                import shutil
-                shutil.copy(video_path, audio_path)
             
-            yield await send_progress(f"{file_prefix}: 음성 파일 준비 완료", 55, "processing")
+            yield await send_file_progress(f"{file_prefix}: 음성 파일 준비 완료", 55, "processing")
         else:
             # 영상 파일인 경우 오디오 추출
             # 4. 오디오 추출 준비
-            yield await send_progress(f"{file_prefix}: 오디오 추출 준비 중...", 30, "processing")
-            await asyncio.sleep(0.2)
+            yield await send_file_progress(f"{file_prefix}: 오디오 추출 준비 중...", 30, "processing")
             
             # 5. 오디오 추출 중
-            yield await send_progress(f"{file_prefix}: 오디오 추출 중...", 35, "processing")
-            print("오디오 추출 중...")
-            try:
-                success = await asyncio.to_thread(extract_audio_from_video, str(video_path), str(audio_path))
-                if not success:
-                    yield await send_progress(f"{file_prefix}: 오디오 추출 실패", 0, "error")
+            if extraction_semaphore.locked():
+                yield await send_file_progress(f"{file_prefix}: 오디오 추출 대기 중...", 32, "processing")
+            async with extraction_semaphore:
+                yield await send_file_progress(f"{file_prefix}: 오디오 추출 중...", 35, "processing")
+                print("오디오 추출 중...")
+                try:
+                    with metrics.timer("extraction"):
+                        pcm = await asyncio.to_thread(extract_audio, str(video_path), str(audio_path))
+                except Exception as e:
+                    print(f"오디오 추출 오류: {e}")
+                    yield await send_file_progress(f"{file_prefix}: 오디오 추출 실패 - {str(e)}", 0, "error")
                     return
-            except Exception as e:
-                print(f"오디오 추출 오류: {e}")
-                yield await send_progress(f"{file_prefix}: 오디오 추출 실패 - {str(e)}", 0, "error")
-                return
             
             # 6. 오디오 추출 완료
-            yield await send_progress(f"{file_prefix}: 오디오 추출 완료", 55, "processing")
+            yield await send_file_progress(f"{file_prefix}: 오디오 추출 완료", 55, "processing")
             print("오디오 추출 완료!")
         
-        # 텍스트 파일이 아닌 경우만 음성 인식 수행
-        if not is_text:
+        # 텍스트 파일이 아니고 캐시된 결과가 없는 경우만 음성 인식 수행
+        if not is_text and cached is None:
             # 7. 음성 인식 준비
-            yield await send_progress(f"{file_prefix}: 음성 인식 엔진 준비 중...", 60, "processing")
-            await asyncio.sleep(0.2)
+            yield await send_file_progress(f"{file_prefix}: 음성 인식 엔진 준비 중...", 60, "processing")
             
             # 8. 음성 인식 중 (가장 시간이 오래 걸림)
-            # 별도 스레드에서 실행하여 이벤트 루프 블로킹 방지
-            yield await send_progress(f"{file_prefix}: 음성 인식 중... (시간이 다소 걸릴 수 있습니다)", 65, "processing")
-            print("음성 인식 중...")
-            
-            # 비동기로 실행하여 타임아웃 방지
-            try:
-                text = await asyncio.to_thread(transcribe_audio, str(audio_path), "ko")
-            except Exception as e:
-                print(f"음성 인식 오류: {e}")
-                yield await send_progress(f"{file_prefix}: 음성 인식 실패 - {str(e)}", 0, "error")
-                return
-            
-            if text is None:
-                yield await send_progress(f"{file_prefix}: 음성 인식 실패", 0, "error")
-                return
+            if transcription_semaphore.locked():
+                yield await send_file_progress(f"{file_prefix}: 음성 인식 대기 중...", 62, "processing")
+            async with transcription_semaphore:
+                # 워커 프로세스에서 실행하여 이벤트 루프 블로킹 방지
+                yield await send_file_progress(f"{file_prefix}: 음성 인식 중... (시간이 다소 걸릴 수 있습니다)", 65, "processing")
+                print("음성 인식 중...")
+                
+                # 구간별로 인식되는 대로 부분 텍스트와 세그먼트를 전송
+                texts = []
+                segments = []
+                transcribe_started = time.perf_counter()
+                try:
+                    async for result, done_seconds, total_seconds in transcribe_audio(pcm, language, model_name):
+                        texts.append(result["text"])
+                        segments.extend(result["segments"])
+                        yield await send_file_progress(
+                            f"{file_prefix}: 음성 인식 중... ({format_duration(done_seconds)}/{format_duration(total_seconds)})",
+                            65 + int(25 * done_seconds / max(total_seconds, 0.001)),
+                            "processing",
+                            partial_text=result["text"],
+                            segments=result["segments"],
+                            audio_seconds_processed=round(done_seconds, 2),
+                            audio_seconds_total=round(total_seconds, 2)
+                        )
+                except Exception as e:
+                    print(f"음성 인식 오류: {e}")
+                    yield await send_file_progress(f"{file_prefix}: 음성 인식 실패 - {str(e)}", 0, "error")
+                    return
+                text = "".join(texts)
+                
+                transcribe_seconds = time.perf_counter() - transcribe_started
+                audio_seconds = len(pcm) / audio_utils.SAMPLE_RATE
+                metrics.stage_seconds.observe(transcribe_seconds, stage="transcription")
+                metrics.audio_seconds_processed.inc(audio_seconds)
+                if audio_seconds > 0:
+                    metrics.realtime_factor.observe(transcribe_seconds / audio_seconds)
             
             # 9. 음성 인식 완료
-            yield await send_progress(f"{file_prefix}: 음성 인식 완료", 90, "processing")
+            await asyncio.to_thread(transcript_cache.put, cache_key, {"text": text, "segments": segments})
+            yield await send_file_progress(f"{file_prefix}: 음성 인식 완료", 90, "processing")
             print(f"음성 인식 완료! 텍스트 길이: {len(text)}")
         
         # 10. 데이터베이스에 저장
-        yield await send_progress(f"{file_prefix}: 데이터베이스 저장 중...", 93, "processing")
+        yield await send_file_progress(f"{file_prefix}: 데이터베이스 저장 중...", 93, "processing")
         
         # 파일 타입 결정
-        if file.filename.startswith("recording_"):
+        if filename.startswith("recording_"):
             file_type = "recording"
         elif is_text:
             file_type = "text"
@@ -349,64 +533,417 @@ async def process_single_file(file: UploadFile, file_index: int, total_files: in
             file_type = "audio"
         
         # DB에 저장
-        file_record = db.create_file_record(
-            filename=file.filename,
-            file_type=file_type,
-            original_text=text
-        )
+        with metrics.timer("db_write"):
+            file_record = await asyncio.to_thread(
+                db.create_file_record,
+                filename=filename,
+                file_type=file_type,
+                original_text=text,
+                content_hash=content_hash,
+                segments=segments
+            )
         file_id = file_record["id"]
         
-        # 11. 후처리 중
-        yield await send_progress(f"{file_prefix}: 결과 정리 중...", 96, "processing")
-        await asyncio.sleep(0.2)
-        
-        # 12. 완료
+        # 11. 완료
         result = {
             "message": f"{file_prefix}: 완료!",
             "progress": 100,
             "status": "completed",
-            "filename": file.filename,
+            "file_index": file_index,
+            "filename": filename,
             "text": text,
             "file_id": file_id  # 파일 ID 추가
         }
+        outcome = "completed"
         yield f"data: {json.dumps(result)}\n\n"
         
     except Exception as e:
         print(f"오류 발생: {e}")
         error_msg = f"{file_prefix}: 처리 중 오류 발생 - {str(e)}"
-        yield await send_progress(error_msg, 0, "error")
+        yield await send_file_progress(error_msg, 0, "error")
     
     finally:
+        metrics.files_in_progress.dec()
+        metrics.files_processed.inc(kind=kind or "unknown", status=outcome)
+        metrics.stage_seconds.observe(time.perf_counter() - started, stage="total")
+        # memmap 배열을 먼저 해제해야 Windows에서도 PCM 파일을 지울 수 있음
+        pcm = None
         # 임시 파일 정리
         try:
-            if video_path.exists():
-                video_path.unlink()
             if audio_path.exists():
                 audio_path.unlink()
         except Exception as e:
             print(f"임시 파일 삭제 오류: {e}")
 
 
+def file_result(file_index: int, filename: str, last_event: Optional[str]) -> dict:
+    """파일별 마지막 진행 이벤트에서 최종 결과 요약을 만듭니다."""
+    data = json.loads(last_event[len("data: "):]) if last_event else {}
+    return {
+        "file_index": file_index,
+        "filename": filename,
+        "status": data.get("status", "error"),
+        "file_id": data.get("file_id")
+    }
+
+
 @app.post("/upload")
-async def upload_videos(files: List[UploadFile] = File(...)):
-    """여러 MP4 파일을 업로드하고 텍스트로 변환합니다 (SSE 스트리밍)."""
+async def upload_videos(files: List[UploadFile] = File(...), model: Optional[str] = Form(None),
+                        language: Optional[str] = Form(None), throughput: bool = Form(False),
+                        min_interval_ms: int = Form(PROGRESS_MIN_INTERVAL_MS)):
+    """
+    여러 MP4 파일을 업로드하고 텍스트로 변환합니다 (SSE 스트리밍). model/language로 Whisper 모델과 언어 선택
+    
+    throughput이면 단계 안내 이벤트를 생략하고 부분 결과와 파일별 최종 결과만 보냅니다. (API 클라이언트용)
+    min_interval_ms는 이벤트 사이 최소 표시 간격이며 처리 속도에는 영향을 주지 않습니다.
+    """
+    model_name, language = resolve_transcription_options(model, language)
     
     async def event_generator():
+        total_files = len(files)
+        # 파일별 작업의 진행 이벤트를 하나의 스트림으로 모으는 큐 (None = 파일 처리 종료)
+        queue: asyncio.Queue = asyncio.Queue()
+        last_events = {}
+        
+        async def run_file(idx: int, file: UploadFile):
+            try:
+                async for progress_msg in process_single_file(file, idx, total_files, model_name, language):
+                    last_events[idx] = progress_msg
+                    await queue.put(progress_msg)
+            except Exception as e:
+                print(f"파일 처리 오류 ({file.filename}): {e}")
+                error_msg = await send_progress(
+                    f"[{idx}/{total_files}] {file.filename}: 처리 중 오류 발생 - {str(e)}", 0, "error",
+                    file_index=idx
+                )
+                last_events[idx] = error_msg
+                await queue.put(error_msg)
+            finally:
+                await queue.put(None)
+        
+        tasks = []
         try:
-            total_files = len(files)
             yield await send_progress(f"총 {total_files}개 파일 처리 시작", 0, "started")
             
-            # 각 파일을 순차적으로 처리
-            for idx, file in enumerate(files, 1):
-                async for progress_msg in process_single_file(file, idx, total_files):
-                    yield progress_msg
+            # 모든 파일을 동시에 처리 (추출/음성 인식 단계는 세마포어로 동시 실행 수 제한)
+            tasks = [asyncio.create_task(run_file(idx, file)) for idx, file in enumerate(files, 1)]
+            remaining = len(tasks)
+            pacer = ProgressPacer(min_interval_ms)
+            while remaining:
+                progress_msg = await queue.get()
+                if progress_msg is None:
+                    remaining -= 1
+                    continue
+                if throughput and is_cosmetic_event(json.loads(progress_msg[len("data: "):])):
+                    continue
+                await pacer.wait()
+                yield progress_msg
             
-            # 모든 파일 처리 완료
-            yield await send_progress("모든 파일 처리 완료!", 100, "all_completed")
+            # 모든 파일 처리 완료 (결과는 업로드 순서대로)
+            results = [
+                file_result(idx, file.filename, last_events.get(idx))
+                for idx, file in enumerate(files, 1)
+            ]
+            yield await send_progress("모든 파일 처리 완료!", 100, "all_completed", results=results)
             
         except Exception as e:
             print(f"전체 처리 오류: {e}")
             yield await send_progress(f"오류 발생: {str(e)}", 0, "error")
+        finally:
+            # 클라이언트 연결이 끊기면 남은 작업 취소
+            for task in tasks:
+                task.cancel()
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+# ============ 작업 대기열 ============
+
+job_worker_tasks: List[asyncio.Task] = []
+warmup_tasks: List[asyncio.Task] = []
+job_wakeup: Optional[asyncio.Event] = None
+# 작업별 SSE 구독자에게 새 이벤트를 알리는 이벤트 객체
+job_listeners: Dict[str, Set[asyncio.Event]] = {}
+
+
+# 대시보드 변경 피드(/api/events) 구독자와 저장소에 등록한 알림 콜백
+change_listeners: Set[asyncio.Event] = set()
+change_callback = None
+# 변경 피드에서 한 번에 읽을 최대 변경 수
+CHANGE_BATCH_SIZE = 500
+
+
+def notify_job_listeners(job_id: str):
+    for listener in job_listeners.get(job_id, ()):
+        listener.set()
+
+
+def notify_change_listeners():
+    for listener in change_listeners:
+        listener.set()
+
+
+def remove_orphan_uploads():
+    """끝나지 않은 작업이 참조하지 않는 업로드 파일 정리 (이전 실행이 비정상 종료된 경우)"""
+    keep = {Path(job["upload_path"]).resolve() for job in db.list_active_jobs()}
+    for path in UPLOAD_DIR.iterdir():
+        if path.is_file() and path.resolve() not in keep:
+            try:
+                path.unlink()
+            except OSError as e:
+                print(f"임시 파일 삭제 오류: {e}")
+
+
+async def run_job(job: dict):
+    """작업 하나를 처리하고 진행 이벤트를 DB에 기록합니다."""
+    job_id = job["id"]
+    upload_path = Path(job["upload_path"])
+    finished = False
+    
+    async def record(event: dict):
+        nonlocal finished
+        # 처리량 모드 작업은 단계 안내 이벤트를 DB에 기록하지 않음
+        if job.get("throughput") and is_cosmetic_event(event):
+            return
+        await asyncio.to_thread(db.add_job_event, job_id, event)
+        notify_job_listeners(job_id)
+        finished = event.get("status") in db.JOB_FINISHED
+    
+    try:
+        if not upload_path.exists():
+            await record({"message": f"{job['filename']}: 업로드 파일을 찾을 수 없습니다.", "progress": 0, "status": "error"})
+            return
+        async for progress_msg in process_saved_file(
+            upload_path, job["filename"], job["content_hash"],
+            model_name=job.get("model"), language=job.get("language")
+        ):
+            await record(json.loads(progress_msg[len("data: "):]))
+        if not finished:
+            await record({"message": f"{job['filename']}: 처리가 중단되었습니다.", "progress": 0, "status": "error"})
+    except asyncio.CancelledError:
+        # 서버 종료: 업로드 파일을 남겨 두고 다음 시작 때 다시 처리
+        raise
+    except Exception as e:
+        print(f"작업 처리 오류 ({job_id}): {e}")
+        await record({"message": f"{job['filename']}: 처리 중 오류 발생 - {str(e)}", "progress": 0, "status": "error"})
+    finally:
+        if finished:
+            try:
+                if upload_path.exists():
+                    upload_path.unlink()
+            except Exception as e:
+                print(f"임시 파일 삭제 오류: {e}")
+
+
+async def job_worker(worker_id: int):
+    """대기열에서 작업을 하나씩 꺼내 처리합니다."""
+    while True:
+        try:
+            job = await asyncio.to_thread(db.claim_next_job)
+        except Exception as e:
+            print(f"[작업 워커 {worker_id}] 대기열 조회 오류: {e}")
+            job = None
+        if job is None:
+            try:
+                await asyncio.wait_for(job_wakeup.wait(), JOB_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            job_wakeup.clear()
+            continue
+        print(f"[작업 워커 {worker_id}] 작업 시작: {job['filename']} ({job['id']})")
+        # 등록부터 워커가 꺼낼 때까지 대기열에서 기다린 시간
+        waited = (datetime.now() - datetime.fromisoformat(job["created_at"])).total_seconds()
+        metrics.stage_seconds.observe(max(waited, 0.0), stage="queue_wait")
+        await run_job(job)
+
+
+def job_status(job: dict) -> dict:
+    """API 응답용 작업 정보 (서버 내부 경로 제외)"""
+    return {k: v for k, v in job.items() if k != "upload_path"}
+
+
+@app.post("/api/jobs")
+async def create_jobs(files: List[UploadFile] = File(...), model: Optional[str] = Form(None),
+                      language: Optional[str] = Form(None), throughput: bool = Form(False)):
+    """
+    파일을 저장하고 변환 작업을 대기열에 등록합니다. 진행 상황은 /api/jobs/{job_id}/events로 확인
+    
+    throughput이면 단계 안내 이벤트 없이 부분 결과와 최종 결과만 기록합니다.
+    """
+    model_name, language = resolve_transcription_options(model, language)
+    jobs = []
+    for file in files:
+        if detect_file_kind(file.filename) is None:
+            jobs.append({
+                "job_id": None,
+                "filename": file.filename,
+                "status": "error",
+                "message": "지원하지 않는 파일 형식입니다. (지원: 영상/음성/텍스트)"
+            })
+            continue
+        
+        upload_path = new_upload_path(file.filename)
+        hasher = hashlib.sha256()
+        try:
+            async for _ in save_upload_stream(file, upload_path, hasher):
+                pass
+        except UploadTooLargeError as e:
+            if upload_path.exists():
+                upload_path.unlink()
+            jobs.append({"job_id": None, "filename": file.filename, "status": "error", "message": str(e)})
+            continue
+        
+        job = await asyncio.to_thread(
+            db.create_job, file.filename, str(upload_path), hasher.hexdigest(), model_name, language, throughput
+        )
+        jobs.append({
+            "job_id": job["id"],
+            "filename": file.filename,
+            "status": job["status"],
+            "message": job["message"]
+        })
+    
+    if job_wakeup is not None:
+        job_wakeup.set()
+    return {"success": True, "jobs": jobs}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """작업 상태 조회"""
+    job = await asyncio.to_thread(db.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return {"success": True, "job": job_status(job)}
+
+
+@app.get("/api/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request, after: int = 0,
+                            min_interval_ms: int = PROGRESS_MIN_INTERVAL_MS):
+    """
+    작업 진행 상황 (SSE 스트리밍)
+    after(또는 재연결 시 Last-Event-ID) 이후의 이벤트를 먼저 재생한 뒤 새 이벤트를 이어서 보냅니다.
+    min_interval_ms는 이벤트 사이 최소 표시 간격입니다. (작업 처리에는 영향 없음)
+    """
+    job = await asyncio.to_thread(db.get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    
+    last_event_id = request.headers.get("last-event-id")
+    if last_event_id and last_event_id.isdigit():
+        after = max(after, int(last_event_id))
+    
+    async def event_generator():
+        seq = after
+        pacer = ProgressPacer(min_interval_ms)
+        listener = asyncio.Event()
+        job_listeners.setdefault(job_id, set()).add(listener)
+        try:
+            # 연결이 끊기면 3초 후 Last-Event-ID와 함께 재연결
+            yield "retry: 3000\n\n"
+            while True:
+                listener.clear()
+                events = await asyncio.to_thread(db.get_job_events, job_id, seq)
+                for event in events:
+                    seq = event["seq"]
+                    await pacer.wait()
+                    yield f"id: {seq}\ndata: {json.dumps(event['data'])}\n\n"
+                    if event["data"].get("status") in db.JOB_FINISHED:
+                        return
+                if not events:
+                    current = await asyncio.to_thread(db.get_job, job_id)
+                    if current is None or (current["status"] in db.JOB_FINISHED and seq >= current["last_event_id"]):
+                        return
+                try:
+                    await asyncio.wait_for(listener.wait(), 15)
+                except asyncio.TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 줄 전송
+                    yield ": keep-alive\n\n"
+        finally:
+            listeners = job_listeners.get(job_id)
+            if listeners is not None:
+                listeners.discard(listener)
+                if not listeners:
+                    del job_listeners[job_id]
+    
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/api/events")
+async def stream_changes(request: Request, after: Optional[str] = None):
+    """
+    대시보드 변경 피드 (SSE)
+    파일 추가(file_created), 요약 저장/삭제(summary_updated, summary_deleted), 파일 삭제(file_deleted)를
+    저장된 순서대로 보냅니다. 이벤트 id("epoch:번호")를 after(또는 재연결 시 Last-Event-ID)로 넘기면
+    그 이후 변경만 이어서 받고, 커서 없이 연결하면 지금 이후의 변경만 받습니다.
+    놓친 변경이 보관 개수(CHANGE_LOG_RETENTION)보다 오래되었거나 다른 DB의 커서면
+    reset 이벤트를 보내므로 목록을 다시 불러오면 됩니다.
+    """
+    cursor = request.headers.get("last-event-id") or after
+    bounds = await asyncio.to_thread(db.get_change_cursor)
+    epoch = bounds["epoch"]
+    
+    seq = bounds["last"]
+    reset = False
+    if cursor:
+        cursor_epoch, _, cursor_seq = cursor.partition(":")
+        if cursor_epoch == epoch and cursor_seq.isdigit() and int(cursor_seq) <= bounds["last"] \
+                and (bounds["first"] is None or int(cursor_seq) >= bounds["first"] - 1):
+            seq = int(cursor_seq)
+        else:
+            reset = True
+    
+    def reset_event(position: int) -> str:
+        return f"id: {epoch}:{position}\ndata: {json.dumps({'type': 'reset'})}\n\n"
+    
+    async def event_generator():
+        nonlocal seq
+        listener = asyncio.Event()
+        change_listeners.add(listener)
+        try:
+            # 연결이 끊기면 3초 후 Last-Event-ID와 함께 재연결
+            yield "retry: 3000\n\n"
+            if reset:
+                yield reset_event(seq)
+            else:
+                # 아직 변경이 없어도 재연결 커서를 갖도록 현재 위치 전달
+                yield f"id: {epoch}:{seq}\ndata: {json.dumps({'type': 'ready'})}\n\n"
+            while True:
+                listener.clear()
+                changes = await asyncio.to_thread(db.get_changes, seq, CHANGE_BATCH_SIZE)
+                if changes and changes[0]["id"] > seq + 1:
+                    # 읽는 사이 보관 개수를 넘겨 정리된 변경이 있음
+                    seq = changes[-1]["id"]
+                    yield reset_event(seq)
+                    continue
+                for change in changes:
+                    seq = change["id"]
+                    yield f"id: {epoch}:{seq}\ndata: {json.dumps(change, ensure_ascii=False)}\n\n"
+                if len(changes) == CHANGE_BATCH_SIZE:
+                    continue
+                try:
+                    # 다른 프로세스(ingest.py 등)의 변경은 알림이 없으므로 시간 초과 때마다 다시 조회
+                    await asyncio.wait_for(listener.wait(), 15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            change_listeners.discard(listener)
     
     return StreamingResponse(
         event_generator(),
@@ -421,34 +958,102 @@ async def upload_videos(files: List[UploadFile] = File(...)):
 
 # ============ 대시보드 API ============
 
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match에 etag가 있는지 (약한 비교)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in header.split(","))
+
+
+def http_date(timestamp: Optional[str]) -> Optional[str]:
+    """저장된 ISO 시각(로컬 시간)을 HTTP 날짜 형식으로 변환"""
+    if not timestamp:
+        return None
+    return format_datetime(datetime.fromisoformat(timestamp).astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str, updated_at: Optional[str]) -> bool:
+    """조건부 요청 확인 (If-None-Match가 있으면 그것만, 없으면 If-Modified-Since로 비교)"""
+    if request.headers.get("if-none-match") is not None:
+        return etag_matches(request, etag)
+    since = request.headers.get("if-modified-since")
+    if not since or not updated_at:
+        return False
+    try:
+        since_time = parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+    # HTTP 날짜는 초 단위
+    return int(datetime.fromisoformat(updated_at).timestamp()) <= since_time.timestamp()
+
+
+async def revision_response(request: Request, revision: Dict, build) -> Response:
+    """
+    저장소 리비전 기반 조건부 JSON 응답
+    ETag/Last-Modified를 붙이고, 클라이언트가 같은 리비전을 갖고 있으면 304를 반환합니다.
+    같은 리비전에서 같은 요청은 build()를 다시 실행하지 않고 메모리 캐시의 본문으로 응답합니다.
+    """
+    etag = f'"{revision["epoch"]}-{revision["revision"]}"'
+    # no-cache: 브라우저가 캐시를 쓰기 전에 항상 ETag로 재검증
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    last_modified = http_date(revision.get("updated_at"))
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    if is_not_modified(request, etag, revision.get("updated_at")):
+        return Response(status_code=304, headers=headers)
+    
+    key = request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+    body = response_cache.get(key, etag)
+    if body is None:
+        content = await build()
+        body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        response_cache.put(key, etag, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/files")
-async def get_all_files():
-    """모든 파일 목록 조회"""
+async def get_all_files(request: Request, limit: int = 50, cursor: Optional[str] = None,
+                        type: Optional[str] = None):
+    """파일 목록 조회 (최신순, 커서 기반 페이지네이션, 변경이 없으면 304)"""
     try:
-        files = db.get_all_files()
-        # 텍스트 길이 제한 (목록에서는 전체 텍스트 불필요)
-        for file in files:
-            if len(file.get("original_text", "")) > 200:
-                file["text_preview"] = file["original_text"][:200] + "..."
-            else:
-                file["text_preview"] = file.get("original_text", "")
-            # 목록에서는 전체 텍스트 제거 (성능)
-            file.pop("original_text", None)
+        limit = max(1, min(limit, 200))
         
-        return {"success": True, "files": files}
+        async def build():
+            # 목록에는 메타데이터와 저장된 미리보기만 포함 (본문은 읽지 않음)
+            files, next_cursor = await asyncio.to_thread(db.list_files, limit, cursor, type)
+            return {"success": True, "files": files, "next_cursor": next_cursor}
+        
+        revision = await asyncio.to_thread(db.get_corpus_revision)
+        return await revision_response(request, revision, build)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         print(f"파일 목록 조회 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/api/files/{file_id}")
-async def get_file_detail(file_id: str):
-    """파일 상세 정보 조회"""
+async def get_file_detail(file_id: str, request: Request, full: bool = False):
+    """
+    파일 상세 정보 조회 (메타데이터와 크기만, 변경이 없으면 304)
+    원본 텍스트는 /api/files/{file_id}/transcript, 요약은 /api/files/{file_id}/summaries/{summary_type}로 따로 받습니다.
+    full=true면 원본 텍스트와 모든 요약을 포함한 전체 레코드를 반환합니다. (이전 형식)
+    """
     try:
-        file = db.get_file_by_id(file_id)
-        if not file:
+        revision = await asyncio.to_thread(db.get_file_revision, file_id)
+        if not revision:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
-        return {"success": True, "file": file}
+        
+        async def build():
+            file = await asyncio.to_thread(db.get_file_by_id if full else db.get_file_meta, file_id)
+            if not file:
+                raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+            return {"success": True, "file": file}
+        
+        return await revision_response(request, revision, build)
     except HTTPException:
         raise
     except Exception as e:
@@ -456,11 +1061,251 @@ async def get_file_detail(file_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 원본 텍스트를 스트리밍할 때 한 번에 읽는 크기
+TRANSCRIPT_CHUNK_BYTES = 64 * 1024
+# 이보다 작은 응답은 압축하지 않음
+COMPRESS_MIN_BYTES = 1024
+
+
+def choose_encoding(request: Request) -> Optional[str]:
+    """Accept-Encoding에서 사용할 압축 방식 (br은 brotli 패키지가 있을 때만)"""
+    accepted = {}
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if name.strip():
+            accepted[name.strip().lower()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def make_compressor(encoding: str) -> tuple:
+    """(청크 압축 함수, 마지막 플러시 함수)"""
+    if encoding == "br":
+        compressor = brotli.Compressor()
+        return compressor.process, compressor.finish
+    # wbits=31: gzip 헤더/트레일러 포함
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def representation_etag(tag: str, encoding: Optional[str]) -> str:
+    """강한 ETag (압축한 본문은 다른 표현이므로 content-coding을 붙임)"""
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def parse_byte_range(header: str, size: int) -> Optional[tuple]:
+    """
+    Range: bytes=a-b 헤더를 [start, end)로 변환
+    형식이 잘못된 요청(b < a 포함)과 여러 구간 요청은 무시하고 None (전체 응답),
+    형식은 맞지만 시작 위치가 텍스트 크기 이상이면 ValueError (416)
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            end = min(int(last) + 1, size) if last else size
+        else:
+            # bytes=-n: 마지막 n바이트 (n이 0이면 만족할 수 없는 범위)
+            suffix = int(last)
+            if suffix < 0:
+                return None
+            start = max(size - suffix, 0) if suffix > 0 else size
+            end = size
+    except ValueError:
+        return None
+    if start >= size:
+        raise ValueError("요청한 범위가 텍스트 크기를 벗어났습니다.")
+    return start, end
+
+
+@app.get("/api/files/{file_id}/transcript")
+async def get_transcript(file_id: str, request: Request, segment_offset: Optional[int] = None,
+                         segment_limit: Optional[int] = None):
+    """
+    원본 텍스트 (text/plain, 청크 단위 스트리밍)
+    Range: bytes=... 헤더로 UTF-8 바이트 구간을, segment_offset/segment_limit로 세그먼트 구간만 받을 수 있습니다.
+    gzip(brotli 설치 시 br) 압축과 ETag(If-None-Match 일치 시 304)를 지원합니다.
+    """
+    meta = await asyncio.to_thread(db.get_file_meta, file_id)
+    if not meta:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    size = meta["text_bytes"]
+    segment_mode = segment_offset is not None or segment_limit is not None
+    segment_offset = max(segment_offset or 0, 0)
+    segment_limit = max(1, min(segment_limit or 500, 5000))
+    
+    # 원본 텍스트는 저장 후 바뀌지 않으므로 파일 ID와 크기로 식별
+    encoding = choose_encoding(request)
+    tag = f"{file_id}-{size}"
+    if segment_mode:
+        # 세그먼트 본문 크기는 읽어 봐야 알 수 있으므로 협상한 압축 방식으로 구분
+        etag = representation_etag(f"{tag}-s{segment_offset}-{segment_limit}", encoding)
+    else:
+        etag = representation_etag(tag, encoding if size >= COMPRESS_MIN_BYTES else None)
+    headers = {"ETag": etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    
+    if segment_mode:
+        page = await asyncio.to_thread(db.get_segments, file_id, None, None, segment_offset, segment_limit)
+        if page is None:
+            raise HTTPException(status_code=404, detail="세그먼트 정보가 없는 파일입니다.")
+        body = "".join(seg["text"] for seg in page["segments"]).encode("utf-8")
+        headers["X-Segment-Total"] = str(page["total"])
+        if encoding and len(body) >= COMPRESS_MIN_BYTES:
+            compress, flush = make_compressor(encoding)
+            body = compress(body) + flush()
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="text/plain; charset=utf-8", headers=headers)
+    
+    headers["Accept-Ranges"] = "bytes"
+    start, end, status_code = 0, size, 200
+    # 부분 응답은 압축하지 않은 원본 바이트 기준이므로 If-Range도 압축하지 않은 표현의 ETag와 비교
+    identity_etag = representation_etag(tag, None)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == identity_etag):
+        try:
+            byte_range = parse_byte_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={
+                **headers, "ETag": identity_etag, "Content-Range": f"bytes */{size}"
+            })
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = 206
+            headers["ETag"] = identity_etag
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    
+    # 부분 응답은 원본 바이트 기준이므로 압축하지 않음
+    if status_code != 200 or size < COMPRESS_MIN_BYTES:
+        encoding = None
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    else:
+        headers["Content-Length"] = str(end - start)
+    
+    async def text_generator():
+        compress, flush = make_compressor(encoding) if encoding else (None, None)
+        position = start
+        while position < end:
+            chunk = await asyncio.to_thread(
+                db.read_text, file_id, position, min(position + TRANSCRIPT_CHUNK_BYTES, end)
+            )
+            if not chunk:
+                break
+            position += len(chunk)
+            yield compress(chunk) if compress else chunk
+        if flush:
+            yield flush()
+    
+    return StreamingResponse(
+        text_generator(), status_code=status_code, media_type="text/plain; charset=utf-8", headers=headers
+    )
+
+
+@app.get("/api/files/{file_id}/summaries/{summary_type}")
+async def get_file_summary(file_id: str, summary_type: str):
+    """요약 하나 조회"""
+    summary = await asyncio.to_thread(db.get_summary, file_id, summary_type)
+    if summary is None:
+        if await asyncio.to_thread(db.get_file_meta, file_id) is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+        raise HTTPException(status_code=404, detail="해당 유형의 요약이 없습니다.")
+    return {
+        "success": True,
+        "summary_type": summary_type,
+        "summary": summary["summary_text"],
+        "updated_at": summary["updated_at"]
+    }
+
+
+@app.get("/api/files/{file_id}/segments")
+async def get_file_segments(file_id: str, start: Optional[float] = None, end: Optional[float] = None,
+                            offset: int = 0, limit: int = 500):
+    """[start, end) 초 범위와 겹치는 Whisper 세그먼트 조회 (범위를 생략하면 처음/끝까지)"""
+    limit = max(1, min(limit, 5000))
+    result = await asyncio.to_thread(db.get_segments, file_id, start, end, max(offset, 0), limit)
+    if result is None:
+        if await asyncio.to_thread(db.get_file_meta, file_id) is None:
+            raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+        raise HTTPException(status_code=404, detail="세그먼트 정보가 없는 파일입니다.")
+    return {"success": True, "offset": max(offset, 0), "limit": limit, **result}
+
+
+def format_timestamp(seconds: float, separator: str) -> str:
+    """자막 시각 형식 (SRT: 00:01:02,345 / VTT: 00:01:02.345)"""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+SUBTITLE_PAGE_SIZE = 500
+
+
+@app.get("/api/files/{file_id}/subtitles")
+async def export_subtitles(file_id: str, format: str = "srt"):
+    """세그먼트로 SRT/VTT 자막 생성 (세그먼트 저장소에서 페이지 단위로 읽으며 스트리밍)"""
+    format = format.lower()
+    if format not in ("srt", "vtt"):
+        raise HTTPException(status_code=400, detail="지원하지 않는 자막 형식입니다. (지원: srt, vtt)")
+    file = await asyncio.to_thread(db.get_file_meta, file_id)
+    if not file:
+        raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
+    if not file.get("segment_count"):
+        raise HTTPException(status_code=404, detail="세그먼트 정보가 없는 파일입니다.")
+    separator = "," if format == "srt" else "."
+    
+    async def subtitle_generator():
+        if format == "vtt":
+            yield "WEBVTT\n\n"
+        offset = 0
+        while True:
+            page = await asyncio.to_thread(db.get_segments, file_id, None, None, offset, SUBTITLE_PAGE_SIZE)
+            if not page or not page["segments"]:
+                break
+            lines = []
+            for seg in page["segments"]:
+                if format == "srt":
+                    lines.append(f"{seg['index'] + 1}\n")
+                lines.append(
+                    f"{format_timestamp(seg['start'], separator)} --> {format_timestamp(seg['end'], separator)}\n"
+                    f"{seg['text'].strip()}\n\n"
+                )
+            yield "".join(lines)
+            offset += len(page["segments"])
+    
+    download_name = Path(file["filename"]).stem + f".{format}"
+    media_type = "application/x-subrip" if format == "srt" else "text/vtt"
+    return StreamingResponse(
+        subtitle_generator(),
+        media_type=f"{media_type}; charset=utf-8",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(download_name)}"}
+    )
+
+
 @app.delete("/api/files/{file_id}/summary/{summary_type}")
 async def delete_summary_api(file_id: str, summary_type: str):
     """요약 삭제"""
     try:
-        success = db.delete_summary(file_id, summary_type)
+        success = await asyncio.to_thread(db.delete_summary, file_id, summary_type)
         if not success:
             raise HTTPException(status_code=404, detail="요약을 찾을 수 없습니다.")
         return {"success": True, "message": "요약이 삭제되었습니다."}
@@ -475,7 +1320,7 @@ async def delete_summary_api(file_id: str, summary_type: str):
 async def delete_file_api(file_id: str):
     """파일 삭제"""
     try:
-        success = db.delete_file(file_id)
+        success = await asyncio.to_thread(db.delete_file, file_id)
         if not success:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         return {"success": True, "message": "파일이 삭제되었습니다."}
@@ -487,11 +1332,15 @@ async def delete_file_api(file_id: str):
 
 
 @app.post("/api/files/{file_id}/summarize")
-async def generate_summary(file_id: str, summary_type: str):
-    """파일 요약 생성"""
+async def generate_summary(file_id: str, summary_type: str, wait: bool = True):
+    """
+    파일 요약 생성
+    같은 파일/유형의 요약이 이미 생성 중이면 그 결과를 함께 기다립니다. (Gemini 호출은 한 번)
+    wait=false면 대기열에 넣고 바로 202를 반환하며, 진행 상황은 /api/summaries/status로 확인합니다.
+    """
     try:
         # 파일 조회
-        file = db.get_file_by_id(file_id)
+        file = await asyncio.to_thread(db.get_file_by_id, file_id)
         if not file:
             raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
         
@@ -508,15 +1357,31 @@ async def generate_summary(file_id: str, summary_type: str):
         if not original_text:
             raise HTTPException(status_code=400, detail="원본 텍스트가 없습니다.")
         
-        summary = await summarize_with_gemini(original_text, summary_type)
+        # 긴 텍스트를 구간으로 나눌 때 Whisper 세그먼트 경계를 사용
+        segments = None
+        if file.get("segment_count"):
+            segments = (await asyncio.to_thread(db.get_segments, file_id))["segments"]
+        task, coalesced = summarizer.scheduler.submit(file_id, summary_type, original_text, segments)
+        if not wait:
+            return JSONResponse({
+                "success": True,
+                "status": summarizer.scheduler.find(file_id, summary_type)["status"],
+                "coalesced": coalesced
+            }, status_code=202)
         
-        # DB에 저장
-        db.update_summary(file_id, summary_type, summary)
+        # 결과는 스케줄러가 DB에 저장 (클라이언트 연결이 끊겨도 작업은 계속)
+        try:
+            summary = await asyncio.shield(task)
+        except summarizer.SummaryUnavailableError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except summarizer.SummaryError as e:
+            raise HTTPException(status_code=502, detail=str(e))
         
         return {
             "success": True,
             "summary": summary,
-            "cached": False
+            "cached": False,
+            "coalesced": coalesced
         }
     except HTTPException:
         raise
@@ -525,25 +1390,117 @@ async def generate_summary(file_id: str, summary_type: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/summaries/status")
+async def get_summary_status(file_id: Optional[str] = None, summary_type: Optional[str] = None):
+    """요약 대기열 상태 (요청 수 제한, 진행 중/최근 요청, 합쳐진 요청 및 재시도 횟수). file_id와 summary_type을 주면 해당 요청만"""
+    if file_id and summary_type:
+        state = summarizer.scheduler.find(file_id, summary_type)
+        if state is None:
+            raise HTTPException(status_code=404, detail="진행 중이거나 최근에 끝난 요약 요청이 없습니다.")
+        return {"success": True, "request": state}
+    return {"success": True, "summaries": summarizer.scheduler.status()}
+
+
+@app.post("/api/import")
+async def import_transcripts(file: UploadFile = File(...), batch_size: int = Form(ingest.IMPORT_BATCH_SIZE)):
+    """
+    텍스트 변환 결과 일괄 가져오기
+    zip(안의 .txt 파일) 또는 NDJSON({"filename", "text"} 한 줄에 하나)을 받아 batch_size개씩 한 트랜잭션으로 저장합니다.
+    """
+    upload_path = new_upload_path(file.filename)
+    try:
+        try:
+            async for _ in save_upload_stream(file, upload_path):
+                pass
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        
+        fmt = ingest.detect_format(upload_path)
+        if fmt is None:
+            raise HTTPException(status_code=400, detail="지원하지 않는 형식입니다. (지원: .zip, .ndjson, .jsonl)")
+        
+        with metrics.timer("import"):
+            report = await asyncio.to_thread(ingest.ingest_file, upload_path, batch_size, fmt)
+        report["source"] = file.filename
+        print(f"일괄 가져오기 완료: {file.filename} ({report['imported']}개, {report['rows_per_second']}행/초)")
+        return {"success": True, **report}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"일괄 가져오기 오류: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        try:
+            if upload_path.exists():
+                upload_path.unlink()
+        except Exception as e:
+            print(f"임시 파일 삭제 오류: {e}")
+
+
 @app.get("/api/search")
-async def search_files_api(q: str):
-    """파일 검색"""
+async def search_files_api(request: Request, q: str, limit: int = 20, offset: int = 0):
+    """파일 검색 (관련도순, 강조된 스니펫 포함, 변경이 없으면 304)"""
     try:
-        results = db.search_files(q)
-        # 텍스트 미리보기만 포함
-        for file in results:
-            if len(file.get("original_text", "")) > 200:
-                file["text_preview"] = file["original_text"][:200] + "..."
-            else:
-                file["text_preview"] = file.get("original_text", "")
-            file.pop("original_text", None)
+        limit = max(1, min(limit, 100))
+        offset = max(offset, 0)
         
-        return {"success": True, "results": results}
+        async def build():
+            # 다음 페이지 존재 여부 확인을 위해 하나 더 조회
+            results = await asyncio.to_thread(db.search_files, q, limit + 1, offset)
+            return {
+                "success": True,
+                "results": results[:limit],
+                "offset": offset,
+                "limit": limit,
+                "has_more": len(results) > limit
+            }
+        
+        revision = await asyncio.to_thread(db.get_corpus_revision)
+        return await revision_response(request, revision, build)
     except Exception as e:
         print(f"검색 오류: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/workers")
+async def get_worker_status():
+    """음성 인식 워커 상태 조회"""
+    return {"success": True, "workers": transcriber.pool.status()}
+
+
+@app.get("/api/startup")
+async def get_startup_timing():
+    """서버 시작 소요 시간 (초) 및 Whisper 모델 로드 상태"""
+    return {
+        "success": True,
+        "timings": startup_timings,
+        "model_loaded": transcriber.pool.started,
+        "model_load_seconds": transcriber.pool.load_seconds
+    }
+
+
+@app.get("/api/cache")
+async def get_cache_status():
+    """변환 결과, 구간 요약, API 응답 캐시 적중률 및 사용량 조회"""
+    return {
+        "success": True,
+        "cache": transcript_cache.stats(),
+        "summary_cache": summary_cache.stats(),
+        "response_cache": response_cache.stats()
+    }
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 형식 지표 (단계별 소요 시간, 대기열 길이, 처리량, 캐시 적중 등)"""
+    # 대기열 길이처럼 그때그때 달라지는 값은 수집 시점에 갱신
+    job_counts = await asyncio.to_thread(db.count_jobs_by_status)
+    for status in ("queued", "processing", "completed", "error"):
+        metrics.jobs.set(job_counts.get(status, 0), status=status)
+    metrics.transcription_pending.set(transcriber.pool.pending)
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 # ============ API 키 설정 ============
 
 @app.post("/api/set-api-key")
@@ -559,16 +1516,14 @@ async def set_api_key(request: ApiKeyRequest):
         
         # 빈 문자열인 경우 API 키 삭제
         if not api_key:
-            global gemini_api_key, gemini_model
-            gemini_api_key = None
-            gemini_model = None
+            summarizer.clear()
             return JSONResponse({"success": True, "message": "API 키가 삭제되었습니다."})
         
         # 유효성 검사
         if len(api_key) < 10:
             return JSONResponse({"success": False, "message": "유효하지 않은 API 키입니다."})
         
-        success = set_gemini_api_key(api_key)
+        success = await asyncio.to_thread(summarizer.configure, api_key)
         
         if success:
             return JSONResponse({"success": True, "message": "API 키가 성공적으로 설정되었습니다!"})
@@ -589,8 +1544,8 @@ async def check_api_key():
     """API 키 설정 상태 확인"""
     return {
         "success": True,
-        "has_key": gemini_api_key is not None,
-        "key_preview": f"{gemini_api_key[:10]}..." if gemini_api_key else None
+        "has_key": summarizer.api_key is not None,
+        "key_preview": f"{summarizer.api_key[:10]}..." if summarizer.api_key else None
     }
 
 
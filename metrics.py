@@ -0,0 +1,198 @@
+"""
+Prometheus 형식 지표
+단계별 소요 시간 히스토그램과 카운터/게이지를 메모리에 모아 두었다가 /metrics 요청 때 텍스트로 내보냅니다.
+(별도 의존성 없이 텍스트 노출 형식 0.0.4만 구현)
+"""
+import math
+import time
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 업로드/추출/음성 인식처럼 수 밀리초부터 수 분까지 걸리는 단계용 구간 (초)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+# 실시간 배율 (처리 시간 / 오디오 길이, 1보다 작으면 실시간보다 빠름)
+RTF_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2, 3, 5)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """레이블 값 조합별로 값을 보관하는 지표 기본 클래스"""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}", *self.samples()]
+
+
+class Counter(Metric):
+    """증가만 하는 누적값"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError("카운터는 감소할 수 없습니다.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Metric):
+    """현재 값 (대기열 길이, 처리 중인 작업 수 등)"""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(Metric):
+    """구간별 누적 개수와 합계 (quantile은 Prometheus 쪽에서 histogram_quantile로 계산)"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = STAGE_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][i] += 1
+                    break
+            state["sum"] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, {"counts": list(v["counts"]), "sum": v["sum"]}) for k, v in self._values.items())
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, state["counts"]):
+                cumulative += count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state['sum'])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+REGISTRY: List[Metric] = []
+
+
+def _register(metric: Metric) -> Metric:
+    REGISTRY.append(metric)
+    return metric
+
+
+stage_seconds = _register(Histogram(
+    "movie_to_txt_stage_seconds", "처리 단계별 소요 시간 (초)", ("stage",)
+))
+files_processed = _register(Counter(
+    "movie_to_txt_files_processed_total", "처리를 마친 파일 수", ("kind", "status")
+))
+files_in_progress = _register(Gauge(
+    "movie_to_txt_files_in_progress", "현재 처리 중인 파일 수"
+))
+jobs = _register(Gauge(
+    "movie_to_txt_jobs", "상태별 작업 대기열 작업 수", ("status",)
+))
+transcription_pending = _register(Gauge(
+    "movie_to_txt_transcription_pending", "음성 인식 워커에 제출되었거나 자리를 기다리는 구간 수"
+))
+audio_seconds_processed = _register(Counter(
+    "movie_to_txt_audio_seconds_processed_total", "음성 인식한 오디오 길이 합계 (초)"
+))
+realtime_factor = _register(Histogram(
+    "movie_to_txt_transcription_realtime_factor", "파일별 음성 인식 실시간 배율 (처리 시간 / 오디오 길이)",
+    buckets=RTF_BUCKETS
+))
+cache_requests = _register(Counter(
+    "movie_to_txt_transcript_cache_requests_total", "변환 결과 캐시 조회 수", ("result",)
+))
+summary_chunk_cache_requests = _register(Counter(
+    "movie_to_txt_summary_chunk_cache_requests_total", "긴 텍스트 구간 요약 캐시 조회 수", ("result",)
+))
+gemini_requests = _register(Counter(
+    "movie_to_txt_gemini_requests_total", "Gemini 요약 요청 수", ("status",)
+))
+
+
+@contextmanager
+def timer(stage: str):
+    """with 블록 소요 시간을 stage_seconds에 기록 (예외로 빠져나와도 기록)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, stage=stage)
+
+
+def render() -> str:
+    """등록된 모든 지표를 Prometheus 텍스트 형식으로 변환"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
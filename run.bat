@@ -16,7 +16,7 @@ if errorlevel 1 (
 
 REM Check if packages are installed
 echo Checking packages...
-python -c "import fastapi, uvicorn, whisper, pydub, google.generativeai" >nul 2>&1
+python -c "import fastapi, uvicorn, whisper, numpy, google.generativeai" >nul 2>&1
 if errorlevel 1 (
     echo Installing required packages...
     echo This may take a few minutes on first run...
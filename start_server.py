@@ -5,29 +5,34 @@
 import os
 import sys
 import time
+import importlib.util
 import webbrowser
 import subprocess
 from pathlib import Path
 
+def _find_spec(name):
+    try:
+        return importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        return None
+
 def check_dependencies():
     """필요한 패키지가 설치되어 있는지 확인"""
     print("패키지 확인 중...")
-    try:
-        import fastapi
-        import whisper
-        import pydub
-        import uvicorn
+    # whisper는 torch까지 불러와 오래 걸리므로 import하지 않고 설치 여부만 확인
+    missing = [name for name in ("fastapi", "whisper", "numpy", "uvicorn", "google.generativeai")
+               if _find_spec(name) is None]
+    if not missing:
         print("✓ 모든 패키지가 설치되어 있습니다.")
         return True
-    except ImportError as e:
-        print(f"✗ 필요한 패키지가 없습니다: {e}")
-        print("\n패키지를 설치하시겠습니까? (Y/n): ", end="")
-        response = input().strip().lower()
-        if response in ['', 'y', 'yes']:
-            print("\n패키지 설치 중...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-            return True
-        return False
+    print(f"✗ 필요한 패키지가 없습니다: {', '.join(missing)}")
+    print("\n패키지를 설치하시겠습니까? (Y/n): ", end="")
+    response = input().strip().lower()
+    if response in ['', 'y', 'yes']:
+        print("\n패키지 설치 중...")
+        subprocess.run([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
+        return True
+    return False
 
 def check_ffmpeg():
     """ffmpeg가 설치되어 있는지 확인"""
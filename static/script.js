@@ -40,6 +40,7 @@ const fileModal = document.getElementById('fileModal');
 const modalFilename = document.getElementById('modalFilename');
 const modalBody = document.getElementById('modalBody');
 const modalDownloadBtn = document.getElementById('modalDownloadBtn');
+const modalSubtitleBtn = document.getElementById('modalSubtitleBtn');
 const modalSummarizeBtn = document.getElementById('modalSummarizeBtn');
 const modalDeleteSummaryBtn = document.getElementById('modalDeleteSummaryBtn');
 const modalClose = document.querySelector('.modal-close');
@@ -58,6 +59,9 @@ const dropZone = document.getElementById('dropZone');
 const fileInput = document.getElementById('fileInput');
 const progressSection = document.getElementById('progressSection');
 const filesProgress = document.getElementById('filesProgress');
+const transcribeOptions = document.getElementById('transcribeOptions');
+const modelSelect = document.getElementById('modelSelect');
+const languageSelect = document.getElementById('languageSelect');
 
 // 결과 관련
 const resultsContainer = document.getElementById('resultsContainer');
@@ -72,6 +76,11 @@ let recordedBlob = null;
 let completedResults = [];
 let fileProgressTrackers = {};
 let currentFileId = null;
+// 모달에 열린 파일 정보 (상세 응답에는 메타데이터만 있으므로 본문과 요약은 필요할 때 따로 받음)
+let currentFilename = '';
+let currentOriginalText = null;
+let currentSummaryTypes = new Set();
+let loadedSummaries = {};
 let currentTab = 'original';
 
 // ============ 네비게이션 ============
@@ -294,71 +303,46 @@ dropZone.addEventListener('drop', (e) => {
 async function handleFiles(files) {
     if (files.length === 0) return;
     
-    // 초기화
-    completedResults = [];
-    fileProgressTrackers = {};
-    filesProgress.innerHTML = '';
-    resultsContainer.innerHTML = '';
-    
-    // UI 업데이트
-    dropZone.style.display = 'none';
-    progressSection.classList.remove('hidden');
-    resultSection.classList.add('hidden');
-    
-    // 각 파일에 대한 진행 상황 UI 생성
-    files.forEach((file, index) => {
-        const trackerId = `file-${index}`;
-        fileProgressTrackers[trackerId] = createFileProgressTracker(file.name, trackerId);
-        filesProgress.appendChild(fileProgressTrackers[trackerId].element);
-    });
+    startProgressUI(files.map(file => file.name));
     
     // FormData 생성
     const formData = new FormData();
     files.forEach(file => {
         formData.append('files', file);
     });
+    // 선택하지 않으면 서버 기본 모델/언어 사용
+    if (modelSelect.value) {
+        formData.append('model', modelSelect.value);
+    }
+    if (languageSelect.value) {
+        formData.append('language', languageSelect.value);
+    }
     
     try {
-        // SSE로 업로드 및 진행 상황 수신
-        const response = await fetch('/upload', {
+        // 파일을 서버에 저장하고 변환 작업 등록 (변환은 서버 대기열에서 진행되므로 탭을 닫아도 계속됨)
+        const response = await fetch('/api/jobs', {
             method: 'POST',
             body: formData
         });
         
         if (!response.ok) {
-            throw new Error('업로드 실패');
+            const error = await response.json().catch(() => ({}));
+            throw new Error(error.detail || '업로드 실패');
         }
         
-        // SSE 스트림 읽기
-        const reader = response.body.getReader();
-        const decoder = new TextDecoder();
-        let buffer = '';
+        const data = await response.json();
+        const jobs = data.jobs.map((job, index) => ({ ...job, index }));
         
-        while (true) {
-            const { done, value } = await reader.read();
-            
-            if (done) break;
-            
-            buffer += decoder.decode(value, { stream: true });
-            const lines = buffer.split('\n');
-            buffer = lines.pop();
-            
-            for (const line of lines) {
-                if (line.startsWith('data: ')) {
-                    try {
-                        const data = JSON.parse(line.slice(6));
-                        handleProgressUpdate(data);
-                    } catch (e) {
-                        console.error('JSON 파싱 오류:', e);
-                    }
-                }
-            }
-        }
+        jobs.filter(job => !job.job_id).forEach(job => {
+            handleProgressUpdate({
+                message: `${job.filename}: ${job.message}`,
+                progress: 0,
+                status: 'error',
+                file_index: job.index + 1
+            });
+        });
         
-        // 결과 표시
-        if (completedResults.length > 0) {
-            showResults();
-        }
+        await followJobs(jobs.filter(job => job.job_id));
         
     } catch (error) {
         console.error('오류:', error);
@@ -367,6 +351,91 @@ async function handleFiles(files) {
     }
 }
 
+function startProgressUI(filenames) {
+    // 초기화
+    completedResults = [];
+    fileProgressTrackers = {};
+    filesProgress.innerHTML = '';
+    resultsContainer.innerHTML = '';
+    
+    // UI 업데이트
+    dropZone.style.display = 'none';
+    transcribeOptions.style.display = 'none';
+    progressSection.classList.remove('hidden');
+    resultSection.classList.add('hidden');
+    
+    // 각 파일에 대한 진행 상황 UI 생성
+    filenames.forEach((filename, index) => {
+        const trackerId = `file-${index}`;
+        fileProgressTrackers[trackerId] = createFileProgressTracker(filename, trackerId);
+        filesProgress.appendChild(fileProgressTrackers[trackerId].element);
+    });
+}
+
+async function followJobs(jobs) {
+    // 새로고침하거나 탭을 다시 열었을 때 이어서 볼 수 있도록 진행 중인 작업 저장
+    localStorage.setItem('active_jobs', JSON.stringify(jobs));
+    await Promise.all(jobs.map(job => followJob(job.job_id, job.index)));
+    localStorage.removeItem('active_jobs');
+    
+    // 결과 표시
+    if (completedResults.some(Boolean)) {
+        showResults();
+    }
+}
+
+function followJob(jobId, fileIndex) {
+    return new Promise((resolve) => {
+        // 연결이 끊기면 EventSource가 마지막 이벤트 번호(Last-Event-ID)로 재연결해 놓친 이벤트부터 이어 받음
+        const source = new EventSource(`/api/jobs/${jobId}/events`);
+        
+        const finish = () => {
+            source.close();
+            resolve();
+        };
+        
+        source.onmessage = (event) => {
+            try {
+                const data = JSON.parse(event.data);
+                handleProgressUpdate({ ...data, file_index: fileIndex + 1 });
+                if (data.status === 'completed' || data.status === 'error') {
+                    finish();
+                }
+            } catch (e) {
+                console.error('JSON 파싱 오류:', e);
+            }
+        };
+        
+        source.onerror = async () => {
+            // 작업이 없어졌거나 이미 끝난 경우에만 재연결 중단
+            try {
+                const response = await fetch(`/api/jobs/${jobId}`);
+                if (response.status === 404) {
+                    finish();
+                    return;
+                }
+                const data = await response.json();
+                if (data.job.status === 'completed' || data.job.status === 'error') {
+                    finish();
+                }
+            } catch (e) {
+                // 서버 재시작 중: EventSource가 계속 재연결 시도
+            }
+        };
+    });
+}
+
+async function resumeActiveJobs() {
+    const savedJobs = JSON.parse(localStorage.getItem('active_jobs') || '[]');
+    if (savedJobs.length === 0) return;
+    
+    // 진행 바는 진행 중인 작업만 다시 만들므로 순서 번호를 새로 매김
+    const jobs = savedJobs.map((job, index) => ({ ...job, index }));
+    showSection('upload');
+    startProgressUI(jobs.map(job => job.filename));
+    await followJobs(jobs);
+}
+
 function createFileProgressTracker(filename, trackerId) {
     const element = document.createElement('div');
     element.className = 'file-progress-item';
@@ -381,10 +450,17 @@ function createFileProgressTracker(filename, trackerId) {
             <div class="progress-fill" style="width: 0%"></div>
             <div class="progress-text">0%</div>
         </div>
+        <div class="file-partial-text hidden"></div>
     `;
     
     return {
         element,
+        // 음성 인식 중 도착한 부분 텍스트 표시 (최근 내용만 유지)
+        appendText: (text) => {
+            const partial = element.querySelector('.file-partial-text');
+            partial.classList.remove('hidden');
+            partial.textContent = (partial.textContent + text).slice(-300);
+        },
         updateProgress: (progress, message, status) => {
             const progressFill = element.querySelector('.progress-fill');
             const progressText = element.querySelector('.progress-text');
@@ -408,19 +484,31 @@ function createFileProgressTracker(filename, trackerId) {
 function handleProgressUpdate(data) {
     const { message, progress, status, filename, text } = data;
     
-    if (message && message.includes('[')) {
+    // 파일들이 동시에 처리되므로 file_index로 해당 파일의 진행 바를 찾음
+    let fileIndex = null;
+    if (data.file_index !== undefined) {
+        fileIndex = data.file_index - 1;
+    } else if (message && message.includes('[')) {
         const match = message.match(/\[(\d+)\/\d+\]/);
         if (match) {
-            const fileIndex = parseInt(match[1]) - 1;
-            const trackerId = `file-${fileIndex}`;
-            const tracker = fileProgressTrackers[trackerId];
+            fileIndex = parseInt(match[1]) - 1;
+        }
+    }
+    
+    if (fileIndex !== null) {
+        const trackerId = `file-${fileIndex}`;
+        const tracker = fileProgressTrackers[trackerId];
+        
+        if (tracker) {
+            tracker.updateProgress(progress, message, status);
             
-            if (tracker) {
-                tracker.updateProgress(progress, message, status);
-                
-                if (status === 'completed' && text !== undefined) {
-                    completedResults.push({ filename, text });
-                }
+            if (data.partial_text) {
+                tracker.appendText(data.partial_text);
+            }
+            
+            if (status === 'completed' && text !== undefined) {
+                // 완료 순서와 상관없이 업로드 순서대로 결과 표시
+                completedResults[fileIndex] = { filename, text };
             }
         }
     }
@@ -430,6 +518,7 @@ function handleProgressUpdate(data) {
 
 function showResults() {
     showSection('result');
+    completedResults = completedResults.filter(Boolean);
     
     completedResults.forEach((result, index) => {
         const resultItem = document.createElement('div');
@@ -487,6 +576,7 @@ downloadAllBtn.addEventListener('click', () => {
 
 function resetUploadUI() {
     dropZone.style.display = 'block';
+    transcribeOptions.style.display = 'flex';
     progressSection.classList.add('hidden');
     fileInput.value = '';
     filesProgress.innerHTML = '';
@@ -508,15 +598,21 @@ function resetAll() {
 
 // ============ 대시보드 기능 ============
 
+const DASHBOARD_PAGE_SIZE = 50;
+let dashboardCursor = null;
+
 async function loadDashboard() {
     filesTable.innerHTML = '<div class="loading">파일 목록을 불러오는 중...</div>';
+    dashboardCursor = null;
     
     try {
-        const response = await fetch('/api/files');
+        const response = await fetch(`/api/files?limit=${DASHBOARD_PAGE_SIZE}`);
         const data = await response.json();
         
         if (data.success) {
             renderFilesTable(data.files);
+            dashboardCursor = data.next_cursor;
+            renderLoadMoreButton();
         } else {
             filesTable.innerHTML = '<div class="loading">파일을 불러올 수 없습니다.</div>';
         }
@@ -526,31 +622,169 @@ async function loadDashboard() {
     }
 }
 
-function renderFilesTable(files) {
-    if (files.length === 0) {
+// 다음 페이지 불러오기
+async function loadMoreFiles() {
+    if (!dashboardCursor) return;
+    
+    try {
+        const response = await fetch(`/api/files?limit=${DASHBOARD_PAGE_SIZE}&cursor=${encodeURIComponent(dashboardCursor)}`);
+        const data = await response.json();
+        
+        if (data.success) {
+            renderFilesTable(data.files, true);
+            dashboardCursor = data.next_cursor;
+            renderLoadMoreButton();
+        }
+    } catch (error) {
+        console.error('파일 목록 로드 오류:', error);
+    }
+}
+
+function renderLoadMoreButton() {
+    const existing = filesTable.querySelector('.load-more');
+    if (existing) existing.remove();
+    
+    if (dashboardCursor) {
+        const wrapper = document.createElement('div');
+        wrapper.className = 'load-more';
+        wrapper.innerHTML = '<button class="btn-toolbar">더 보기</button>';
+        wrapper.querySelector('button').addEventListener('click', loadMoreFiles);
+        filesTable.appendChild(wrapper);
+    }
+}
+
+function renderFilesTable(files, append = false) {
+    if (files.length === 0 && !append) {
         filesTable.innerHTML = '<div class="loading">파일이 없습니다. 새로 추가해보세요!</div>';
         return;
     }
     
-    let html = '';
+    const html = files.map(renderFileRow).join('');
     
-    files.forEach(file => {
-        const date = new Date(file.uploaded_at);
-        const dateStr = `${date.getMonth()+1}/${date.getDate()} ${date.getHours()}:${String(date.getMinutes()).padStart(2,'0')}`;
-        
-        html += '<div class="file-row">';
-        html += `<div><input type="checkbox" class="file-checkbox" data-file-id="${file.id}" data-filename="${file.filename}"></div>`;
-        html += `<div class="file-info-name">${file.filename}</div>`;
-        html += `<div><span class="file-info-type ${file.type}">${getTypeLabel(file.type)}</span></div>`;
-        html += `<div class="file-info-date">${dateStr}</div>`;
-        html += `<div class="file-actions">`;
-        html += `<button class="btn-file-action view" onclick="openFileModal('${file.id}')">보기</button>`;
-        html += `<button class="btn-file-action delete" onclick="deleteFile('${file.id}')">삭제</button>`;
-        html += `</div>`;
-        html += '</div>';
-    });
+    if (append) {
+        filesTable.insertAdjacentHTML('beforeend', html);
+    } else {
+        filesTable.innerHTML = html;
+    }
+}
+
+function renderFileRow(file) {
+    const date = new Date(file.uploaded_at);
+    const dateStr = `${date.getMonth()+1}/${date.getDate()} ${date.getHours()}:${String(date.getMinutes()).padStart(2,'0')}`;
     
-    filesTable.innerHTML = html;
+    let html = `<div class="file-row" data-file-id="${file.id}" data-uploaded-at="${file.uploaded_at}">`;
+    html += `<div><input type="checkbox" class="file-checkbox" data-file-id="${file.id}" data-filename="${file.filename}"></div>`;
+    html += `<div class="file-info-name">${file.filename}`;
+    if (file.snippet) {
+        html += `<div class="search-snippet">${highlightSnippet(file.snippet)}</div>`;
+    }
+    html += `</div>`;
+    html += `<div><span class="file-info-type ${file.type}">${getTypeLabel(file.type)}</span></div>`;
+    html += `<div class="file-info-date">${dateStr}</div>`;
+    html += `<div class="file-actions">`;
+    html += `<button class="btn-file-action view" onclick="openFileModal('${file.id}')">보기</button>`;
+    html += `<button class="btn-file-action delete" onclick="deleteFile('${file.id}')">삭제</button>`;
+    html += `</div>`;
+    html += '</div>';
+    return html;
+}
+
+// ============ 변경 피드 ============
+
+// 서버가 보내는 변경(파일 추가/삭제, 요약 저장/삭제)을 목록과 상세 창에 바로 반영
+// 연결이 끊기면 EventSource가 Last-Event-ID로 재연결해 놓친 변경만 이어 받음
+let changeFeed = null;
+
+function startChangeFeed() {
+    if (changeFeed || !window.EventSource) return;
+    changeFeed = new EventSource('/api/events');
+    changeFeed.onmessage = (e) => {
+        try {
+            applyChange(JSON.parse(e.data));
+        } catch (error) {
+            console.error('변경 피드 처리 오류:', error);
+        }
+    };
+}
+
+function applyChange(change) {
+    // 검색 결과를 보는 중에는 목록을 건드리지 않음
+    const searching = searchInput.value.trim().length > 0;
+    
+    switch (change.type) {
+        case 'reset':
+            // 놓친 변경이 너무 많으면 목록을 다시 불러옴
+            if (!searching) loadDashboard();
+            break;
+        case 'file_created':
+            if (!searching) insertFileRow(change.file);
+            break;
+        case 'file_deleted': {
+            const row = filesTable.querySelector(`.file-row[data-file-id="${change.file_id}"]`);
+            if (row) row.remove();
+            if (currentFileId === change.file_id) {
+                fileModal.classList.add('hidden');
+                currentFileId = null;
+            }
+            break;
+        }
+        case 'summary_updated':
+        case 'summary_deleted':
+            if (currentFileId === change.file_id) applySummaryChange(change);
+            break;
+    }
+}
+
+// 업로드 시각 순서를 지켜 행 추가 (아직 불러오지 않은 페이지에 속하면 건너뜀)
+function insertFileRow(file) {
+    if (filesTable.querySelector(`.file-row[data-file-id="${file.id}"]`)) return;
+    
+    const placeholder = filesTable.querySelector(':scope > .loading');
+    if (placeholder) placeholder.remove();
+    
+    const rows = filesTable.querySelectorAll('.file-row');
+    const next = Array.from(rows).find(row => row.dataset.uploadedAt < file.uploaded_at);
+    if (next) {
+        next.insertAdjacentHTML('beforebegin', renderFileRow(file));
+    } else if (!dashboardCursor) {
+        const loadMore = filesTable.querySelector('.load-more');
+        if (loadMore) {
+            loadMore.insertAdjacentHTML('beforebegin', renderFileRow(file));
+        } else {
+            filesTable.insertAdjacentHTML('beforeend', renderFileRow(file));
+        }
+    }
+}
+
+// 열려 있는 상세 창의 요약 탭 갱신
+function applySummaryChange(change) {
+    const type = change.summary_type;
+    const content = document.querySelector(`.modal-body [data-content="${type}"]`);
+    delete loadedSummaries[type];
+    
+    if (change.type === 'summary_deleted') {
+        currentSummaryTypes.delete(type);
+        if (content) {
+            content.innerHTML = '<div class="summary-placeholder">요약 생성 버튼을 클릭하세요</div>';
+        }
+        return;
+    }
+    
+    currentSummaryTypes.add(type);
+    if (currentTab === type) {
+        loadSummaryTab(currentFileId, type);
+    } else if (content) {
+        content.innerHTML = '<div class="summary-placeholder">저장된 요약이 있습니다. 탭을 열면 불러옵니다.</div>';
+    }
+}
+
+// 검색 스니펫: 본문은 이스케이프하고 <mark> 강조만 살립니다
+function highlightSnippet(snippet) {
+    const div = document.createElement('div');
+    div.textContent = snippet;
+    return div.innerHTML
+        .replace(/&lt;mark&gt;/g, '<mark>')
+        .replace(/&lt;\/mark&gt;/g, '</mark>');
 }
 
 function getTypeLabel(type) {
@@ -625,17 +859,12 @@ downloadSelectedBtn.addEventListener('click', async () => {
         const filename = checkbox.dataset.filename;
         
         try {
-            const response = await fetch(`/api/files/${fileId}`);
-            const data = await response.json();
+            const text = await fetchTranscript(fileId);
+            const txtFilename = filename.replace(/\.[^/.]+$/, '') + '.txt';
+            downloadText(text, txtFilename);
             
-            if (data.success) {
-                const text = data.file.original_text;
-                const txtFilename = filename.replace(/\.[^/.]+$/, '') + '.txt';
-                downloadText(text, txtFilename);
-                
-                // 다운로드 간격 (브라우저 제한 방지)
-                await new Promise(resolve => setTimeout(resolve, 300));
-            }
+            // 다운로드 간격 (브라우저 제한 방지)
+            await new Promise(resolve => setTimeout(resolve, 300));
         } catch (error) {
             console.error(`파일 다운로드 오류 (${filename}):`, error);
         }
@@ -688,11 +917,55 @@ deleteSelectedBtn.addEventListener('click', async () => {
 
 // ============ 모달 기능 ============
 
+// 원본 텍스트 (서버가 gzip으로 압축해 스트리밍)
+async function fetchTranscript(fileId) {
+    const response = await fetch(`/api/files/${fileId}/transcript`);
+    if (!response.ok) {
+        throw new Error(`원본 텍스트를 불러올 수 없습니다. (${response.status})`);
+    }
+    return response.text();
+}
+
+// 요약 하나
+async function fetchSummary(fileId, summaryType) {
+    const response = await fetch(`/api/files/${fileId}/summaries/${summaryType}`);
+    const data = await response.json();
+    if (!data.success) {
+        throw new Error(data.detail || '요약을 불러올 수 없습니다.');
+    }
+    return data.summary;
+}
+
+// 저장된 요약이 있는 탭을 처음 열 때 불러오기
+async function loadSummaryTab(fileId, summaryType) {
+    const content = document.querySelector(`.modal-body [data-content="${summaryType}"]`);
+    if (!content) return;
+    content.innerHTML = '<div class="loading">로딩 중...</div>';
+    
+    try {
+        const summary = await fetchSummary(fileId, summaryType);
+        // 불러오는 사이 다른 파일을 열었으면 무시
+        if (currentFileId !== fileId) return;
+        loadedSummaries[summaryType] = summary;
+        content.innerHTML = `<pre>${summary}</pre>`;
+    } catch (error) {
+        console.error('요약 로드 오류:', error);
+        if (currentFileId === fileId) {
+            content.innerHTML = '<div class="summary-placeholder">요약을 불러올 수 없습니다.</div>';
+        }
+    }
+}
+
 async function openFileModal(fileId) {
     currentFileId = fileId;
     currentTab = 'original';
+    currentFilename = '';
+    currentOriginalText = null;
+    currentSummaryTypes = new Set();
+    loadedSummaries = {};
     
     fileModal.classList.remove('hidden');
+    modalSubtitleBtn.classList.add('hidden');
     
     // 모든 탭 내용 초기화
     document.querySelectorAll('.modal-body .tab-content').forEach(content => {
@@ -715,21 +988,31 @@ async function openFileModal(fileId) {
         
         if (data.success) {
             const file = data.file;
+            currentFilename = file.filename;
+            currentSummaryTypes = new Set(Object.keys(file.summaries || {}));
             modalFilename.textContent = file.filename;
             
-            // 원본 텍스트 표시
-            const originalContent = document.querySelector('.modal-body [data-content="original"]');
-            if (originalContent) {
-                originalContent.innerHTML = `<pre>${file.original_text || '(내용 없음)'}</pre>`;
+            // 음성 인식 세그먼트가 있는 파일만 자막 다운로드 가능
+            if (file.segment_count > 0) {
+                modalSubtitleBtn.classList.remove('hidden');
             }
             
-            // 기존 요약이 있으면 표시
-            Object.keys(file.summaries || {}).forEach(type => {
+            // 기존 요약은 탭을 열 때 불러옴
+            currentSummaryTypes.forEach(type => {
                 const content = document.querySelector(`.modal-body [data-content="${type}"]`);
                 if (content) {
-                    content.innerHTML = `<pre>${file.summaries[type]}</pre>`;
+                    content.innerHTML = '<div class="summary-placeholder">저장된 요약이 있습니다. 탭을 열면 불러옵니다.</div>';
                 }
             });
+            
+            // 원본 텍스트 표시
+            const text = file.text_bytes > 0 ? await fetchTranscript(fileId) : '';
+            if (currentFileId !== fileId) return;
+            currentOriginalText = text;
+            const originalContent = document.querySelector('.modal-body [data-content="original"]');
+            if (originalContent) {
+                originalContent.innerHTML = `<pre>${text || '(내용 없음)'}</pre>`;
+            }
         }
     } catch (error) {
         console.error('파일 로드 오류:', error);
@@ -763,6 +1046,10 @@ document.querySelectorAll('.modal-tabs .tab-btn').forEach(btn => {
         // 선택한 탭 활성화
         btn.classList.add('active');
         document.querySelector(`.modal-body [data-content="${currentTab}"]`).classList.add('active');
+        
+        if (currentFileId && currentSummaryTypes.has(currentTab) && !(currentTab in loadedSummaries)) {
+            loadSummaryTab(currentFileId, currentTab);
+        }
     });
 });
 
@@ -771,30 +1058,39 @@ modalDownloadBtn.addEventListener('click', async () => {
     if (!currentFileId) return;
     
     try {
-        const response = await fetch(`/api/files/${currentFileId}`);
-        const data = await response.json();
+        const baseName = currentFilename.replace(/\.[^/.]+$/, '');
+        let text = '';
+        let filename = '';
         
-        if (data.success) {
-            const file = data.file;
-            let text = '';
-            let filename = '';
-            
-            if (currentTab === 'original') {
-                text = file.original_text;
-                filename = file.filename.replace(/\.[^/.]+$/, '') + '.txt';
-            } else {
-                text = file.summaries[currentTab] || '';
-                filename = file.filename.replace(/\.[^/.]+$/, '') + `_${currentTab}.txt`;
+        if (currentTab === 'original') {
+            text = currentOriginalText ?? await fetchTranscript(currentFileId);
+            filename = baseName + '.txt';
+        } else {
+            if (currentTab in loadedSummaries) {
+                text = loadedSummaries[currentTab];
+            } else if (currentSummaryTypes.has(currentTab)) {
+                text = await fetchSummary(currentFileId, currentTab);
             }
-            
-            downloadText(text, filename);
+            filename = baseName + `_${currentTab}.txt`;
         }
+        
+        downloadText(text, filename);
     } catch (error) {
         console.error('다운로드 오류:', error);
         alert('다운로드 중 오류가 발생했습니다.');
     }
 });
 
+// 자막 다운로드 (서버에서 세그먼트로 SRT 생성)
+modalSubtitleBtn.addEventListener('click', () => {
+    if (!currentFileId) return;
+    const a = document.createElement('a');
+    a.href = `/api/files/${currentFileId}/subtitles?format=srt`;
+    document.body.appendChild(a);
+    a.click();
+    document.body.removeChild(a);
+});
+
 function downloadText(text, filename) {
     const blob = new Blob([text], { type: 'text/plain;charset=utf-8' });
     const url = URL.createObjectURL(blob);
@@ -835,6 +1131,8 @@ modalSummarizeBtn.addEventListener('click', async () => {
         if (data.success) {
             const content = document.querySelector(`.modal-body [data-content="${currentTab}"]`);
             content.innerHTML = `<pre>${data.summary}</pre>`;
+            currentSummaryTypes.add(currentTab);
+            loadedSummaries[currentTab] = data.summary;
             
             if (data.cached) {
                 alert('캐시된 요약을 불러왔습니다.');
@@ -842,7 +1140,7 @@ modalSummarizeBtn.addEventListener('click', async () => {
                 alert(`${typeName} 요약이 생성되었습니다!`);
             }
         } else {
-            alert('요약 생성 중 오류가 발생했습니다.');
+            alert(data.detail || '요약 생성 중 오류가 발생했습니다.');
         }
     } catch (error) {
         console.error('요약 생성 오류:', error);
@@ -902,6 +1200,9 @@ modalDeleteSummaryBtn.addEventListener('click', async () => {
         const data = await response.json();
         
         if (data.success) {
+            currentSummaryTypes.delete(currentTab);
+            delete loadedSummaries[currentTab];
+            
             // 요약 내용 초기화
             const content = document.querySelector(`.modal-body [data-content="${currentTab}"]`);
             if (content) {
@@ -1038,6 +1339,12 @@ deleteApiKeyBtn.addEventListener('click', async () => {
     }
 });
 
+// 페이지 로드 시 이전에 진행 중이던 변환 작업 이어서 표시
+window.addEventListener('DOMContentLoaded', () => {
+    resumeActiveJobs();
+    startChangeFeed();
+});
+
 // 페이지 로드 시 로컬 스토리지에서 API 키 복원
 window.addEventListener('DOMContentLoaded', async () => {
     const savedApiKey = localStorage.getItem('gemini_api_key');
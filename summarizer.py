@@ -0,0 +1,506 @@
+"""
+Gemini 요약 스케줄러
+요약 요청을 대기열로 받아 토큰 버킷으로 분당 요청 수를 제한하고, 같은 (파일, 요약 유형) 요청은
+진행 중인 호출 하나로 합치며, 일시적인 오류(요청 한도 초과, 서버 오류)는 지수 백오프로 다시 시도합니다.
+
+긴 텍스트는 토큰 수 제한에 맞춰 구간으로 나눠 각각 요약한 뒤(map, 구간 요약은 내용 해시로 캐시)
+구간 요약들을 모아 요청한 요약 유형의 형식으로 다시 요약합니다(reduce).
+
+GEMINI_STUB=1이면 실제 API 대신 로컬 스텁 모델을 사용합니다. (API 키 없이 개발/부하 테스트)
+"""
+import os
+import re
+import time
+import random
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import database as db
+import metrics
+from cache import summary_cache, summary_chunk_key
+
+# 무료 티어 한도(분당 10회)에 맞춘 기본값, 0이면 제한 없음
+GEMINI_RPM = float(os.environ.get("GEMINI_RPM", 10))
+# 한 번에 연달아 보낼 수 있는 요청 수 (1이면 60/GEMINI_RPM초 간격으로만 보냄)
+GEMINI_BURST = int(os.environ.get("GEMINI_BURST", 1))
+GEMINI_MAX_RETRIES = int(os.environ.get("GEMINI_MAX_RETRIES", 3))
+GEMINI_RETRY_BASE_SECONDS = float(os.environ.get("GEMINI_RETRY_BASE_SECONDS", 2.0))
+GEMINI_RETRY_MAX_SECONDS = 60.0
+GEMINI_STUB = os.environ.get("GEMINI_STUB", "0").lower() in ("1", "true", "yes")
+GEMINI_STUB_LATENCY_MS = int(os.environ.get("GEMINI_STUB_LATENCY_MS", 500))
+# 스텁이 일시적 오류(429)를 낼 확률 (재시도 동작 확인용)
+GEMINI_STUB_FAILURE_RATE = float(os.environ.get("GEMINI_STUB_FAILURE_RATE", 0))
+GEMINI_MODEL_NAME = "gemini-2.0-flash-exp"
+
+# 한 번의 요청에 넣을 최대 토큰 수 (이보다 긴 텍스트는 구간별로 나눠 요약)
+SUMMARY_CHUNK_TOKENS = int(os.environ.get("SUMMARY_CHUNK_TOKENS", 8000))
+# 서버 전체에서 동시에 요약할 수 있는 구간 수
+SUMMARY_MAX_CONCURRENCY = int(os.environ.get("SUMMARY_MAX_CONCURRENCY", 3))
+# 구간 요약을 다시 나눠 요약하는 최대 단계 수 (넘으면 남은 구간 요약을 잘라 마지막 요약)
+SUMMARY_MAX_REDUCE_DEPTH = 3
+# 구간 요약 프롬프트를 바꾸면 올려서 이전 캐시를 쓰지 않도록 함
+CHUNK_PROMPT_VERSION = 1
+# 문장 경계 (세그먼트 정보가 없을 때 구간을 나누는 기준)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+# 상태 조회용으로 보관할 최근 완료 요청 수
+RECENT_LIMIT = 100
+
+# 다시 시도할 만한 오류 (google.api_core 예외 이름 또는 HTTP 상태 코드)
+RETRYABLE_ERRORS = ("ResourceExhausted", "TooManyRequests", "ServiceUnavailable", "InternalServerError",
+                    "DeadlineExceeded", "GatewayTimeout", "TimeoutError", "ConnectionError")
+RETRYABLE_CODES = ("429", "500", "502", "503", "504")
+
+
+class SummaryError(Exception):
+    """요약 생성 실패"""
+
+
+class SummaryUnavailableError(SummaryError):
+    """Gemini API 키가 설정되지 않음"""
+
+
+class StubGenerativeModel:
+    """genai.GenerativeModel 대신 쓰는 로컬 스텁 (generate_content(prompt).text만 흉내)"""
+
+    class Response:
+        def __init__(self, text: str):
+            self.text = text
+
+    def __init__(self, latency_ms: int = GEMINI_STUB_LATENCY_MS, failure_rate: float = GEMINI_STUB_FAILURE_RATE):
+        self.latency = latency_ms / 1000
+        self.failure_rate = failure_rate
+        self.calls = 0
+
+    def generate_content(self, prompt: str) -> "StubGenerativeModel.Response":
+        self.calls += 1
+        time.sleep(self.latency)
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError("429 Resource has been exhausted (stub)")
+        first_line = next((line.strip() for line in prompt.splitlines() if line.strip()), "")
+        return self.Response(f"(스텁 요약) {first_line[:80]} - 입력 {len(prompt)}자")
+
+
+# Gemini 설정 (사용자가 직접 입력, GEMINI_STUB이면 스텁 모델)
+api_key: Optional[str] = None
+model = StubGenerativeModel() if GEMINI_STUB else None
+
+
+def configure(new_api_key: str) -> bool:
+    """Gemini API 키 설정 및 검증"""
+    global api_key, model
+    try:
+        import google.generativeai as genai
+        genai.configure(api_key=new_api_key)
+        # gemini-2.0-flash: 최신 모델, 저렴하고 빠름 (무료 티어 10 RPM, 100만 토큰/분)
+        candidate = genai.GenerativeModel(GEMINI_MODEL_NAME)
+        
+        # 간단한 테스트로 API 키 검증
+        candidate.generate_content("Hi")
+        
+        # 테스트 성공하면 저장
+        model = candidate
+        api_key = new_api_key
+        print(f"✓ Gemini API 연결 완료! (모델: {GEMINI_MODEL_NAME})")
+        return True
+    except Exception as e:
+        print(f"Gemini API 연결 실패: {e}")
+        clear()
+        return False
+
+
+def clear():
+    """API 키 삭제 (스텁 모드면 스텁 모델로 되돌림)"""
+    global api_key, model
+    api_key = None
+    model = StubGenerativeModel() if GEMINI_STUB else None
+
+
+def set_model(new_model) -> None:
+    """generate_content(prompt).text를 제공하는 모델 객체를 직접 지정 (테스트용 스텁 주입)"""
+    global model
+    model = new_model
+
+
+def build_prompt(text: str, summary_type: str = "general") -> str:
+    """요약 유형별 프롬프트 (알 수 없는 유형은 일반 요약)"""
+    prompts = {
+        "general": f"""다음 텍스트를 명확하고 간결하게 요약해주세요. 
+핵심 내용을 3-5개의 주요 포인트로 정리하세요.
+
+텍스트:
+{text}
+
+요약:""",
+        
+        "meeting": f"""다음 회의 내용을 회의록 형식으로 정리해주세요:
+
+[원본]
+{text}
+
+[회의록 형식]
+## 📋 회의 개요
+
+## 💬 주요 논의 사항
+- 
+
+## ✅ 결정 사항
+- 
+
+## 📌 향후 계획
+- 
+
+## 🔔 기타 사항
+- """,
+        
+        "lecture": f"""다음 강의 내용을 학습 노트 형식으로 요약해주세요:
+
+[강의 내용]
+{text}
+
+[학습 노트]
+## 📚 핵심 개념
+- 
+
+## 💡 주요 내용
+1. 
+
+## 📝 예시/사례
+- 
+
+## 🎯 핵심 요점
+- """,
+        
+        "youtube": f"""다음 영상 내용을 유튜브 요약 형식으로 정리해주세요:
+
+[영상 내용]
+{text}
+
+[요약]
+## 🎬 영상 개요
+- 
+
+## ⏱ 주요 내용
+- 
+
+## 💎 핵심 메시지
+- 
+
+## 📌 타임라인 요약
+- """,
+        
+        "conversation": f"""다음 대화 내용을 정리해주세요:
+
+[대화 내용]
+{text}
+
+[정리]
+## 💬 대화 주제
+- 
+
+## 📝 주요 토픽
+1. 
+
+## 🗣 핵심 의견
+- 
+
+## 📌 결론
+- """
+    }
+    return prompts.get(summary_type, prompts["general"])
+
+
+def build_chunk_prompt(chunk: str) -> str:
+    """구간 요약 프롬프트 (요약 유형과 무관하게 재사용할 수 있도록 형식 없이 내용만 압축)"""
+    return f"""다음은 긴 기록의 일부입니다. 이후 전체 요약에 쓸 수 있도록 이 부분의 주요 내용, 결정 사항,
+수치, 고유명사를 빠짐없이 간결한 문장으로 정리해주세요. 서론이나 형식 없이 요약 내용만 작성하세요.
+
+텍스트:
+{chunk}
+
+요약:"""
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (영문 등 ASCII는 4자당 1토큰, 한글 등은 1자당 1토큰으로 보수적으로 계산)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+def split_text(text: str, max_tokens: int = SUMMARY_CHUNK_TOKENS,
+               segments: Optional[List[Dict]] = None) -> List[str]:
+    """
+    max_tokens 이하의 구간으로 나눕니다.
+    Whisper 세그먼트가 있으면 세그먼트 경계에서, 없으면 문장 경계에서 자르고
+    한 단위가 그보다 길면 글자 수로 자릅니다.
+    """
+    if segments:
+        units = [seg["text"] for seg in segments if seg.get("text")]
+    else:
+        units = [unit for unit in _SENTENCE_END_RE.split(text) if unit.strip()]
+    
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+    for unit in units:
+        unit_tokens = estimate_tokens(unit)
+        if unit_tokens > max_tokens:
+            # 너무 긴 단위는 추정 토큰 수에 비례해 글자 수로 나눔
+            step = max(len(unit) * max_tokens // unit_tokens, 1)
+            pieces = [unit[i:i + step] for i in range(0, len(unit), step)]
+        else:
+            pieces = [unit]
+        for piece in pieces:
+            piece_tokens = estimate_tokens(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece.strip())
+            current_tokens += piece_tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def join_partials(partials: List[str], max_tokens: Optional[int] = None) -> str:
+    """구간 요약을 번호를 붙여 합침 (max_tokens가 있으면 각 구간 요약을 같은 몫만큼 앞에서부터 잘라 맞춤)"""
+    if max_tokens is not None:
+        headers = estimate_tokens(join_partials([""] * len(partials)))
+        budget = max((max_tokens - headers) // max(len(partials), 1), 1)
+        partials = [(split_text(partial, budget) or [""])[0] for partial in partials]
+    return "\n\n".join(f"[부분 {i}]\n{partial.strip()}" for i, partial in enumerate(partials, 1))
+
+
+def is_retryable(error: Exception) -> bool:
+    """요청 한도 초과나 일시적인 서버 오류인지"""
+    name = type(error).__name__
+    message = str(error)
+    return any(n in name for n in RETRYABLE_ERRORS) or any(code in message for code in RETRYABLE_CODES)
+
+
+class TokenBucket:
+    """분당 rate_per_minute개씩 채워지는 토큰 버킷 (capacity개까지 연달아 사용 가능)"""
+
+    def __init__(self, rate_per_minute: float = GEMINI_RPM, capacity: int = GEMINI_BURST):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(capacity, 1)
+        self.tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self.waiting = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """토큰 하나를 얻을 때까지 대기 (먼저 기다린 요청이 먼저 얻음)"""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    def status(self) -> Dict:
+        if self.rate > 0:
+            self._refill()
+        return {
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.capacity,
+            "tokens_available": round(self.tokens, 2),
+            "waiting": self.waiting
+        }
+
+
+class SummaryScheduler:
+    """요약 요청 스케줄러 (같은 파일/유형 요청 합치기, 요청 수 제한, 재시도, 결과 DB 저장)"""
+
+    def __init__(self, bucket: TokenBucket, max_retries: int = GEMINI_MAX_RETRIES,
+                 retry_base: float = GEMINI_RETRY_BASE_SECONDS):
+        self.bucket = bucket
+        self.max_retries = max(max_retries, 0)
+        self.retry_base = retry_base
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._states: Dict[Tuple[str, str], Dict] = {}
+        self._recent: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._chunk_slots = asyncio.Semaphore(max(SUMMARY_MAX_CONCURRENCY, 1))
+        self.requests = 0
+        self.coalesced = 0
+        self.api_calls = 0
+        self.retries = 0
+        self.completed = 0
+        self.failures = 0
+
+    def submit(self, file_id: str, summary_type: str, text: str,
+               segments: Optional[List[Dict]] = None) -> Tuple[asyncio.Task, bool]:
+        """
+        요약 작업 제출. 같은 요청이 진행 중이면 그 작업을 반환 (작업, 합쳐졌는지)
+        segments(Whisper 세그먼트)가 있으면 긴 텍스트를 세그먼트 경계에서 나눔
+        """
+        key = (file_id, summary_type)
+        self.requests += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            self._states[key]["waiters"] += 1
+            return task, True
+        
+        self._states[key] = {
+            "file_id": file_id,
+            "summary_type": summary_type,
+            "status": "queued",
+            "attempts": 0,
+            # 구간 요약 수 (한 번에 요약하면 0)
+            "chunks": 0,
+            "chunks_done": 0,
+            "chunks_cached": 0,
+            "waiters": 1,
+            "error": None,
+            "submitted_at": datetime.now().isoformat(),
+            "finished_at": None
+        }
+        task = asyncio.create_task(self._run(key, text, segments))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return task, False
+
+    def _finish(self, key: Tuple[str, str], task: asyncio.Task):
+        self._inflight.pop(key, None)
+        state = self._states.pop(key, None)
+        # wait=false로 제출하고 아무도 기다리지 않는 작업의 예외도 여기서 확인 처리
+        if not task.cancelled():
+            task.exception()
+        if state is not None:
+            self._recent[key] = state
+            self._recent.move_to_end(key)
+            while len(self._recent) > RECENT_LIMIT:
+                self._recent.popitem(last=False)
+
+    async def _run(self, key: Tuple[str, str], text: str, segments: Optional[List[Dict]]) -> str:
+        file_id, summary_type = key
+        state = self._states[key]
+        try:
+            summary = await self._summarize(text, summary_type, segments, state)
+            # 요청한 클라이언트가 연결을 끊어도 결과는 저장
+            await asyncio.to_thread(db.update_summary, file_id, summary_type, summary)
+        except Exception as e:
+            state.update(status="error", error=str(e), finished_at=datetime.now().isoformat())
+            self.failures += 1
+            raise
+        state.update(status="completed", error=None, finished_at=datetime.now().isoformat())
+        self.completed += 1
+        return summary
+
+    async def _summarize(self, text: str, summary_type: str, segments: Optional[List[Dict]], state: Dict) -> str:
+        """짧으면 한 번에, 길면 구간별 요약(map) 후 요약 유형 형식으로 합침(reduce)"""
+        chunks = split_text(text, SUMMARY_CHUNK_TOKENS, segments)
+        if len(chunks) <= 1:
+            return await self._generate(build_prompt(text, summary_type), state)
+        
+        # 구간 요약을 합쳐도 한 요청에 넣기에 길면 구간 요약을 다시 나눠 요약
+        source_tokens = estimate_tokens(text)
+        depth = 0
+        while len(chunks) > 1:
+            depth += 1
+            state["chunks"] += len(chunks)
+            partials = await asyncio.gather(*(self._summarize_chunk(chunk, state) for chunk in chunks))
+            combined = join_partials(partials)
+            chunks = split_text(combined, SUMMARY_CHUNK_TOKENS)
+            if len(chunks) <= 1:
+                break
+            combined_tokens = estimate_tokens(combined)
+            # 요약해도 줄어들지 않거나 단계가 너무 깊어지면 Gemini 호출을 계속 쓰지 않도록 잘라서 마무리
+            if combined_tokens >= source_tokens or depth >= SUMMARY_MAX_REDUCE_DEPTH:
+                print(f"구간 요약이 충분히 줄지 않아 잘라서 요약합니다. ({depth}단계, 약 {combined_tokens}토큰)")
+                combined = join_partials(partials, SUMMARY_CHUNK_TOKENS)
+                break
+            source_tokens = combined_tokens
+        return await self._generate(build_prompt(combined, summary_type), state)
+
+    async def _summarize_chunk(self, chunk: str, state: Dict) -> str:
+        """구간 하나 요약 (같은 내용의 구간은 캐시된 요약 사용)"""
+        cache_key = summary_chunk_key(chunk, GEMINI_MODEL_NAME, CHUNK_PROMPT_VERSION)
+        cached = await asyncio.to_thread(summary_cache.get, cache_key)
+        metrics.summary_chunk_cache_requests.inc(result="miss" if cached is None else "hit")
+        if cached is not None:
+            state["chunks_cached"] += 1
+            state["chunks_done"] += 1
+            return cached["summary"]
+        
+        async with self._chunk_slots:
+            summary = await self._generate(build_chunk_prompt(chunk), state)
+        await asyncio.to_thread(summary_cache.put, cache_key, {"summary": summary})
+        state["chunks_done"] += 1
+        return summary
+
+    async def _generate(self, prompt: str, state: Dict) -> str:
+        """요청 수 제한을 지키며 Gemini 호출 (일시적 오류는 지수 백오프 후 재시도)"""
+        attempt = 0
+        while True:
+            if model is None:
+                raise SummaryUnavailableError("Gemini API 키가 설정되지 않았습니다. 설정에서 API 키를 입력해주세요.")
+            state["status"] = "waiting"
+            await self.bucket.acquire()
+            attempt += 1
+            # attempts: 이 요약 요청 전체에서 보낸 Gemini 호출 수 (구간 요약 포함)
+            state.update(status="running", attempts=state["attempts"] + 1)
+            self.api_calls += 1
+            try:
+                with metrics.timer("gemini"):
+                    response = await asyncio.to_thread(model.generate_content, prompt)
+                metrics.gemini_requests.inc(status="ok")
+                return response.text
+            except Exception as e:
+                retryable = is_retryable(e)
+                if not retryable or attempt > self.max_retries:
+                    metrics.gemini_requests.inc(status="error")
+                    print(f"Gemini 요약 오류: {e}")
+                    raise SummaryError(f"요약 생성 중 오류가 발생했습니다: {e}") from e
+                metrics.gemini_requests.inc(status="retry")
+                self.retries += 1
+                # 지수 백오프 + 지터 (여러 요청이 동시에 다시 몰리지 않도록)
+                delay = min(self.retry_base * 2 ** (attempt - 1), GEMINI_RETRY_MAX_SECONDS)
+                delay += random.uniform(0, self.retry_base)
+                state.update(status="retrying", error=str(e))
+                print(f"Gemini 일시적 오류, {delay:.1f}초 후 다시 시도 ({attempt}/{self.max_retries}): {e}")
+                await asyncio.sleep(delay)
+
+    def find(self, file_id: str, summary_type: str) -> Optional[Dict]:
+        """진행 중이거나 최근 끝난 요약 요청 상태"""
+        key = (file_id, summary_type)
+        state = self._states.get(key) or self._recent.get(key)
+        return dict(state) if state else None
+
+    def status(self) -> Dict:
+        return {
+            "model_configured": model is not None,
+            "stub": isinstance(model, StubGenerativeModel),
+            "rate_limit": self.bucket.status(),
+            "max_retries": self.max_retries,
+            "in_flight": [dict(state) for state in self._states.values()],
+            "recent": [dict(state) for state in reversed(self._recent.values())],
+            "stats": {
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "api_calls": self.api_calls,
+                "retries": self.retries,
+                "completed": self.completed,
+                "failures": self.failures
+            }
+        }
+
+
+scheduler = SummaryScheduler(TokenBucket())
@@ -0,0 +1,540 @@
+"""
+Whisper 음성 인식 워커 풀
+각 워커 프로세스가 시작할 때 기본 모델을 로드하고, CPU 코어를 나눠 torch 스레드 수를 정합니다.
+요청마다 다른 크기의 모델을 쓸 수 있으며 워커마다 최근 사용한 모델을 몇 개까지 메모리에 유지합니다.
+동시에 들어온 여러 작업의 30초 구간은 한 번에 모아 배치로 디코딩할 수 있습니다.
+"""
+import gc
+import os
+import re
+import time
+import queue
+import asyncio
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Union, Dict, List, Tuple
+
+import numpy as np
+
+import backends
+from audio import SAMPLE_RATE
+
+WHISPER_MODEL = os.environ.get("WHISPER_MODEL", "base")
+# 기본 인식 언어 ("auto"면 Whisper가 언어를 감지)
+WHISPER_LANGUAGE = os.environ.get("WHISPER_LANGUAGE", "ko")
+WHISPER_WORKERS = int(os.environ.get("WHISPER_WORKERS", 1))
+# 워커별 torch 스레드 수 (기본: 코어를 워커 수로 나눔 → 과다 구독 방지)
+WHISPER_THREADS_PER_WORKER = int(os.environ.get(
+    "WHISPER_THREADS_PER_WORKER",
+    max(1, (os.cpu_count() or 1) // max(WHISPER_WORKERS, 1))
+))
+# 실행 중인 작업 외에 대기열에 쌓일 수 있는 작업 수 (가득 차면 제출하는 쪽이 대기)
+WHISPER_QUEUE_SIZE = int(os.environ.get("WHISPER_QUEUE_SIZE", WHISPER_WORKERS * 4))
+# 워커별로 메모리에 유지할 모델 수와 모델 메모리 예산 (바이트, 0이면 개수만 제한)
+WHISPER_MAX_MODELS = int(os.environ.get("WHISPER_MAX_MODELS", 2))
+WHISPER_MODEL_MEMORY_BUDGET = int(os.environ.get("WHISPER_MODEL_MEMORY_BUDGET", 0))
+# 여러 작업의 구간을 모아 한 번에 디코딩할 최대 개수 (1이면 배치 사용 안 함)와 모으는 최대 대기 시간(초)
+WHISPER_BATCH_SIZE = int(os.environ.get("WHISPER_BATCH_SIZE", 1))
+WHISPER_BATCH_WAIT = float(os.environ.get("WHISPER_BATCH_WAIT_MS", 50)) / 1000
+
+# Whisper 입력 창 (30초)
+WINDOW_SAMPLES = 30 * SAMPLE_RATE
+# 무음 판정 기준 (whisper.transcribe 기본값과 동일)
+NO_SPEECH_THRESHOLD = 0.6
+LOGPROB_THRESHOLD = -1.0
+
+# 선택할 수 있는 모델 (whisper.available_models()와 동일, torch를 불러오지 않고 검증하기 위해 고정)
+AVAILABLE_MODELS = (
+    "tiny.en", "tiny", "base.en", "base", "small.en", "small", "medium.en", "medium",
+    "large-v1", "large-v2", "large-v3", "large", "large-v3-turbo", "turbo"
+)
+# 로드 전 메모리 예측용 파라미터 수 (fp32 → 파라미터당 4바이트)
+MODEL_PARAMETERS = {
+    "tiny": 39_000_000, "base": 74_000_000, "small": 244_000_000,
+    "medium": 769_000_000, "large": 1_550_000_000, "turbo": 809_000_000
+}
+
+_LANGUAGE_RE = re.compile(r"^[a-z]{2,3}$|^auto$")
+
+
+def validate_model(model_name: Optional[str]) -> str:
+    """모델 이름 확인 (없으면 기본 모델). 지원하지 않으면 ValueError"""
+    model_name = (model_name or WHISPER_MODEL).strip()
+    if model_name not in AVAILABLE_MODELS:
+        raise ValueError(f"지원하지 않는 모델입니다: {model_name} (지원: {', '.join(AVAILABLE_MODELS)})")
+    return model_name
+
+
+def validate_language(language: Optional[str]) -> str:
+    """언어 코드 확인 (없으면 기본 언어, "auto"는 자동 감지). 형식이 틀리면 ValueError"""
+    language = (language or WHISPER_LANGUAGE).strip().lower()
+    if not _LANGUAGE_RE.match(language):
+        raise ValueError(f"잘못된 언어 코드입니다: {language} (예: ko, en, ja, auto)")
+    return language
+
+
+def model_cache_name(model_name: str, backend: str = backends.WHISPER_BACKEND) -> str:
+    """변환 결과 캐시 키에 쓰는 모델 이름 (백엔드마다 결과가 조금씩 다르므로 구분, 기본 백엔드는 이름만)"""
+    return model_name if backend == "openai" else f"{model_name}@{backend}"
+
+
+def estimate_model_bytes(model_name: str) -> int:
+    """모델을 로드하기 전에 필요한 메모리 추정"""
+    size = model_name.split(".")[0]
+    if "turbo" in size:
+        size = "turbo"
+    elif size.startswith("large"):
+        size = "large"
+    return MODEL_PARAMETERS.get(size, MODEL_PARAMETERS["large"]) * 4
+
+
+# ============ 워커 프로세스 ============
+
+def _rss_bytes() -> Optional[int]:
+    """현재 프로세스의 RSS (Linux /proc 기준, 그 외 플랫폼은 None)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ModelRegistry:
+    """워커 프로세스 안의 모델 캐시 (개수/메모리 예산을 넘으면 가장 오래 안 쓴 모델부터 내림)"""
+
+    def __init__(self, max_models: int = WHISPER_MAX_MODELS, memory_budget: int = WHISPER_MODEL_MEMORY_BUDGET,
+                 backend: str = backends.WHISPER_BACKEND, num_threads: int = 0):
+        self.max_models = max(max_models, 1)
+        self.memory_budget = memory_budget
+        self.backend = backend
+        self.num_threads = num_threads
+        self._models = OrderedDict()
+        self.stats: Dict[str, Dict] = {}
+        self.evictions = 0
+
+    def _resident_bytes(self) -> int:
+        return sum(self.stats[name]["model_bytes"] for name in self._models)
+
+    def _make_room(self, needed: int):
+        while self._models and (
+            len(self._models) >= self.max_models
+            or (self.memory_budget and self._resident_bytes() + needed > self.memory_budget)
+        ):
+            name, _ = self._models.popitem(last=False)
+            self.evictions += 1
+            print(f"[워커 {os.getpid()}] Whisper 모델 내림: {name}")
+        # 내린 모델의 메모리를 새 모델을 로드하기 전에 돌려받음
+        gc.collect()
+
+    def get(self, model_name: str):
+        """모델 반환 (없으면 로드)"""
+        if model_name in self._models:
+            self._models.move_to_end(model_name)
+            self.stats[model_name]["uses"] += 1
+            return self._models[model_name]
+
+        self._make_room(estimate_model_bytes(model_name))
+        print(f"[워커 {os.getpid()}] Whisper 모델 로드 중... ({model_name}, {self.backend})")
+        started = time.perf_counter()
+        model = backends.load_model(model_name, self.backend, self.num_threads)
+        self._models[model_name] = model
+        previous = self.stats.get(model_name, {})
+        size = backends.model_bytes(model)
+        self.stats[model_name] = {
+            "load_seconds": round(time.perf_counter() - started, 3),
+            "model_bytes": size if size is not None else estimate_model_bytes(model_name),
+            # 이 모델을 로드한 직후의 프로세스 RSS
+            "rss_bytes": _rss_bytes(),
+            "loads": previous.get("loads", 0) + 1,
+            "uses": previous.get("uses", 0) + 1
+        }
+        print(f"[워커 {os.getpid()}] Whisper 모델 로드 완료! ({model_name}, {self.stats[model_name]['load_seconds']}초)")
+        return model
+
+    def snapshot(self) -> Dict:
+        return {
+            "pid": os.getpid(),
+            "backend": self.backend,
+            "resident": list(self._models),
+            "resident_bytes": self._resident_bytes(),
+            "rss_bytes": _rss_bytes(),
+            "evictions": self.evictions,
+            "models": self.stats
+        }
+
+
+_registry: Optional[ModelRegistry] = None
+
+def _init_worker(model_name: str, num_threads: int, max_models: int, memory_budget: int,
+                 backend: str, ready_queue):
+    """워커 시작 시 한 번 실행: torch 스레드 설정 및 기본 모델 로드"""
+    global _registry
+    if backend != "faster-whisper":
+        import torch
+        torch.set_num_threads(num_threads)
+    print(f"[워커 {os.getpid()}] 스레드 {num_threads}개로 시작")
+    _registry = ModelRegistry(max_models, memory_budget, backend, num_threads)
+    _registry.get(model_name)
+    ready_queue.put(_registry.snapshot())
+
+
+def _whisper_language(language: str) -> Optional[str]:
+    # "auto"면 None을 넘겨 Whisper가 첫 30초로 언어를 감지
+    return None if language == "auto" else language
+
+
+def _resolve_audio(audio: Union[str, np.ndarray]) -> Union[str, np.ndarray]:
+    """.pcm 경로는 memmap으로 열고, 그 외 경로/배열은 그대로 사용"""
+    if isinstance(audio, str) and audio.endswith(".pcm"):
+        return np.memmap(audio, dtype=np.float32, mode="c")
+    return audio
+
+
+def _transcribe_chunk_job(audio: Union[str, np.ndarray], start: int, end: int, offset: float,
+                          language: str, prompt: Optional[str], model_name: str) -> Dict:
+    """오디오의 [start, end) 샘플 구간을 인식하고 세그먼트 시간을 offset만큼 옮겨 반환"""
+    model = _registry.get(model_name)
+    samples = np.ascontiguousarray(_resolve_audio(audio)[start:end])
+    result = model.transcribe(
+        samples, language=_whisper_language(language), fp16=False, verbose=False,
+        initial_prompt=prompt or None
+    )
+    return {
+        "text": result["text"],
+        "segments": [
+            {
+                "start": round(seg["start"] + offset, 2),
+                "end": round(seg["end"] + offset, 2),
+                "text": seg["text"],
+                "avg_logprob": seg.get("avg_logprob")
+            }
+            for seg in result.get("segments", [])
+        ],
+        "language": result.get("language"),
+        "worker": _registry.snapshot()
+    }
+
+
+def _segments_from_tokens(tokens: List[int], tokenizer, offset: float, duration: float) -> List[Dict]:
+    """타임스탬프 토큰(<|0.00|> 텍스트 <|2.40|>)으로 구간을 나눠 세그먼트 목록 생성"""
+    timestamp_begin = tokenizer.timestamp_begin
+    segments = []
+    start = None
+    text_tokens = []
+
+    def close(end: float):
+        text = tokenizer.decode(text_tokens)
+        if text.strip():
+            segments.append({
+                "start": round(offset + (start or 0.0), 2),
+                "end": round(offset + min(end, duration), 2),
+                "text": text
+            })
+
+    for token in tokens:
+        if token < timestamp_begin:
+            text_tokens.append(token)
+            continue
+        time_position = (token - timestamp_begin) * 0.02
+        if start is not None and text_tokens:
+            close(time_position)
+            start, text_tokens = None, []
+        else:
+            start = time_position
+    if text_tokens:
+        close(duration)
+    return segments
+
+
+def _transcribe_batch_job(items: List[Tuple], language: str, model_name: str) -> Dict:
+    """
+    여러 구간(각 30초 이하)을 멜 스펙트로그램 배치 하나로 묶어 한 번에 디코딩합니다.
+    items: [(오디오 또는 .pcm 경로, 시작 샘플, 끝 샘플, 시간 offset)]
+    """
+    import torch
+    import whisper
+
+    model = _registry.get(model_name)
+    n_mels = getattr(model.dims, "n_mels", 80)
+    mels = []
+    for audio, start, end, _ in items:
+        samples = np.ascontiguousarray(_resolve_audio(audio)[start:end])
+        mels.append(whisper.log_mel_spectrogram(whisper.pad_or_trim(samples), n_mels))
+    mel = torch.stack(mels).to(model.device)
+
+    options = whisper.DecodingOptions(language=_whisper_language(language), fp16=False)
+    decoded = model.decode(mel, options)
+    tokenizer = whisper.tokenizer.get_tokenizer(
+        model.is_multilingual, num_languages=getattr(model, "num_languages", 99), task="transcribe"
+    )
+
+    results = []
+    for (_, start, end, offset), result in zip(items, decoded):
+        if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+            segments = []
+        else:
+            segments = _segments_from_tokens(result.tokens, tokenizer, offset, (end - start) / SAMPLE_RATE)
+        for segment in segments:
+            segment["avg_logprob"] = result.avg_logprob
+        results.append({
+            "text": "".join(segment["text"] for segment in segments),
+            "segments": segments,
+            "language": result.language
+        })
+    return {"results": results, "worker": _registry.snapshot()}
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+# ============ 풀 관리 (메인 프로세스) ============
+
+class BatchScheduler:
+    """
+    동시에 요청된 구간을 모델/언어별로 모아 워커에 한 번에 보냅니다.
+    batch_size개가 모이거나 첫 요청 후 max_wait초가 지나면 바로 보냅니다.
+    """
+
+    def __init__(self, pool: "TranscriptionPool", batch_size: int = WHISPER_BATCH_SIZE,
+                 max_wait: float = WHISPER_BATCH_WAIT):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self._pending: Dict[Tuple[str, str], List[Tuple[Tuple, asyncio.Future]]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Tuple, language: str, model_name: str) -> Dict:
+        loop = asyncio.get_running_loop()
+        key = (model_name, language)
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.batch_size:
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.max_wait, self._flush, key)
+        return await future
+
+    def _flush(self, key: Tuple[str, str]):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, [])
+        if batch:
+            asyncio.ensure_future(self._run_batch(key, batch))
+
+    async def _run_batch(self, key: Tuple[str, str], batch: List[Tuple[Tuple, asyncio.Future]]):
+        model_name, language = key
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            result = await self.pool._run(_transcribe_batch_job, [item for item, _ in batch], language, model_name)
+        except BaseException as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), item_result in zip(batch, result["results"]):
+            # 요청한 작업이 이미 취소됐다면 결과를 버림
+            if not future.done():
+                future.set_result(item_result)
+
+    def status(self) -> Dict:
+        return {
+            "batch_size": self.batch_size,
+            "max_wait_ms": round(self.max_wait * 1000),
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0
+        }
+
+
+class TranscriptionPool:
+    """Whisper 워커 프로세스 풀 (대기열 제한 및 워커 비정상 종료 시 재시작)"""
+
+    def __init__(self, model_name: str = WHISPER_MODEL, workers: int = WHISPER_WORKERS,
+                 threads_per_worker: int = WHISPER_THREADS_PER_WORKER,
+                 queue_size: int = WHISPER_QUEUE_SIZE, max_models: int = WHISPER_MAX_MODELS,
+                 memory_budget: int = WHISPER_MODEL_MEMORY_BUDGET, backend: str = backends.WHISPER_BACKEND):
+        self.model_name = model_name
+        self.backend = backends.validate_backend(backend)
+        self.max_models = max_models
+        self.memory_budget = memory_budget
+        self.workers = max(workers, 1)
+        self.threads_per_worker = threads_per_worker
+        self._slots = asyncio.Semaphore(self.workers + max(queue_size, 0))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # torch는 fork 이후 스레드 상태가 꼬일 수 있으므로 spawn 사용
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._ready_queue = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.started = False
+        self.load_seconds: Optional[float] = None
+        self.pending = 0
+        self.restarts = 0
+        # 워커별 최근 모델 상태 (작업 결과와 함께 전달받음)
+        self.worker_models: Dict[int, Dict] = {}
+        self.batcher = None
+        if WHISPER_BATCH_SIZE > 1:
+            if backends.supports_batch_decode(self.backend):
+                self.batcher = BatchScheduler(self)
+            else:
+                print(f"⚠ {self.backend} 백엔드는 배치 디코딩을 지원하지 않아 구간별로 처리합니다.")
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        if self._ready_queue is None:
+            self._ready_queue = self._mp_context.Queue()
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self.model_name, self.threads_per_worker, self.max_models,
+                      self.memory_budget, self.backend, self._ready_queue)
+        )
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = self._create_executor()
+        return self._executor
+
+    def _drain_ready_queue(self):
+        """워커가 모델 로드 후 보낸 상태를 기다리지 않고 모두 꺼내 반영 (재시작된 워커는 여기서 반영됨)"""
+        if self._ready_queue is None:
+            return
+        while True:
+            try:
+                snapshot = self._ready_queue.get_nowait()
+            except queue.Empty:
+                return
+            self.worker_models[snapshot["pid"]] = snapshot
+
+    def _restart(self, broken: ProcessPoolExecutor):
+        """비정상 종료된 풀을 새 풀로 교체"""
+        if self._executor is broken:
+            print("⚠ Whisper 워커가 비정상 종료되어 다시 시작합니다.")
+            broken.shutdown(wait=False, cancel_futures=True)
+            # 죽은 워커의 상태는 버리고, 새 워커의 상태는 모델 로드 후 대기열로 들어옴
+            self._drain_ready_queue()
+            self.worker_models.clear()
+            self._executor = self._create_executor()
+            self.restarts += 1
+
+    async def start(self):
+        """워커를 모두 띄우고 모든 워커의 모델 로드가 끝날 때까지 대기"""
+        # 이전 풀이 남긴 상태가 새 워커 수에 섞이지 않도록 비움
+        self._drain_ready_queue()
+        self.worker_models.clear()
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        # 작업을 워커 수만큼 동시에 넣어야 모든 워커 프로세스가 생성됨
+        pings = [loop.run_in_executor(executor, _ping) for _ in range(self.workers)]
+        ready = 0
+        while ready < self.workers:
+            # 모델 로드에 실패하면 풀이 깨지므로 무한 대기하지 않도록 확인
+            failed = [p for p in pings if p.done() and p.exception()]
+            if failed:
+                raise failed[0].exception()
+            try:
+                snapshot = await asyncio.to_thread(self._ready_queue.get, True, 1.0)
+                self.worker_models[snapshot["pid"]] = snapshot
+                ready += 1
+            except queue.Empty:
+                continue
+        await asyncio.gather(*pings)
+
+    async def ensure_started(self):
+        """첫 호출 때 한 번만 워커를 띄우고 모델을 로드 (동시에 호출되면 먼저 시작한 쪽을 기다림)"""
+        if self.started:
+            return
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.started:
+                return
+            started = time.perf_counter()
+            try:
+                await self.start()
+            except BaseException:
+                # 다음 호출에서 새 풀로 다시 시도
+                self.shutdown()
+                raise
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            self.started = True
+
+    async def _run(self, fn, *args):
+        await self.ensure_started()
+        loop = asyncio.get_running_loop()
+        # 대기열이 가득 차면 여기서 대기 (backpressure)
+        async with self._slots:
+            self.pending += 1
+            try:
+                # 워커가 죽어 풀이 깨졌다면 새 풀로 한 번 재시도
+                for attempt in range(2):
+                    executor = self._get_executor()
+                    try:
+                        result = await loop.run_in_executor(executor, fn, *args)
+                        snapshot = result.pop("worker", None)
+                        if snapshot:
+                            self.worker_models[snapshot["pid"]] = snapshot
+                        return result
+                    except BrokenProcessPool:
+                        self._restart(executor)
+                        if attempt == 1:
+                            raise
+            finally:
+                self.pending -= 1
+
+    async def transcribe_chunk(self, audio: np.ndarray, start: int, end: int,
+                               language: str = WHISPER_LANGUAGE, prompt: Optional[str] = None,
+                               model_name: Optional[str] = None) -> Dict:
+        """오디오의 한 구간을 워커에서 인식합니다. (앞 구간 텍스트를 prompt로 넘겨 문맥 유지)
+
+        배치를 사용하면 앞 문맥이 없는 30초 이하 구간(짧은 파일이나 각 파일의 첫 구간)은
+        다른 작업의 구간과 모아서 한 번에 디코딩합니다.
+        """
+        offset = start / SAMPLE_RATE
+        model_name = model_name or self.model_name
+        if isinstance(audio, np.memmap) and audio.filename:
+            # memmap은 파일 경로와 구간만 전달 (워커에서 같은 파일을 매핑)
+            item = (str(audio.filename), start, end, offset)
+        else:
+            item = (audio[start:end], 0, end - start, offset)
+
+        if self.batcher is not None and not prompt and end - start <= WINDOW_SAMPLES:
+            return await self.batcher.submit(item, language, model_name)
+        return await self._run(_transcribe_chunk_job, *item, language, prompt, model_name)
+
+    def status(self) -> Dict:
+        """워커 상태 요약"""
+        self._drain_ready_queue()
+        processes = getattr(self._executor, "_processes", None) or {}
+        alive = {pid for pid, p in processes.items() if p.is_alive()}
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "max_models": self.max_models,
+            "memory_budget": self.memory_budget,
+            "workers": self.workers,
+            "threads_per_worker": self.threads_per_worker,
+            "started": self.started,
+            "load_seconds": self.load_seconds,
+            "alive_workers": len(alive),
+            "pending_jobs": self.pending,
+            "restarts": self.restarts,
+            "worker_models": [self.worker_models[pid] for pid in sorted(alive) if pid in self.worker_models],
+            "batching": self.batcher.status() if self.batcher is not None else None
+        }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self.started = False
+
+
+pool = TranscriptionPool()